@@ -0,0 +1,170 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.cache import caches
+from django.core.exceptions import ObjectDoesNotExist
+from django.db import router, transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework import exceptions
+from rest_framework.authentication import TokenAuthentication
+
+from accounts_app.models import Profile
+
+
+class TokenCache:
+    """
+    Two-level cache for resolved tokens: a small in-process LRU with a short TTL in
+    front of a shared Django cache. Entries are (user id, is_active, profile id,
+    profile type) tuples; no password hash or other user data leaves the database.
+    Shared entries are keyed on a per-token version. Invalidation bumps it, now and
+    again on commit, so a request that loaded the token before the change cannot
+    publish it under the current version. The local entry of this process is dropped
+    immediately; other processes drop theirs within LOCAL_TTL seconds.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._local = OrderedDict()
+        self.local_hits = 0
+        self.shared_hits = 0
+        self.misses = 0
+
+    @property
+    def config(self):
+        return settings.TOKEN_CACHE
+
+    @property
+    def cache(self):
+        return caches[self.config["ALIAS"]]
+
+    def _key(self, token_key):
+        return "auth:token:" + hashlib.sha256(token_key.encode()).hexdigest()
+
+    def _version(self, key):
+        version = self.cache.get(key + ":version")
+        if version is None:
+            self.cache.add(key + ":version", 1, timeout=None)
+            version = self.cache.get(key + ":version", 1)
+        return version
+
+    def _bump(self, key):
+        try:
+            self.cache.incr(key + ":version")
+        except ValueError:
+            self.cache.add(key + ":version", 2, timeout=None)
+
+    def get(self, token_key):
+        """
+        Returns (entry, version). entry is None on a miss; pass version to set() then.
+        """
+        key = self._key(token_key)
+        now = time.monotonic()
+        with self._lock:
+            local = self._local.get(key)
+            if local is not None and local[0] > now:
+                self._local.move_to_end(key)
+                self.local_hits += 1
+                return local[1], None
+            self._local.pop(key, None)
+
+        version = self._version(key)
+        entry = self.cache.get(f"{key}:{version}")
+        with self._lock:
+            if entry is None:
+                self.misses += 1
+                return None, version
+            self.shared_hits += 1
+            self._remember(key, entry, now)
+        return entry, version
+
+    def set(self, token_key, version, entry):
+        """
+        Stores entry under the version get() returned. Nothing is stored for this
+        version if it was invalidated in between or another request stored it first.
+        """
+        key = self._key(token_key)
+        self.cache.add(f"{key}:{version}", entry, timeout=self.config["TIMEOUT"])
+        if self._version(key) == version:
+            with self._lock:
+                self._remember(key, entry, time.monotonic())
+
+    def _remember(self, key, entry, now):
+        self._local[key] = (now + self.config["LOCAL_TTL"], entry)
+        self._local.move_to_end(key)
+        while len(self._local) > self.config["LOCAL_MAX_ENTRIES"]:
+            self._local.popitem(last=False)
+
+    def invalidate(self, *token_keys):
+        keys = [self._key(token_key) for token_key in token_keys]
+        with self._lock:
+            for key in keys:
+                self._local.pop(key, None)
+
+        def bump():
+            for key in keys:
+                self._bump(key)
+
+        bump()
+        transaction.on_commit(bump)
+
+    def stats(self):
+        with self._lock:
+            hits = self.local_hits + self.shared_hits
+            lookups = hits + self.misses
+            return {
+                "local_hits": self.local_hits,
+                "shared_hits": self.shared_hits,
+                "misses": self.misses,
+                "local_entries": len(self._local),
+                "hit_ratio": hits / lookups if lookups else 0.0,
+            }
+
+
+token_cache = TokenCache()
+
+
+class CachedTokenAuthentication(TokenAuthentication):
+    """
+    TokenAuthentication that resolves the token through token_cache.
+    On a miss the token, user and profile are loaded with one query. On a hit they
+    are rebuilt from the cached entry with all other fields deferred, so they load
+    on first access and save() only writes fields that were actually loaded.
+    """
+    def authenticate_credentials(self, key):
+        entry, version = token_cache.get(key)
+        if entry is None:
+            try:
+                token = self.get_model().objects.select_related("user__profile").get(key=key)
+            except self.get_model().DoesNotExist:
+                raise exceptions.AuthenticationFailed(_("Invalid token."))
+            token_cache.set(key, version, self.cache_entry(token.user))
+            user = token.user
+        else:
+            user, token = self.from_cache_entry(key, entry)
+
+        if not user.is_active:
+            raise exceptions.AuthenticationFailed(_("User inactive or deleted."))
+        return user, token
+
+    def cache_entry(self, user):
+        try:
+            profile = user.profile
+        except ObjectDoesNotExist:
+            return user.pk, user.is_active, None, None
+        return user.pk, user.is_active, profile.pk, profile.type
+
+    def from_cache_entry(self, key, entry):
+        user_id, is_active, profile_id, profile_type = entry
+        User = get_user_model()
+        user = User.from_db(router.db_for_read(User), ["id", "is_active"], [user_id, is_active])
+        if profile_id is not None:
+            user.profile = Profile.from_db(
+                router.db_for_read(Profile), ["id", "user_id", "type"], [profile_id, user_id, profile_type]
+            )
+        Token = self.get_model()
+        token = Token.from_db(router.db_for_read(Token), ["key", "user_id"], [key, user_id])
+        token.user = user
+        return user, token
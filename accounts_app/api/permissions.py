@@ -1,6 +1,21 @@
+from django.core.exceptions import ObjectDoesNotExist
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
 
+def get_profile_type(user):
+    """
+    Returns the profile type ("business"/"customer") of the user, or None.
+    CachedTokenAuthentication preloads the profile; otherwise it is loaded once
+    and kept on the user instance for the rest of the request.
+    """
+    if user is None or not user.is_authenticated:
+        return None
+    try:
+        return user.profile.type
+    except ObjectDoesNotExist:
+        return None
+
+
 class IsProfileOwnerOrReadOnly(BasePermission):
     """
     Allows access only to the profile owner for unsafe methods.
@@ -1,10 +1,12 @@
 from django.contrib.auth.models import User
 from django.contrib.auth.password_validation import validate_password
 from django.contrib.auth import authenticate
+from django.core.exceptions import ObjectDoesNotExist
 
 from rest_framework import serializers
 
 from accounts_app.models import Profile
+from core.images import ImageVariantsField
 
 
 class UserRegistrationSerializer(serializers.ModelSerializer):
@@ -79,7 +81,27 @@ class UserLoginSerializer(serializers.Serializer):
         return data
 
 
-class UserProfileSerializer(serializers.ModelSerializer):
+class RatingSummaryFieldsMixin:
+    """
+    Serializer fields for a business' average rating and review count,
+    read from the precomputed rating summary (select_related "user__rating_summary").
+    """
+    def _rating_summary(self, obj):
+        try:
+            return obj.user.rating_summary
+        except ObjectDoesNotExist:
+            return None
+
+    def get_average_rating(self, obj):
+        summary = self._rating_summary(obj)
+        return summary.average_rating if summary else None
+
+    def get_review_count(self, obj):
+        summary = self._rating_summary(obj)
+        return summary.review_count if summary else 0
+
+
+class UserProfileSerializer(RatingSummaryFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for User Profile Details, including a dynamic field response dependend on profile type customer or business.
     """
@@ -87,6 +109,9 @@ class UserProfileSerializer(serializers.ModelSerializer):
     email = serializers.EmailField(source="user.email", required=False)
     first_name = serializers.CharField(source="user.first_name", required=False)
     last_name = serializers.CharField(source="user.last_name", required=False)
+    average_rating = serializers.SerializerMethodField()
+    review_count = serializers.SerializerMethodField()
+    file_variants = ImageVariantsField("file")
 
     class Meta:
         model = Profile
@@ -96,6 +121,7 @@ class UserProfileSerializer(serializers.ModelSerializer):
             "first_name",
             "last_name",
             "file",
+            "file_variants",
             "location",
             "tel",
             "description",
@@ -103,12 +129,14 @@ class UserProfileSerializer(serializers.ModelSerializer):
             "type",
             "email",
             "created_at",
+            "average_rating",
+            "review_count",
         ]
 
     def to_representation(self, instance):
         data = super().to_representation(instance)
         if instance.type == "customer":
-            for field in ["location", "tel", "description", "working_hours"]:
+            for field in ["location", "tel", "description", "working_hours", "average_rating", "review_count"]:
                 data.pop(field, None)
         return data
 
@@ -138,11 +166,14 @@ class NestedUserFieldMixin:
         }
 
 
-class BusinessProfileSerializer(NestedUserFieldMixin, serializers.ModelSerializer):
+class BusinessProfileSerializer(NestedUserFieldMixin, RatingSummaryFieldsMixin, serializers.ModelSerializer):
     """
     Serializer for business list view.
     """
     user = serializers.SerializerMethodField()
+    average_rating = serializers.SerializerMethodField()
+    review_count = serializers.SerializerMethodField()
+    file_variants = ImageVariantsField("file")
 
     class Meta:
         model = Profile
@@ -151,10 +182,13 @@ class BusinessProfileSerializer(NestedUserFieldMixin, serializers.ModelSerialize
             "type",
             "created_at",
             "file",
+            "file_variants",
             "location",
             "tel",
             "description",
             "working_hours",
+            "average_rating",
+            "review_count",
         ]
 
 
@@ -163,6 +197,7 @@ class CustomerProfileSerializer(NestedUserFieldMixin, serializers.ModelSerialize
     Serializer customer list view.
     """
     user = serializers.SerializerMethodField()
+    file_variants = ImageVariantsField("file")
 
     class Meta:
         model = Profile
@@ -171,4 +206,5 @@ class CustomerProfileSerializer(NestedUserFieldMixin, serializers.ModelSerialize
             "type",
             "created_at",
             "file",
+            "file_variants",
         ]
@@ -1,10 +1,19 @@
 from django.urls import path
-from .views import LoginUserView, RegisterUserView, UserProfileView, BusinessProfileView, CustomerProfileView
+from core.async_views import read_view
+from .views import (
+    AsyncBusinessProfileView,
+    AsyncCustomerProfileView,
+    LoginUserView,
+    LogoutUserView,
+    RegisterUserView,
+    UserProfileView,
+)
 
 urlpatterns = [
     path('registration/', RegisterUserView.as_view(), name='register'),
     path('login/', LoginUserView.as_view(), name='login'),
+    path('logout/', LogoutUserView.as_view(), name='logout'),
     path('profile/<int:pk>/', UserProfileView.as_view(), name='user-profile'),
-    path('profiles/business/', BusinessProfileView.as_view(), name='business-profile-list'),
-    path('profiles/customer/', CustomerProfileView.as_view(), name='customer-profile-list'),
+    path('profiles/business/', read_view(AsyncBusinessProfileView), name='business-profile-list'),
+    path('profiles/customer/', read_view(AsyncCustomerProfileView), name='customer-profile-list'),
 ]
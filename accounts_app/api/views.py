@@ -6,6 +6,7 @@ from rest_framework.authtoken.models import Token
 from django.shortcuts import get_object_or_404
 
 from accounts_app.models import Profile
+from core.async_views import AsyncReadView, alist
 from .serializers import (
     BusinessProfileSerializer,
     CustomerProfileSerializer,
@@ -63,14 +64,28 @@ class LoginUserView(views.APIView):
             return Response(serializer.errors, status=status.HTTP_400_BAD_REQUEST)
 
 
+class LogoutUserView(views.APIView):
+    """
+    API view to logout a user by deleting the auth token.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def post(self, request):
+        Token.objects.filter(user=request.user).delete()
+        return Response(status=status.HTTP_204_NO_CONTENT)
+
+
 class UserProfileView(views.APIView):
     """
     API view for Profile details.
     """
     permission_classes = [IsAuthenticated, IsProfileOwnerOrReadOnly]
 
+    def get_queryset(self):
+        return Profile.objects.select_related("user__rating_summary")
+
     def get(self, request, pk):
-        profile = get_object_or_404(Profile, user__pk=pk)
+        profile = get_object_or_404(self.get_queryset(), user__pk=pk)
         self.check_object_permissions(request, profile)
         serializer = UserProfileSerializer(profile)
         return Response(serializer.data)
@@ -95,7 +110,7 @@ class BusinessProfileView(generics.ListAPIView):
     serializer_class = BusinessProfileSerializer
 
     def get_queryset(self):
-        return Profile.objects.filter(type="business")
+        return Profile.objects.filter(type="business").select_related("user__rating_summary")
 
 
 class CustomerProfileView(generics.ListAPIView):
@@ -106,4 +121,24 @@ class CustomerProfileView(generics.ListAPIView):
     serializer_class = CustomerProfileSerializer
 
     def get_queryset(self):
-        return Profile.objects.filter(type="customer")
+        return Profile.objects.filter(type="customer").select_related("user")
+
+
+class AsyncBusinessProfileView(AsyncReadView):
+    """
+    Async GET for /profiles/business/ under ASGI.
+    """
+    sync_view_class = BusinessProfileView
+
+    async def aget(self, request):
+        return await alist(self.api_view, request)
+
+
+class AsyncCustomerProfileView(AsyncReadView):
+    """
+    Async GET for /profiles/customer/ under ASGI.
+    """
+    sync_view_class = CustomerProfileView
+
+    async def aget(self, request):
+        return await alist(self.api_view, request)
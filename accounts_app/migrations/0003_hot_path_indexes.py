@@ -0,0 +1,23 @@
+# Generated by Django 5.1.6 on 2026-10-18 04:02
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts_app', '0002_alter_profile_description'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(condition=models.Q(('type', 'business')), fields=['-created_at'], name='profile_business_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='profile',
+            index=models.Index(condition=models.Q(('type', 'customer')), fields=['-created_at'], name='profile_customer_created_idx'),
+        ),
+    ]
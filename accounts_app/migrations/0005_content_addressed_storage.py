@@ -0,0 +1,19 @@
+# Generated by Django 5.1.6 on 2026-10-18 05:29
+
+import media_app.storage
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('accounts_app', '0004_image_derivatives'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='profile',
+            name='file',
+            field=models.ImageField(blank=True, null=True, storage=media_app.storage.ContentAddressedStorage(), upload_to='profile_pictures/'),
+        ),
+    ]
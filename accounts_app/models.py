@@ -3,7 +3,11 @@ from datetime import date
 from django.conf import settings
 from django.db import models
 
-class Profile(models.Model):
+from core.models import LoadedValuesMixin
+from media_app.storage import blob_storage
+
+
+class Profile(LoadedValuesMixin, models.Model):
     """
     Represents a user profile, which extends the Django User model
     with additional fields and user type.
@@ -16,7 +20,10 @@ class Profile(models.Model):
     user = models.OneToOneField(settings.AUTH_USER_MODEL, on_delete=models.CASCADE)
     type = models.CharField(max_length=10, choices=USER_TYPE_CHOICES)
     created_at = models.DateTimeField(auto_now_add=True)
-    file = models.ImageField(upload_to="profile_pictures/", null=True, blank=True)
+    file = models.ImageField(upload_to="profile_pictures/", storage=blob_storage, null=True, blank=True)
+    file_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    file_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    file_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     location = models.CharField(max_length=50, blank=True, null=True, default="München")
     tel = models.CharField(max_length=20, blank=True, null=True, default="0152435465")
     description = models.CharField(max_length=150, blank=True, null=True, default="Your Description")
@@ -29,3 +36,15 @@ class Profile(models.Model):
         verbose_name = "Profile"
         verbose_name_plural = "Profiles"
         ordering = ["-created_at"]
+        indexes = [
+            models.Index(
+                fields=["-created_at"],
+                condition=models.Q(type="business"),
+                name="profile_business_created_idx",
+            ),
+            models.Index(
+                fields=["-created_at"],
+                condition=models.Q(type="customer"),
+                name="profile_customer_created_idx",
+            ),
+        ]
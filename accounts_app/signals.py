@@ -0,0 +1,44 @@
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from rest_framework.authtoken.models import Token
+
+from accounts_app.api.authentication import token_cache
+from core.images import refresh_image_derivatives
+from accounts_app.models import Profile
+
+
+def invalidate_user_tokens(user_id):
+    keys = list(Token.objects.filter(user_id=user_id).values_list("key", flat=True))
+    if keys:
+        token_cache.invalidate(*keys)
+
+
+@receiver(post_delete, sender=Token)
+def invalidate_deleted_token(sender, instance, **kwargs):
+    """
+    Covers logout and token rotation, both of which delete the old token.
+    """
+    token_cache.invalidate(instance.key)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_tokens_on_user_change(sender, instance, created, update_fields=None, **kwargs):
+    """
+    Cached tokens carry the user, so deactivation and other changes must evict them.
+    """
+    if created or (update_fields and set(update_fields) <= {"last_login"}):
+        return
+    invalidate_user_tokens(instance.pk)
+
+
+@receiver(post_save, sender=Profile)
+def invalidate_tokens_on_profile_change(sender, instance, created, **kwargs):
+    invalidate_user_tokens(instance.user_id)
+
+
+@receiver(post_save, sender=Profile)
+def build_profile_picture_derivatives(sender, instance, raw=False, **kwargs):
+    if raw or not settings.IMAGE_DERIVATIVES["ON_SAVE"]:
+        return
+    refresh_image_derivatives(instance, "file")
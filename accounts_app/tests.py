@@ -1,9 +1,15 @@
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from django.contrib.auth.models import User
 from rest_framework.test import APITestCase
+from rest_framework.exceptions import AuthenticationFailed
 from rest_framework import status
 from accounts_app.models import Profile
 from rest_framework.authtoken.models import Token
+from offers_app.models import Offer, OfferDetail
+from reviews_app.models import Review
+from accounts_app.api.authentication import CachedTokenAuthentication, token_cache
 
 class AccountsTests(APITestCase):
     def setUp(self):
@@ -153,3 +159,107 @@ class AccountsTests(APITestCase):
         url = reverse("customer-profile-list")
         response = self.client.get(url)
         self.assertEqual(response.status_code, 401)
+
+    def test_business_profiles_expose_rating_summary(self):
+        other = User.objects.create_user(username="business2", password="pw3", email="b2@test.de")
+        Profile.objects.create(user=other, type="business")
+        Review.objects.create(business_user=self.business, reviewer=self.customer, rating=4)
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.customer_token.key)
+        url = reverse("business-profile-list")
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        by_user = {item["user"]["pk"]: item for item in response.data}
+        self.assertEqual(by_user[self.business.id]["average_rating"], 4.0)
+        self.assertEqual(by_user[self.business.id]["review_count"], 1)
+        self.assertIsNone(by_user[other.id]["average_rating"])
+        self.assertEqual(by_user[other.id]["review_count"], 0)
+
+        response = self.client.get(reverse("user-profile", args=[self.business.id]))
+        self.assertEqual(response.data["average_rating"], 4.0)
+        response = self.client.get(reverse("user-profile", args=[self.customer.id]))
+        self.assertNotIn("average_rating", response.data)
+
+    # --- Token cache ---
+    def test_token_is_served_from_cache_after_first_request(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.customer_token.key)
+        url = reverse("business-profile-list")
+        self.client.get(url)
+        before = token_cache.stats()
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(token_cache.stats()["local_hits"], before["local_hits"] + 1)
+
+    def test_logout_invalidates_cached_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.customer_token.key)
+        self.assertEqual(self.client.get(reverse("customer-profile-list")).status_code, 200)
+        self.assertEqual(self.client.post(reverse("logout")).status_code, 204)
+        self.assertFalse(Token.objects.filter(user=self.customer).exists())
+        self.assertEqual(self.client.get(reverse("customer-profile-list")).status_code, 401)
+
+    def test_cached_token_holds_no_user_data(self):
+        key = self.business_token.key
+        CachedTokenAuthentication().authenticate_credentials(key)
+        entry, _version = token_cache.get(key)
+        self.assertEqual(entry, (self.business.id, True, self.business_profile.id, "business"))
+
+        user, token = CachedTokenAuthentication().authenticate_credentials(key)
+        self.assertEqual((user.pk, token.pk, user.profile.type), (self.business.id, key, "business"))
+        user.save()
+        self.business.refresh_from_db()
+        self.assertTrue(self.business.check_password("pw2"))
+        self.assertEqual(user.username, self.business.username)
+
+    def test_revocation_during_a_miss_is_not_cached(self):
+        key = self.business_token.key
+        entry, version = token_cache.get(key)
+        self.assertIsNone(entry)
+        token = Token.objects.select_related("user__profile").get(key=key)
+        self.business_token.delete()
+        token_cache.set(key, version, CachedTokenAuthentication().cache_entry(token.user))
+        self.assertEqual(token_cache.get(key)[0], None)
+        with self.assertRaises(AuthenticationFailed):
+            CachedTokenAuthentication().authenticate_credentials(key)
+
+    def test_deactivation_and_profile_change_invalidate_cached_token(self):
+        self.client.credentials(HTTP_AUTHORIZATION="Token " + self.business_token.key)
+        self.client.get(reverse("business-profile-list"))
+        self.business_profile.type = "customer"
+        self.business_profile.save()
+        user, _ = CachedTokenAuthentication().authenticate_credentials(self.business_token.key)
+        self.assertEqual(user.profile.type, "customer")
+
+        self.business.is_active = False
+        self.business.save()
+        self.assertEqual(self.client.get(reverse("business-profile-list")).status_code, 401)
+
+    def test_write_endpoints_load_profile_at_most_once(self):
+        offer = Offer.objects.create(user=self.business, title="Logo", description="desc")
+        detail = OfferDetail.objects.create(
+            offer=offer, title="Basic", revisions=1, delivery_time_in_days=3,
+            price=100, features=["A"], offer_type="basic",
+        )
+        offer_payload = {
+            "title": "Design",
+            "description": "desc",
+            "details": [
+                {"title": t, "revisions": 1, "delivery_time_in_days": 2, "price": 10, "features": [], "offer_type": t}
+                for t in ("basic", "standard", "premium")
+            ],
+        }
+        requests = [
+            (self.business_token, reverse("offers"), offer_payload, 201),
+            (self.customer_token, reverse("order-list-create"), {"offer_detail_id": detail.id}, 201),
+            (self.customer_token, "/api/reviews/", {"business_user": self.business.id, "rating": 5, "description": "Top"}, 201),
+            (self.business_token, reverse("offers"), offer_payload, 201),
+        ]
+        for token, url, data, expected_status in requests:
+            self.client.credentials(HTTP_AUTHORIZATION="Token " + token.key)
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(url, data, format="json")
+            self.assertEqual(response.status_code, expected_status, response.data)
+            profile_queries = [
+                q["sql"] for q in queries.captured_queries
+                if 'FROM "accounts_app_profile"' in q["sql"] or 'JOIN "accounts_app_profile"' in q["sql"]
+            ]
+            self.assertLessEqual(len(profile_queries), 1, profile_queries)
@@ -37,4 +37,10 @@ else:
 EOF
 fi
 
-exec gunicorn core.wsgi:application --bind 0.0.0.0:8000
+# Worker class, count, threads etc. come from gunicorn.conf.py (env overridable).
+# SERVER_MODE=asgi: uvicorn workers with the async read views (core/async_views.py)
+if [ "${SERVER_MODE:-wsgi}" = "asgi" ]; then
+  exec gunicorn core.asgi:application
+fi
+
+exec gunicorn core.wsgi:application
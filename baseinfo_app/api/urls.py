@@ -1,6 +1,7 @@
 from django.urls import path
-from .views import BaseInfoView
+from core.async_views import read_view
+from .views import AsyncBaseInfoView
 
 urlpatterns = [
-    path("base-info/", BaseInfoView.as_view(), name="base-info"),
+    path("base-info/", read_view(AsyncBaseInfoView), name="base-info"),
 ]
@@ -2,27 +2,38 @@
 from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework.permissions import AllowAny
-from django.db.models import Avg, Count
-from reviews_app.models import Review
-from accounts_app.models import Profile
-from offers_app.models import Offer
+from baseinfo_app.models import PlatformStats
+from core.async_views import AsyncReadView
+
+
+def base_info_payload(stats):
+    return {
+        "review_count": stats.review_count,
+        "average_rating": stats.average_rating,
+        "business_profile_count": stats.business_profile_count,
+        "offer_count": stats.offer_count,
+    }
 
 
 class BaseInfoView(APIView):
     """
     API view for summarized base infos.
+    Reads the incrementally maintained PlatformStats row instead of aggregating.
     """
     permission_classes = [AllowAny]
 
     def get(self, request):
-        review_count = Review.objects.count()
-        average_rating = Review.objects.aggregate(avg=Avg("rating"))["avg"] or 0
-        business_profile_count = Profile.objects.filter(type="business").count()
-        offer_count = Offer.objects.count()
-
-        return Response({
-            "review_count": review_count,
-            "average_rating": round(average_rating, 1),
-            "business_profile_count": business_profile_count,
-            "offer_count": offer_count,
-        })
+        stats = PlatformStats.load()
+
+        return Response(base_info_payload(stats))
+
+
+class AsyncBaseInfoView(AsyncReadView):
+    """
+    Async GET for /base-info/ under ASGI.
+    """
+    sync_view_class = BaseInfoView
+
+    async def aget(self, request):
+        stats = await PlatformStats.aload()
+        return Response(base_info_payload(stats))
@@ -0,0 +1,291 @@
+import json
+import platform
+import tempfile
+import time
+from dataclasses import dataclass, field
+
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import (
+    CaptureQueriesContext,
+    override_settings,
+    setup_test_environment,
+    teardown_test_environment,
+)
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from accounts_app.api.authentication import CachedTokenAuthentication
+from offers_app.api.cache import offer_cache
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order
+from reviews_app.models import Review
+
+UserModel = get_user_model()
+
+# seed_coderr --bulk arguments per scale; each business gets 2-3 template offers on top of --fake-extra.
+SCALES = {
+    "smoke": {"biz": 5, "cust": 5, "fake_extra": 0, "orders": 20, "reviews": 20},
+    "10k": {"biz": 1000, "cust": 2000, "fake_extra": 7500, "orders": 10_000, "reviews": 10_000},
+    "100k": {"biz": 10_000, "cust": 20_000, "fake_extra": 75_000, "orders": 100_000, "reviews": 100_000},
+    "1m": {"biz": 100_000, "cust": 200_000, "fake_extra": 750_000, "orders": 1_000_000, "reviews": 1_000_000},
+}
+METRICS = ("p50_ms", "p95_ms", "p99_ms")
+
+
+@dataclass
+class Case:
+    name: str
+    method: str
+    path: str
+    user: object = None
+    data: dict = field(default_factory=dict)
+
+
+def percentile(values, pct):
+    """
+    Linear-interpolated percentile of a non-empty list of numbers.
+    """
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100
+    low = int(rank)
+    high = min(low + 1, len(ordered) - 1)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(timings_ms, query_counts, statuses):
+    return {
+        "iterations": len(timings_ms),
+        "p50_ms": round(percentile(timings_ms, 50), 3),
+        "p95_ms": round(percentile(timings_ms, 95), 3),
+        "p99_ms": round(percentile(timings_ms, 99), 3),
+        "mean_ms": round(sum(timings_ms) / len(timings_ms), 3),
+        "queries": max(query_counts),
+        "status": sorted(set(statuses)),
+    }
+
+
+def compare_results(baseline, current, threshold=0.15, min_delta_ms=1.0):
+    """
+    Returns a list of regression messages between two benchmark result documents.
+    A latency metric regresses when it grows by more than threshold (relative) and
+    more than min_delta_ms (absolute); any increase in query count is a regression.
+    """
+    regressions = []
+    for name, before in baseline["endpoints"].items():
+        after = current["endpoints"].get(name)
+        if after is None:
+            continue
+        for metric in METRICS:
+            delta = after[metric] - before[metric]
+            if delta > min_delta_ms and delta > before[metric] * threshold:
+                change = f" (+{delta / before[metric]:.0%})" if before[metric] else ""
+                regressions.append(
+                    f"{name}: {metric} {before[metric]:.1f} -> {after[metric]:.1f} ms{change}"
+                )
+        if after["queries"] > before["queries"]:
+            regressions.append(f"{name}: queries {before['queries']} -> {after['queries']}")
+    return regressions
+
+
+def build_cases():
+    """
+    One case per endpoint in core/urls.py, using seeded sample rows for path parameters.
+    """
+    order = Order.objects.select_related("customer_user", "business_user").order_by("pk").first()
+    review = Review.objects.select_related("reviewer").order_by("pk").first()
+    offer = Offer.objects.select_related("user").order_by("pk").first()
+    if order is None or review is None or offer is None:
+        raise CommandError("The seeded dataset needs at least one offer, order and review.")
+    business, customer = order.business_user, order.customer_user
+    detail = (
+        OfferDetail.objects.filter(offer__user=business).order_by("pk").first()
+        or OfferDetail.objects.filter(offer=offer).first()
+    )
+    owned_offer = detail.offer
+    tiers = [
+        {"title": t, "revisions": 1, "delivery_time_in_days": 3, "price": 100, "features": ["A"], "offer_type": t}
+        for t in ("basic", "standard", "premium")
+    ]
+    return [
+        Case("base-info", "get", reverse("base-info")),
+        Case("login", "post", reverse("login"), data={"username": "demo_business", "password": "demo"}),
+        Case("registration", "post", reverse("register"), data={
+            "username": "bench_user", "email": "bench@example.com", "password": "Bench1234!",
+            "repeated_password": "Bench1234!", "type": "customer",
+        }),
+        Case("profile", "get", reverse("user-profile", args=[business.pk]), business),
+        Case("profile (patch)", "patch", reverse("user-profile", args=[business.pk]), business, {"location": "Berlin"}),
+        Case("profiles/business", "get", reverse("business-profile-list"), customer),
+        Case("profiles/customer", "get", reverse("customer-profile-list"), customer),
+        Case("offers", "get", reverse("offers")),
+        Case("offers?ordering=min_price", "get", reverse("offers") + "?ordering=min_price"),
+        Case("offers?search", "get", reverse("offers") + "?search=design"),
+        Case("offers?cursor", "get", reverse("offers") + "?cursor="),
+        Case("offers (post)", "post", reverse("offers"), business, {"title": "Bench", "description": "", "details": tiers}),
+        Case("offer-detail", "get", reverse("offer-detail", args=[owned_offer.pk]), business),
+        Case("offer-detail (patch)", "patch", reverse("offer-detail", args=[owned_offer.pk]), business, {"title": "Bench"}),
+        Case("offerdetail-retrieve", "get", reverse("offerdetail-retrieve", args=[detail.pk]), customer),
+        Case("orders", "get", reverse("order-list-create"), customer),
+        Case("orders (post)", "post", reverse("order-list-create"), customer, {"offer_detail_id": detail.pk}),
+        Case("order-detail", "get", reverse("order-detail", args=[order.pk]), customer),
+        Case("order-detail (patch)", "patch", reverse("order-detail", args=[order.pk]), business, {"status": "completed"}),
+        Case("order-count", "get", reverse("order-count", args=[business.pk]), customer),
+        Case("completed-order-count", "get", reverse("completed-order-count", args=[business.pk]), customer),
+        Case("order-stats", "get", reverse("order-stats", args=[business.pk]), customer),
+        Case("reviews", "get", reverse("review-list-create"), customer),
+        Case("reviews?business_user_id&page", "get", reverse("review-list-create") + f"?business_user_id={business.pk}&page=1", customer),
+        Case("review-detail", "get", reverse("review-detail", args=[review.pk]), review.reviewer),
+        Case("review-detail (patch)", "patch", reverse("review-detail", args=[review.pk]), review.reviewer, {"rating": 4}),
+        Case("swagger", "get", reverse("schema-swagger-ui") + "?format=openapi"),
+    ]
+
+
+def clear_response_cache(token_key=None):
+    """
+    Empties the offer response cache, so the request does the endpoint's full work.
+    If the token cache shares that alias, the token is resolved again here, outside the
+    measurement, so the query count only covers the endpoint itself.
+    """
+    offer_cache.cache.clear()
+    if token_key is not None:
+        CachedTokenAuthentication().authenticate_credentials(token_key)
+
+
+def run_case(case, iterations, warmup=2, warm=False):
+    """
+    Runs one case and returns its summary. Writes run inside a rolled back transaction,
+    so every iteration sees the same dataset. Unless warm, the offer response cache is
+    cleared before every request, so cached endpoints report their real query count.
+    """
+    client = APIClient()
+    token_key = None
+    if case.user is not None:
+        token, _created = Token.objects.get_or_create(user=case.user)
+        token_key = token.key
+        client.credentials(HTTP_AUTHORIZATION="Token " + token_key)
+    send = getattr(client, case.method)
+
+    timings, query_counts, statuses = [], [], []
+    for i in range(warmup + iterations):
+        if not warm:
+            clear_response_cache(token_key)
+        with transaction.atomic():
+            with CaptureQueriesContext(connection) as queries:
+                start = time.perf_counter()
+                response = send(case.path, case.data or None, format="json")
+                elapsed = (time.perf_counter() - start) * 1000
+            transaction.set_rollback(True)
+        if i >= warmup:
+            timings.append(elapsed)
+            query_counts.append(len(queries))
+            statuses.append(response.status_code)
+    return summarize(timings, query_counts, statuses)
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a throwaway test database at the given scale through seed_coderr and record "
+        "p50/p95/p99 latency and query counts per API endpoint as JSON. "
+        "With --compare BASELINE CURRENT, report regressions between two result files."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--scale", choices=SCALES, default="smoke", help="Dataset size.")
+        parser.add_argument("--chunk-size", type=int, default=5000, help="bulk_create batch size for seeding.")
+        parser.add_argument("--iterations", type=int, default=30, help="Measured requests per endpoint.")
+        parser.add_argument("--warmup", type=int, default=2, help="Unmeasured requests per endpoint.")
+        parser.add_argument("--only", nargs="*", default=None, help="Only run endpoints with these names.")
+        parser.add_argument(
+            "--warm", action="store_true",
+            help="Keep the offer response cache between requests (default: cleared before each one).",
+        )
+        parser.add_argument("--output", default=None, help="Write the JSON results to this file.")
+        parser.add_argument(
+            "--compare", nargs=2, metavar=("BASELINE", "CURRENT"), default=None,
+            help="Compare two result files instead of running the benchmark.",
+        )
+        parser.add_argument(
+            "--threshold", type=float, default=0.15,
+            help="Relative latency increase that counts as a regression (default 0.15).",
+        )
+
+    def handle(self, *args, **opts):
+        if opts["compare"]:
+            return self.compare(*opts["compare"], threshold=opts["threshold"])
+
+        setup_test_environment()
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+                results = self.run(opts)
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+            teardown_test_environment()
+
+        document = json.dumps(results, indent=2)
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8") as fh:
+                fh.write(document)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {opts['output']}."))
+        else:
+            self.stdout.write(document)
+
+    def run(self, opts):
+        scale = opts["scale"]
+        self.stdout.write(self.style.MIGRATE_HEADING(f"Seeding scale '{scale}'…"))
+        start = time.perf_counter()
+        call_command(
+            "seed_coderr", fresh=True, bulk=True, chunk_size=opts["chunk_size"],
+            stdout=self.stdout, **SCALES[scale],
+        )
+        seed_seconds = time.perf_counter() - start
+
+        endpoints = {}
+        for case in build_cases():
+            if opts["only"] and case.name not in opts["only"]:
+                continue
+            endpoints[case.name] = run_case(case, opts["iterations"], opts["warmup"], opts["warm"])
+            self.stdout.write(
+                f"{case.name:32} p50 {endpoints[case.name]['p50_ms']:8.2f} ms  "
+                f"p95 {endpoints[case.name]['p95_ms']:8.2f} ms  "
+                f"queries {endpoints[case.name]['queries']}"
+            )
+        return {
+            "meta": {
+                "scale": scale,
+                "rows": {
+                    "offers": Offer.objects.count(),
+                    "orders": Order.objects.count(),
+                    "reviews": Review.objects.count(),
+                    "users": UserModel.objects.count(),
+                },
+                "seed_seconds": round(seed_seconds, 2),
+                "iterations": opts["iterations"],
+                "cold_cache": not opts["warm"],
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "created_at": timezone.now().isoformat(),
+            },
+            "endpoints": endpoints,
+        }
+
+    def compare(self, baseline_path, current_path, threshold):
+        with open(baseline_path, encoding="utf-8") as fh:
+            baseline = json.load(fh)
+        with open(current_path, encoding="utf-8") as fh:
+            current = json.load(fh)
+        if baseline["meta"].get("cold_cache") != current["meta"].get("cold_cache"):
+            raise CommandError("Cannot compare a cold-cache run with a warm-cache run.")
+        regressions = compare_results(baseline, current, threshold=threshold)
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS("No regressions."))
+            return
+        for message in regressions:
+            self.stdout.write(self.style.WARNING(message))
+        raise CommandError(f"{len(regressions)} regression(s) found.")
@@ -0,0 +1,139 @@
+import copy
+import json
+import threading
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.utils import load_backend
+
+from .benchmark_api import percentile
+
+
+def build_variants(settings_dict, threads, pgbouncer=None):
+    """
+    Connection strategies to compare, as DATABASES entries derived from the configured one.
+    """
+    options = {name: value for name, value in settings_dict.get("OPTIONS", {}).items() if name != "pool"}
+
+    def variant(**overrides):
+        entry = copy.deepcopy(settings_dict)
+        entry.update({"OPTIONS": dict(options), **overrides})
+        return entry
+
+    variants = {
+        "per-request": variant(CONN_MAX_AGE=0, CONN_HEALTH_CHECKS=False),
+        "persistent": variant(CONN_MAX_AGE=600, CONN_HEALTH_CHECKS=True),
+    }
+    if settings_dict["ENGINE"] == "django.db.backends.postgresql":
+        variants["pool"] = variant(CONN_MAX_AGE=0, OPTIONS=dict(options, pool={"min_size": threads, "max_size": threads}))
+        if pgbouncer:
+            host, _sep, port = pgbouncer.partition(":")
+            variants["pgbouncer"] = variant(
+                HOST=host, PORT=port or "6432", CONN_MAX_AGE=0, DISABLE_SERVER_SIDE_CURSORS=True,
+            )
+    return variants
+
+
+def run_variant(alias, settings_dict, threads, requests, query):
+    """
+    Replays the connection handling of a request (close_old_connections on request_started
+    and request_finished around one query) requests times in each of threads threads.
+    Returns latency percentiles and how often a connection was opened or checked out.
+    """
+    backend = load_backend(settings_dict["ENGINE"])
+    timings, lock = [], threading.Lock()
+    connects = []
+
+    def count_connect(sender, connection, **kwargs):
+        if connection.alias == alias:
+            connects.append(1)
+
+    def worker():
+        wrapper = backend.DatabaseWrapper(settings_dict, alias)
+        local = []
+        try:
+            for _ in range(requests):
+                start = time.perf_counter()
+                wrapper.close_if_unusable_or_obsolete()
+                with wrapper.cursor() as cursor:
+                    cursor.execute(query)
+                    cursor.fetchall()
+                wrapper.close_if_unusable_or_obsolete()
+                local.append((time.perf_counter() - start) * 1000)
+        finally:
+            wrapper.close()
+            with lock:
+                timings.extend(local)
+
+    connection_created.connect(count_connect)
+    start = time.perf_counter()
+    try:
+        pool = [threading.Thread(target=worker) for _ in range(threads)]
+        for thread in pool:
+            thread.start()
+        for thread in pool:
+            thread.join()
+    finally:
+        connection_created.disconnect(count_connect)
+        closer = backend.DatabaseWrapper(settings_dict, alias)
+        if hasattr(closer, "close_pool"):
+            closer.close_pool()
+    elapsed = time.perf_counter() - start
+    if len(timings) != threads * requests:
+        raise CommandError(f"{alias}: only {len(timings)} of {threads * requests} requests completed.")
+    return {
+        "requests": len(timings),
+        "requests_per_second": round(len(timings) / elapsed, 1),
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "mean_ms": round(sum(timings) / len(timings), 3),
+        "connects": len(connects),
+    }
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure the per-request cost of opening database connections: a new connection per "
+        "request vs. persistent connections with health checks vs. the psycopg pool (PostgreSQL) "
+        "vs. pgbouncer (--pgbouncer host:port), against the configured database."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--threads", type=int, default=4, help="Concurrent threads (gthread workers).")
+        parser.add_argument("--requests", type=int, default=500, help="Requests per thread.")
+        parser.add_argument("--query", default="SELECT 1", help="Query run once per request.")
+        parser.add_argument("--pgbouncer", default=None, help="host:port of a pgbouncer in front of the database.")
+        parser.add_argument("--output", default=None, help="Write the JSON results to this file.")
+
+    def handle(self, *args, **opts):
+        settings_dict = connections["default"].settings_dict
+        variants = build_variants(settings_dict, opts["threads"], opts["pgbouncer"])
+        results = {}
+        for name, entry in variants.items():
+            results[name] = run_variant(f"benchmark_{name}", entry, opts["threads"], opts["requests"], opts["query"])
+            self.stdout.write(
+                f"{name:12} {results[name]['requests_per_second']:9.1f} req/s  "
+                f"p50 {results[name]['p50_ms']:7.3f} ms  p95 {results[name]['p95_ms']:7.3f} ms  "
+                f"connects {results[name]['connects']}"
+            )
+        baseline = results["per-request"]["mean_ms"]
+        for name, result in results.items():
+            result["saved_ms_per_request"] = round(baseline - result["mean_ms"], 3)
+
+        document = json.dumps({
+            "meta": {
+                "vendor": connections["default"].vendor,
+                "threads": opts["threads"],
+                "requests_per_thread": opts["requests"],
+                "query": opts["query"],
+            },
+            "results": results,
+        }, indent=2)
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8") as fh:
+                fh.write(document)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {opts['output']}."))
+        else:
+            self.stdout.write(document)
@@ -0,0 +1,204 @@
+import asyncio
+import json
+import os
+import platform
+import socket
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.authtoken.models import Token
+
+from accounts_app.models import Profile
+from offers_app.models import Offer
+
+from .benchmark_api import percentile
+
+# Same commands as backend.entrypoint.sh; both modes run under gunicorn's process manager.
+SERVERS = {
+    "wsgi": ["gunicorn", "core.wsgi:application", "--workers", "{workers}", "--bind", "127.0.0.1:{port}"],
+    "asgi": [
+        "gunicorn", "core.asgi:application", "--worker-class", "uvicorn_worker.UvicornWorker",
+        "--workers", "{workers}", "--bind", "127.0.0.1:{port}",
+    ],
+}
+
+
+async def _request(reader, writer, path, host, headers):
+    lines = [f"GET {path} HTTP/1.1", f"Host: {host}"] + [f"{name}: {value}" for name, value in headers.items()]
+    writer.write(("\r\n".join(lines) + "\r\n\r\n").encode())
+    await writer.drain()
+    head = (await reader.readuntil(b"\r\n\r\n")).decode("latin-1").split("\r\n")
+    status = int(head[0].split()[1])
+    fields = dict(line.split(":", 1) for line in head[1:] if ":" in line)
+    fields = {name.strip().lower(): value.strip() for name, value in fields.items()}
+    if "content-length" in fields:
+        await reader.readexactly(int(fields["content-length"]))
+    else:
+        await reader.read()
+        return status, False
+    return status, fields.get("connection", "").lower() != "close" and not head[0].startswith("HTTP/1.0")
+
+
+async def _client(host, port, paths, headers, deadline, timings, statuses, offset):
+    connection = None
+    index = offset
+    while time.perf_counter() < deadline:
+        if connection is None:
+            connection = await asyncio.open_connection(host, port)
+        path = paths[index % len(paths)]
+        index += 1
+        start = time.perf_counter()
+        try:
+            status, keep_alive = await _request(*connection, path, f"{host}:{port}", headers)
+        except (ConnectionError, asyncio.IncompleteReadError):
+            connection[1].close()
+            connection = None
+            statuses.append(0)
+            continue
+        timings.append((time.perf_counter() - start) * 1000)
+        statuses.append(status)
+        if not keep_alive:
+            connection[1].close()
+            connection = None
+    if connection is not None:
+        connection[1].close()
+
+
+def load_test(host, port, paths, concurrency, duration, headers=None):
+    """
+    Sends GET requests round-robin over paths from concurrency keep-alive connections
+    for duration seconds and returns throughput and latency percentiles.
+    """
+    async def run():
+        timings, statuses = [], []
+        deadline = time.perf_counter() + duration
+        await asyncio.gather(*(
+            _client(host, port, paths, headers or {}, deadline, timings, statuses, i)
+            for i in range(concurrency)
+        ))
+        return timings, statuses
+
+    start = time.perf_counter()
+    timings, statuses = asyncio.run(run())
+    elapsed = time.perf_counter() - start
+    if not timings:
+        raise CommandError("No request completed.")
+    return {
+        "concurrency": concurrency,
+        "requests": len(timings),
+        "requests_per_second": round(len(timings) / elapsed, 1),
+        "p50_ms": round(percentile(timings, 50), 3),
+        "p95_ms": round(percentile(timings, 95), 3),
+        "p99_ms": round(percentile(timings, 99), 3),
+        "errors": sum(1 for status in statuses if not 200 <= status < 400),
+    }
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+class Command(BaseCommand):
+    help = (
+        "Start the app under gunicorn with the WSGI profile from gunicorn.conf.py and with uvicorn "
+        "workers (ASGI, async read views) "
+        "against the configured database and compare requests per second and latency of the "
+        "read endpoints at several concurrency levels. Seed the database first (seed_coderr --bulk)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--modes", nargs="+", choices=SERVERS, default=list(SERVERS))
+        parser.add_argument("--concurrency", nargs="+", type=int, default=[1, 16, 64])
+        parser.add_argument("--duration", type=float, default=10, help="Seconds per concurrency level.")
+        parser.add_argument("--workers", type=int, default=2, help="Server worker processes.")
+        parser.add_argument("--output", default=None, help="Write the JSON results to this file.")
+
+    def handle(self, *args, **opts):
+        paths, headers = self.read_paths()
+        results = {}
+        for mode in opts["modes"]:
+            results[mode] = []
+            port = _free_port()
+            with self.server(mode, port, opts["workers"], paths[0]):
+                load_test("127.0.0.1", port, paths, 1, 1, headers)  # warm up
+                for concurrency in opts["concurrency"]:
+                    result = load_test("127.0.0.1", port, paths, concurrency, opts["duration"], headers)
+                    results[mode].append(result)
+                    self.stdout.write(
+                        f"{mode} c={concurrency:<4} {result['requests_per_second']:9.1f} req/s  "
+                        f"p50 {result['p50_ms']:8.2f} ms  p99 {result['p99_ms']:8.2f} ms  "
+                        f"errors {result['errors']}"
+                    )
+
+        document = json.dumps({
+            "meta": {
+                "paths": paths,
+                "workers": opts["workers"],
+                "duration": opts["duration"],
+                "database": connection.vendor,
+                "python": platform.python_version(),
+                "created_at": timezone.now().isoformat(),
+            },
+            "results": results,
+        }, indent=2)
+        if opts["output"]:
+            with open(opts["output"], "w", encoding="utf-8") as fh:
+                fh.write(document)
+            self.stdout.write(self.style.SUCCESS(f"Results written to {opts['output']}."))
+        else:
+            self.stdout.write(document)
+
+    def read_paths(self):
+        """
+        The async read endpoints, with path parameters and a token from the seeded data.
+        """
+        offer = Offer.objects.order_by("pk").first()
+        profile = Profile.objects.filter(type="business").select_related("user").order_by("pk").first()
+        if offer is None or profile is None:
+            raise CommandError("The database needs at least one offer and one business user.")
+        token, _created = Token.objects.get_or_create(user=profile.user)
+        paths = [
+            reverse("base-info"),
+            reverse("offers"),
+            reverse("offer-detail", args=[offer.pk]),
+            reverse("order-count", args=[profile.user_id]),
+            reverse("completed-order-count", args=[profile.user_id]),
+            reverse("business-profile-list"),
+            reverse("customer-profile-list"),
+        ]
+        return paths, {"Authorization": f"Token {token.key}"}
+
+    @contextmanager
+    def server(self, mode, port, workers, probe_path):
+        argv = [arg.format(workers=workers, port=port) for arg in SERVERS[mode]]
+        process = subprocess.Popen(
+            [sys.executable, "-m", *argv], cwd=settings.BASE_DIR, env=dict(os.environ, SERVER_MODE=mode),
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+        try:
+            self.wait_until_ready(process, port, probe_path)
+            yield process
+        finally:
+            process.terminate()
+            process.wait(timeout=30)
+
+    def wait_until_ready(self, process, port, path, timeout=30):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if process.poll() is not None:
+                raise CommandError(f"Server exited with code {process.returncode}.")
+            try:
+                load_test("127.0.0.1", port, [path], 1, 0.01)
+                return
+            except (OSError, CommandError):
+                time.sleep(0.2)
+        raise CommandError("Server did not start in time.")
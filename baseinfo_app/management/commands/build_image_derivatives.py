@@ -0,0 +1,41 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from accounts_app.models import Profile
+from core.images import refresh_image_derivatives
+from offers_app.api.cache import offer_cache
+from offers_app.models import Offer
+
+# name -> (model, image field, bump updated_at; offer ETags derive from it)
+TARGETS = {
+    "offers": (Offer, "image", True),
+    "profiles": (Profile, "file", False),
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Backfill the WebP/JPEG derivatives and the stored dimensions of offer images and "
+        "profile pictures, e.g. after seed_coderr --bulk. Up-to-date rows are skipped "
+        "unless --force is given."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--models", nargs="+", choices=TARGETS, default=list(TARGETS))
+        parser.add_argument("--force", action="store_true", help="Rebuild derivatives of every image.")
+        parser.add_argument("--chunk-size", type=int, default=500, help="Rows fetched per query.")
+
+    def handle(self, *args, **opts):
+        for name in opts["models"]:
+            model, field_name, touch = TARGETS[name]
+            rows = model.objects.order_by("pk").only(
+                "pk", field_name, f"{field_name}_width", f"{field_name}_height", f"{field_name}_derivatives"
+            )
+            updated = 0
+            for instance in rows.iterator(chunk_size=opts["chunk_size"]):
+                extra_updates = {"updated_at": timezone.now()} if touch else {}
+                if refresh_image_derivatives(instance, field_name, force=opts["force"], **extra_updates):
+                    updated += 1
+            self.stdout.write(self.style.SUCCESS(f"{name}: updated {updated} row(s)."))
+        if "offers" in opts["models"]:
+            offer_cache.invalidate()
@@ -0,0 +1,164 @@
+import re
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections, transaction
+from django.db.models import Value
+from django.test import RequestFactory
+from rest_framework.test import force_authenticate
+
+from accounts_app.api.views import BusinessProfileView, CustomerProfileView, UserProfileView
+from offers_app.api.facets import creator_counts, facet_aggregates
+from offers_app.api.views import (
+    OfferDetailRetrieveView,
+    OfferFacetsView,
+    OfferListCreateView,
+    OfferRetrieveUpdateDestroyView,
+)
+from orders_app.api.stats import stats_rows
+from orders_app.api.views import OrderListCreateView, OrderRetrieveUpdateDestroyView
+from reviews_app.api.views import ReviewListCreateView, ReviewRetrieveUpdateDestroyView
+
+SEQ_SCAN_PATTERNS = {
+    "sqlite": re.compile(r"\bSCAN (\w+)\s*$", re.MULTILINE),
+    "postgresql": re.compile(r"\bSeq Scan on (\w+)"),
+}
+
+
+def build_view(view_class, user, params=None, **kwargs):
+    """
+    An initialized view_class for a GET by user with the given query parameters and
+    URL kwargs, set up as dispatch() would before calling the handler.
+    """
+    request = RequestFactory().get("/", params or {})
+    force_authenticate(request, user=user)
+    view = view_class()
+    view.args, view.kwargs, view.format_kwarg = (), kwargs, None
+    view.request = view.initialize_request(request, **kwargs)
+    view.headers = view.default_response_headers
+    return view
+
+
+def list_queryset(view):
+    """
+    The first page of a list view: filter_queryset(get_queryset()) cut to the page size.
+    """
+    queryset = view.filter_queryset(view.get_queryset())
+    return queryset[: view.paginator.get_page_size(view.request)]
+
+
+def object_queryset(view):
+    """
+    The lookup query of get_object(), without executing it.
+    """
+    lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+    queryset = view.filter_queryset(view.get_queryset())
+    return queryset.filter(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+
+
+def prefetch_querysets(label, queryset, sample_id):
+    """
+    (label, queryset) for each prefetch_related() lookup of queryset.
+    """
+    instance = queryset.model(pk=sample_id)
+    return [
+        (f"{label} ({lookup})", getattr(instance, lookup).get_prefetch_querysets([instance])[0])
+        for lookup in queryset._prefetch_related_lookups
+    ]
+
+
+def hot_queries(using, sample_id=1):
+    """
+    Returns (label, queryset) pairs with the main query of each API endpoint, built by
+    the endpoint's own view for a request of the user with pk sample_id.
+    """
+    user = get_user_model()(pk=sample_id)
+    offer_list = build_view(OfferListCreateView, None)
+    offer_detail = build_view(OfferRetrieveUpdateDestroyView, user, id=sample_id)
+    # Unfiltered facets aggregate the whole catalog and are served from offer_cache;
+    # a filtered state shows whether the filter can use an index.
+    facets = build_view(OfferFacetsView, None, {"max_delivery_time": 3})
+    facet_queryset = facets.filter_queryset(facets.get_queryset())
+    order_list = build_view(OrderListCreateView, user)
+    order_list_business = build_view(OrderListCreateView, user, {"as": "business"})
+    page_size = order_list.paginator.get_page_size(order_list.request)
+
+    queries = [
+        ("offers", list_queryset(offer_list)),
+        *prefetch_querysets("offers", offer_list.get_queryset(), sample_id),
+        ("offers?ordering=-updated_at", list_queryset(build_view(OfferListCreateView, None, {"ordering": "-updated_at"}))),
+        ("offers?ordering=min_price", list_queryset(build_view(OfferListCreateView, None, {"ordering": "min_price"}))),
+        ("offers?creator_id", list_queryset(build_view(OfferListCreateView, None, {"creator_id": sample_id}))),
+        ("offers?min_price", list_queryset(build_view(OfferListCreateView, None, {"min_price": 100, "ordering": "min_price"}))),
+        ("offers?max_delivery_time", list_queryset(build_view(OfferListCreateView, None, {"max_delivery_time": 3}))),
+        ("offer-facets?max_delivery_time", facet_queryset.order_by().values(facets=Value(1)).annotate(**facet_aggregates())),
+        ("offer-facets?max_delivery_time (creator)", creator_counts(facet_queryset)),
+        ("offer-detail", object_queryset(offer_detail)),
+        *prefetch_querysets("offer-detail", offer_detail.get_queryset(), sample_id),
+        ("offerdetail-retrieve", object_queryset(build_view(OfferDetailRetrieveView, user, id=sample_id))),
+        ("order-list-create", order_list.feed.queryset(limit=page_size)[:page_size]),
+        ("order-list-create?as=business", order_list_business.feed.queryset(limit=page_size)[:page_size]),
+        ("order-detail", object_queryset(build_view(OrderRetrieveUpdateDestroyView, user, id=sample_id))),
+        ("order-stats (order-count, completed-order-count)", stats_rows([sample_id])),
+        ("review-list-create", list_queryset(build_view(ReviewListCreateView, user))),
+        (
+            "review-list-create?business_user_id",
+            list_queryset(build_view(ReviewListCreateView, user, {"business_user_id": sample_id})),
+        ),
+        (
+            "review-list-create?reviewer_id",
+            list_queryset(build_view(ReviewListCreateView, user, {"reviewer_id": sample_id})),
+        ),
+        ("review-detail", object_queryset(build_view(ReviewRetrieveUpdateDestroyView, user, id=sample_id))),
+        ("business-profile-list", list_queryset(build_view(BusinessProfileView, user))),
+        ("customer-profile-list", list_queryset(build_view(CustomerProfileView, user))),
+        ("user-profile", build_view(UserProfileView, user, pk=sample_id).get_queryset().filter(user__pk=sample_id)),
+    ]
+    return [(label, queryset.using(using)) for label, queryset in queries]
+
+
+class Command(BaseCommand):
+    help = "EXPLAIN the main query of every API endpoint and fail on sequential scans."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--database", default="default", help="Database alias to inspect.")
+        parser.add_argument(
+            "--sample-id",
+            type=int,
+            default=1,
+            help="Primary/foreign key value used in filtered queries.",
+        )
+        parser.add_argument("--verbose-plans", action="store_true", help="Print every plan.")
+
+    def handle(self, *args, **opts):
+        using = opts["database"]
+        connection = connections[using]
+        pattern = SEQ_SCAN_PATTERNS.get(connection.vendor)
+        if pattern is None:
+            raise CommandError(f"EXPLAIN checks are not supported for '{connection.vendor}'.")
+
+        offenders = []
+        for label, queryset in hot_queries(using, opts["sample_id"]):
+            plan = self._explain(connection, queryset)
+            tables = pattern.findall(plan)
+            if opts["verbose_plans"]:
+                self.stdout.write(self.style.MIGRATE_HEADING(label))
+                self.stdout.write(plan)
+            if tables:
+                offenders.append(f"{label}: sequential scan on {', '.join(sorted(set(tables)))}")
+            else:
+                self.stdout.write(f"ok  {label}")
+
+        if offenders:
+            raise CommandError("Sequential scans found:\n" + "\n".join(offenders))
+        self.stdout.write(self.style.SUCCESS("No sequential scans on hot paths."))
+
+    def _explain(self, connection, queryset):
+        if connection.vendor != "postgresql":
+            return queryset.explain()
+        # Small tables make the planner prefer seq scans; disable them so the
+        # plan shows whether a usable index exists at all.
+        with transaction.atomic(using=connection.alias):
+            with connection.cursor() as cursor:
+                cursor.execute("SET LOCAL enable_seqscan = off")
+            return queryset.explain()
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from baseinfo_app.models import PlatformStats
+
+COUNTERS = ("review_count", "rating_sum", "business_profile_count", "offer_count")
+
+
+class Command(BaseCommand):
+    help = "Recompute the PlatformStats counters from scratch and report/repair drift."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report drift, do not overwrite the stored counters.",
+        )
+
+    def handle(self, *args, **opts):
+        stats = PlatformStats.load()
+        actual = PlatformStats.compute()
+
+        drift = {
+            name: actual[name] - getattr(stats, name)
+            for name in COUNTERS
+            if actual[name] != getattr(stats, name)
+        }
+        if not drift:
+            self.stdout.write(self.style.SUCCESS("Platform stats are in sync."))
+            return
+
+        for name, delta in drift.items():
+            self.stdout.write(
+                self.style.WARNING(
+                    f"{name}: stored {getattr(stats, name)}, actual {actual[name]} ({delta:+d})"
+                )
+            )
+        if opts["dry_run"]:
+            return
+
+        PlatformStats.objects.filter(pk=stats.pk).update(**actual, updated_at=timezone.now())
+        self.stdout.write(self.style.SUCCESS("Platform stats repaired."))
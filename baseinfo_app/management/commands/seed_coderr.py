@@ -1,5 +1,7 @@
 from __future__ import annotations
 import random
+import time
+from contextlib import contextmanager
 from decimal import Decimal
 from typing import TYPE_CHECKING, Optional, Any
 from pathlib import Path
@@ -8,14 +10,19 @@ from datetime import timedelta
 from django.utils import timezone
 from django.core.management.base import BaseCommand
 from django.contrib.auth import get_user_model
-from django.db import transaction
+from django.contrib.auth.hashers import make_password
+from django.db import connection, transaction
 from django.conf import settings
 from django.core.files import File
 
 from accounts_app.models import Profile
+from baseinfo_app.models import PlatformStats
+from media_app.models import MediaBlob
+from media_app.storage import blob_storage
+from offers_app.api.cache import offer_cache
 from offers_app.models import Offer, OfferDetail
 from orders_app.models import Order
-from reviews_app.models import Review
+from reviews_app.models import BusinessRatingSummary, Review
 from .data import (
     CATEGORIES,
     OFFER_TEMPLATES,
@@ -127,6 +134,48 @@ def _random_past_datetime(max_days: int = 45) -> "timezone.datetime":
     return now - timedelta(days=d, seconds=s)
 
 
+def _tier_rows(days_triplet=None) -> list[dict]:
+    """
+    Felder der drei Pakete (basic/standard/premium) einer Offer.
+    """
+    if days_triplet is None:
+        days_triplet = _choose_tier_days()
+    base = random.randint(200, 1200)
+    features = random.sample(FEATURE_POOL, k=4)
+    data = [
+        ("basic", Decimal("1.0"), days_triplet[0], 1),
+        ("standard", Decimal("1.6"), days_triplet[1], 2),
+        ("premium", Decimal("2.3"), days_triplet[2], 3),
+    ]
+    return [
+        {
+            "title": f"{name.title()} Paket",
+            "price": (Decimal(base) * mult).quantize(Decimal("1.00")),
+            "delivery_time_in_days": days,
+            "revisions": rev,
+            "features": random.sample(features, k=min(4, len(features))),
+            "offer_type": name,
+        }
+        for name, mult, days, rev in data
+    ]
+
+
+@contextmanager
+def _explicit_timestamps(model, *field_names):
+    """
+    Schaltet auto_now/auto_now_add vorübergehend ab, damit bulk_create gesetzte Zeitstempel übernimmt.
+    """
+    fields = [model._meta.get_field(name) for name in field_names]
+    saved = [(f, f.auto_now, f.auto_now_add) for f in fields]
+    for f in fields:
+        f.auto_now = f.auto_now_add = False
+    try:
+        yield
+    finally:
+        for f, auto_now, auto_now_add in saved:
+            f.auto_now, f.auto_now_add = auto_now, auto_now_add
+
+
 # ---- Command ---------------------------------------------------------------
 class Command(BaseCommand):
     help = "Seed Coderr mit kuratierten, realistischeren Demo-Daten (optional mit Faker auffüllen)."
@@ -172,6 +221,18 @@ class Command(BaseCommand):
         )
         parser.add_argument("--orders", type=int, default=40, help="Anzahl Orders.")
         parser.add_argument("--reviews", type=int, default=80, help="Anzahl Reviews.")
+        parser.add_argument(
+            "--bulk",
+            action="store_true",
+            help="Massenimport per bulk_create: ein Passwort-Hash, Bildreferenzen statt Kopien, "
+            "Zähler werden am Ende neu berechnet.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=5000,
+            help="Batch-Größe für bulk_create im --bulk-Modus.",
+        )
 
     @transaction.atomic
     def handle(self, *args, **opts):
@@ -196,7 +257,7 @@ class Command(BaseCommand):
 
         self.stdout.write(self.style.MIGRATE_HEADING("Seeding Coderr…"))
         if fresh:
-            self._flush(keep_superuser=keep_su)
+            self._flush(keep_superuser=keep_su, bulk=opts["bulk"])
 
         # Zwei Demo-Logins
         demo_business = self._ensure_user(
@@ -214,6 +275,19 @@ class Command(BaseCommand):
             desc="Demo Customer – kann Bestellungen & Bewertungen erstellen.",
         )
 
+        if opts["bulk"]:
+            self._bulk_seed(
+                demo_business,
+                demo_customer,
+                num_biz=num_biz,
+                num_cust=num_cust,
+                fake_extra=fake_extra,
+                num_orders=num_orders,
+                num_reviews=num_reviews,
+                chunk=max(1, int(opts["chunk_size"])),
+            )
+            return
+
         # Benutzer
         self.stdout.write("Erzeuge Benutzer…")
         business_users = self._create_business_users(num_biz)
@@ -321,10 +395,16 @@ class Command(BaseCommand):
         self.stdout.write(self.style.SUCCESS("✔ Seed fertig."))
 
     # ---- Helpers -----------------------------------------------------------
-    def _flush(self, keep_superuser: bool):
+    def _flush(self, keep_superuser: bool, bulk: bool = False):
         self.stdout.write(
             self.style.WARNING("Flush: lösche Users/Profiles/Offers/Orders/Reviews …")
         )
+        if bulk:
+            # Ohne Collector/Signals: sonst ein Signal (und oft ein UPDATE) pro gelöschter Zeile.
+            # Die abgeleiteten Zähler werden am Ende des Bulk-Seeds ohnehin neu berechnet.
+            with connection.cursor() as cursor:
+                for model in (Order, Review, BusinessRatingSummary, OfferDetail, Offer, Profile):
+                    cursor.execute(f"DELETE FROM {connection.ops.quote_name(model._meta.db_table)}")
         su_ids: set[int] = (
             set(
                 UserModel.objects.filter(is_superuser=True).values_list("id", flat=True)
@@ -404,28 +484,225 @@ class Command(BaseCommand):
         return users
 
     def _create_tiers(self, offer, days_triplet=None):
-        if days_triplet is None:
-            days_triplet = _choose_tier_days()
-        b_days, s_days, p_days = days_triplet
-
-        base = random.randint(200, 1200)
-        features = random.sample(FEATURE_POOL, k=4)
-        data = [
-            ("basic", Decimal("1.0"), b_days, 1),
-            ("standard", Decimal("1.6"), s_days, 2),
-            ("premium", Decimal("2.3"), p_days, 3),
+        return [
+            OfferDetail.objects.create(offer=offer, **row) for row in _tier_rows(days_triplet)
         ]
-        tiers = []
-        for name, mult, days, rev in data:
-            tiers.append(
-                OfferDetail.objects.create(
-                    offer=offer,
-                    title=f"{name.title()} Paket",
-                    price=(Decimal(base) * mult).quantize(Decimal("1.00")),
-                    delivery_time_in_days=days,
-                    revisions=rev,
-                    features=random.sample(features, k=min(4, len(features))),
-                    offer_type=name,
+
+    # ---- Bulk mode -------------------------------------------------------------
+    def _bulk_seed(self, demo_business, demo_customer, *, num_biz, num_cust, fake_extra,
+                   num_orders, num_reviews, chunk):
+        started = time.perf_counter()
+        self._rows: dict[str, int] = {}
+        self._chunk = chunk
+        self._stored_images: dict[Path, str] = {}
+
+        self.stdout.write("Erzeuge Benutzer (bulk)…")
+        password = make_password("demo1234")
+        business_ids = self._bulk_users("business", num_biz, password) + [demo_business.id]
+        customer_ids = self._bulk_users("customer", num_cust, password) + [demo_customer.id]
+
+        self.stdout.write("Erzeuge Offers (bulk)…")
+        detail_sample = self._bulk_offers(business_ids, fake_extra)
+
+        self.stdout.write("Erzeuge Orders (bulk)…")
+        self._bulk_orders(detail_sample, customer_ids, num_orders)
+
+        self.stdout.write("Erzeuge Reviews (bulk)…")
+        self._bulk_reviews(business_ids, customer_ids, num_reviews)
+
+        # bulk_create sendet keine Signals: abgeleitete Zähler einmal komplett neu berechnen.
+        self.stdout.write("Berechne Zähler neu…")
+        PlatformStats.load()
+        PlatformStats.objects.filter(pk=PlatformStats.SINGLETON_ID).update(
+            **PlatformStats.compute(), updated_at=timezone.now()
+        )
+        BusinessRatingSummary.rebuild_all(batch_size=chunk)
+        MediaBlob.objects.recount(batch_size=chunk)
+        offer_cache.invalidate()
+
+        elapsed = time.perf_counter() - started
+        total = sum(self._rows.values())
+        for table, rows in self._rows.items():
+            self.stdout.write(f"  {table:14} {rows:>10}")
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"✔ Seed fertig: {total} Zeilen in {elapsed:.1f}s ({total / max(elapsed, 1e-9):,.0f} Zeilen/s)."
+            )
+        )
+
+    def _count(self, table: str, rows: int):
+        self._rows[table] = self._rows.get(table, 0) + rows
+
+    def _stored_image(self, src: Path | None, folder: str) -> str:
+        """
+        Legt jede Quelldatei nur einmal im Blob-Storage ab und gibt den gespeicherten Namen zurück.
+        """
+        if src is None:
+            return ""
+        if src not in self._stored_images:
+            with src.open("rb") as fh:
+                self._stored_images[src] = blob_storage.save(f"{folder}/seed-{src.name}", File(fh))
+        return self._stored_images[src]
+
+    def _bulk_users(self, kind: str, n: int, password: str) -> list[int]:
+        avatars = _list_images(SEED_MEDIA_DIR / "profile_pictures")
+        desc = (
+            "Agentur/Einzelunternehmen – nimmt Aufträge an."
+            if kind == "business"
+            else "Kunde – erstellt Bestellungen und Bewertungen."
+        )
+        run = f"{random.randrange(16**4):04x}"
+        ids: list[int] = []
+        for start in range(0, n, self._chunk):
+            users = []
+            for i in range(start, min(n, start + self._chunk)):
+                first, last = random.choice(FIRST_NAMES), random.choice(LAST_NAMES)
+                username = f"{first}.{last}.{kind[0]}{run}{i}".lower()
+                users.append(
+                    UserModel(
+                        username=username,
+                        email=f"{username}@example.com",
+                        password=password,
+                        first_name=first,
+                        last_name=last,
+                    )
+                )
+            UserModel.objects.bulk_create(users, batch_size=self._chunk)
+            Profile.objects.bulk_create(
+                [
+                    Profile(
+                        user_id=u.id,
+                        type=kind,
+                        location="München" if kind == "business" else "Berlin",
+                        tel="0151 2345678",
+                        description=desc,
+                        working_hours="9-17",
+                        file=self._stored_image(
+                            random.choice(avatars) if avatars else None, "profile_pictures"
+                        ),
+                    )
+                    for u in users
+                ],
+                batch_size=self._chunk,
+            )
+            ids += [u.id for u in users]
+            self._count("users", len(users))
+            self._count("profiles", len(users))
+        return ids
+
+    def _bulk_offers(self, business_ids: list[int], fake_extra: int) -> list[dict]:
+        """
+        Legt Offers samt Paketen chunkweise an; min_price/min_delivery_time werden im Speicher
+        berechnet. Gibt eine Stichprobe der Pakete (mit business_user_id) für die Orders zurück.
+        """
+        def planned():
+            for uid in business_ids:
+                cat = random.choice(CATEGORIES)
+                templates = OFFER_TEMPLATES.get(cat) or [("Individuelles Angebot", "Maßgeschneiderte Leistung.")]
+                for title, desc in random.sample(templates, k=min(random.randint(2, 3), len(templates))):
+                    yield uid, cat, title, desc
+            for i in range(fake_extra):
+                cat = random.choice(CATEGORIES)
+                templates = OFFER_TEMPLATES.get(cat) or [("Individuelles Angebot", "Maßgeschneiderte Leistung.")]
+                title, desc = random.choice(templates)
+                yield random.choice(business_ids), cat, f"{title} #{i + 1}", desc
+
+        sample: list[dict] = []
+        sample_size = 50_000
+        seen = 0
+        batch: list[tuple] = []
+
+        def flush():
+            nonlocal seen
+            offers, tiers = [], []
+            for uid, cat, title, desc in batch:
+                rows = _tier_rows()
+                ts = _random_past_datetime(45)
+                offers.append(
+                    Offer(
+                        user_id=uid,
+                        title=title[:100],
+                        description=desc,
+                        image=self._stored_image(_resolve_category_image(cat), "offer_images"),
+                        min_price=min(r["price"] for r in rows),
+                        min_delivery_time=min(r["delivery_time_in_days"] for r in rows),
+                        created_at=ts,
+                        updated_at=ts,
+                    )
+                )
+                tiers.append(rows)
+            with _explicit_timestamps(Offer, "created_at", "updated_at"):
+                Offer.objects.bulk_create(offers, batch_size=self._chunk)
+            details = []
+            for offer, rows in zip(offers, tiers):
+                for row in rows:
+                    details.append(OfferDetail(offer_id=offer.id, **row))
+                    # Reservoir-Stichprobe, damit der Speicherbedarf nicht mit der Datenmenge wächst.
+                    seen += 1
+                    entry = dict(row, business_user_id=offer.user_id)
+                    if len(sample) < sample_size:
+                        sample.append(entry)
+                    else:
+                        slot = random.randrange(seen)
+                        if slot < sample_size:
+                            sample[slot] = entry
+            OfferDetail.objects.bulk_create(details, batch_size=self._chunk)
+            self._count("offers", len(offers))
+            self._count("offer_details", len(details))
+            batch.clear()
+
+        for item in planned():
+            batch.append(item)
+            if len(batch) >= self._chunk:
+                flush()
+        if batch:
+            flush()
+        return sample
+
+    def _bulk_orders(self, detail_sample: list[dict], customer_ids: list[int], n: int):
+        if not detail_sample:
+            return
+        for start in range(0, n, self._chunk):
+            orders = []
+            for _ in range(start, min(n, start + self._chunk)):
+                detail = random.choice(detail_sample)
+                orders.append(
+                    Order(
+                        customer_user_id=random.choice(customer_ids),
+                        status=random.choices(
+                            ["in_progress", "completed", "cancelled"], weights=[50, 40, 10]
+                        )[0],
+                        **detail,
+                    )
+                )
+            Order.objects.bulk_create(orders, batch_size=self._chunk)
+            self._count("orders", len(orders))
+
+    def _bulk_reviews(self, business_ids: list[int], customer_ids: list[int], n: int):
+        # Ein Review pro Customer->Business; bestehende Paare werden per ignore_conflicts übersprungen,
+        # daher zählt die Differenz von count() vorher/nachher statt der übergebenen Objekte.
+        before = Review.objects.count()
+        n = min(n, len(business_ids) * len(customer_ids))
+        seen: set[tuple[int, int]] = set()
+        reviews: list[Review] = []
+        attempts = 0
+        while len(seen) < n and attempts < n * 3:
+            attempts += 1
+            key = (random.choice(customer_ids), random.choice(business_ids))
+            if key[0] == key[1] or key in seen:
+                continue
+            seen.add(key)
+            reviews.append(
+                Review(
+                    reviewer_id=key[0],
+                    business_user_id=key[1],
+                    rating=random.choices([5, 4, 3, 2, 1], weights=[35, 30, 20, 10, 5])[0],
+                    description=random.choice(REVIEW_SENTENCES),
                 )
             )
-        return tiers
+            if len(reviews) >= self._chunk:
+                Review.objects.bulk_create(reviews, batch_size=self._chunk, ignore_conflicts=True)
+                reviews = []
+        if reviews:
+            Review.objects.bulk_create(reviews, batch_size=self._chunk, ignore_conflicts=True)
+        self._count("reviews", Review.objects.count() - before)
@@ -0,0 +1,51 @@
+# Generated by Django 5.1.6 on 2026-10-18 04:04
+
+from django.db import migrations, models
+from django.db.models import Count, Sum
+
+
+def create_stats_row(apps, schema_editor):
+    PlatformStats = apps.get_model("baseinfo_app", "PlatformStats")
+    Review = apps.get_model("reviews_app", "Review")
+    Profile = apps.get_model("accounts_app", "Profile")
+    Offer = apps.get_model("offers_app", "Offer")
+    reviews = Review.objects.aggregate(count=Count("id"), total=Sum("rating"))
+    PlatformStats.objects.update_or_create(
+        pk=1,
+        defaults={
+            "review_count": reviews["count"],
+            "rating_sum": reviews["total"] or 0,
+            "business_profile_count": Profile.objects.filter(type="business").count(),
+            "offer_count": Offer.objects.count(),
+        },
+    )
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ('accounts_app', '0003_hot_path_indexes'),
+        ('offers_app', '0003_hot_path_indexes'),
+        ('reviews_app', '0002_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PlatformStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.BigIntegerField(default=0)),
+                ('business_profile_count', models.IntegerField(default=0)),
+                ('offer_count', models.IntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'verbose_name': 'Platform Stats',
+                'verbose_name_plural': 'Platform Stats',
+            },
+        ),
+        migrations.RunPython(create_stats_row, migrations.RunPython.noop),
+    ]
@@ -1,3 +1,86 @@
-from django.db import models
+from asgiref.sync import sync_to_async
+from django.db import IntegrityError, models, transaction
+from django.db.models import Count, F, Sum
 
-# Create your models here.
+
+class PlatformStats(models.Model):
+    """
+    Single-row table with the platform-wide counters shown by the base info endpoint.
+    Kept current by signals on reviews, profiles and offers (see baseinfo_app.signals).
+    """
+    SINGLETON_ID = 1
+
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.BigIntegerField(default=0)
+    business_profile_count = models.IntegerField(default=0)
+    offer_count = models.IntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        verbose_name = "Platform Stats"
+        verbose_name_plural = "Platform Stats"
+
+    def __str__(self):
+        return f"{self.review_count} reviews, {self.offer_count} offers"
+
+    @property
+    def average_rating(self):
+        if not self.review_count:
+            return 0
+        return round(self.rating_sum / self.review_count, 1)
+
+    @classmethod
+    def compute(cls):
+        """
+        Recomputes all counters from scratch with full-table aggregates.
+        """
+        from accounts_app.models import Profile
+        from offers_app.models import Offer
+        from reviews_app.models import Review
+
+        reviews = Review.objects.aggregate(count=Count("id"), total=Sum("rating"))
+        return {
+            "review_count": reviews["count"],
+            "rating_sum": reviews["total"] or 0,
+            "business_profile_count": Profile.objects.filter(type="business").count(),
+            "offer_count": Offer.objects.count(),
+        }
+
+    @classmethod
+    def load(cls):
+        """
+        Returns the counters row, creating it from a full recomputation if missing.
+        """
+        stats = cls.objects.filter(pk=cls.SINGLETON_ID).first()
+        if stats is not None:
+            return stats
+        try:
+            with transaction.atomic():
+                return cls.objects.create(pk=cls.SINGLETON_ID, **cls.compute())
+        except IntegrityError:
+            return cls.objects.get(pk=cls.SINGLETON_ID)
+
+    @classmethod
+    async def aload(cls):
+        """
+        load() for async views; only the rare first-time recomputation runs in a thread.
+        """
+        stats = await cls.objects.filter(pk=cls.SINGLETON_ID).afirst()
+        if stats is not None:
+            return stats
+        return await sync_to_async(cls.load)()
+
+    @classmethod
+    def increment(cls, **deltas):
+        """
+        Atomically applies counter deltas, e.g. increment(review_count=1, rating_sum=4).
+        """
+        deltas = {name: delta for name, delta in deltas.items() if delta}
+        if not deltas:
+            return
+        updated = cls.objects.filter(pk=cls.SINGLETON_ID).update(
+            **{name: F(name) + delta for name, delta in deltas.items()}
+        )
+        if not updated:
+            # The row is recomputed from scratch, which already includes this change.
+            cls.load()
@@ -0,0 +1,46 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from accounts_app.models import Profile
+from baseinfo_app.models import PlatformStats
+from offers_app.models import Offer
+from reviews_app.models import Review
+
+
+@receiver(post_save, sender=Review)
+def review_saved(sender, instance, created, **kwargs):
+    if created:
+        PlatformStats.increment(review_count=1, rating_sum=instance.rating)
+        return
+    previous = instance.loaded_value("rating", instance.rating)
+    PlatformStats.increment(rating_sum=instance.rating - previous)
+
+
+@receiver(post_delete, sender=Review)
+def review_deleted(sender, instance, **kwargs):
+    rating = instance.loaded_value("rating", instance.rating)
+    PlatformStats.increment(review_count=-1, rating_sum=-rating)
+
+
+@receiver(post_save, sender=Profile)
+def profile_saved(sender, instance, created, **kwargs):
+    was_business = not created and instance.loaded_value("type") == "business"
+    is_business = instance.type == "business"
+    PlatformStats.increment(business_profile_count=int(is_business) - int(was_business))
+
+
+@receiver(post_delete, sender=Profile)
+def profile_deleted(sender, instance, **kwargs):
+    if instance.loaded_value("type", instance.type) == "business":
+        PlatformStats.increment(business_profile_count=-1)
+
+
+@receiver(post_save, sender=Offer)
+def offer_saved(sender, instance, created, **kwargs):
+    if created:
+        PlatformStats.increment(offer_count=1)
+
+
+@receiver(post_delete, sender=Offer)
+def offer_deleted(sender, instance, **kwargs):
+    PlatformStats.increment(offer_count=-1)
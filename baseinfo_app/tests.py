@@ -1,21 +1,38 @@
-from django.test import TestCase
+import json
+import os
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from io import StringIO
+from unittest.mock import patch
+
+from PIL import Image as PILImage
+from django.core.management import call_command
+from django.core.management.base import CommandError
+from django.db import connections
+from django.test import SimpleTestCase, TestCase, override_settings
 from django.urls import reverse
 from rest_framework.test import APIClient
 from accounts_app.models import Profile
-from reviews_app.models import Review
-from offers_app.models import Offer
+from reviews_app.models import BusinessRatingSummary, Review
+from offers_app.models import Offer, OfferDetail
+from orders_app.models import Order
+from baseinfo_app.models import PlatformStats
+from media_app.models import MediaBlob
+from media_app.storage import blob_storage
+from baseinfo_app.management.commands.benchmark_serving import load_test
 from django.contrib.auth.models import User
 
 class BaseInfoViewTests(TestCase):
     def setUp(self):
         self.client = APIClient()
 
-        user1 = User.objects.create_user(username="test1", password="pw", email="t1@ex.com")
-        user2 = User.objects.create_user(username="test2", password="pw", email="t2@ex.com")
+        self.user1 = user1 = User.objects.create_user(username="test1", password="pw", email="t1@ex.com")
+        self.user2 = user2 = User.objects.create_user(username="test2", password="pw", email="t2@ex.com")
         Profile.objects.create(user=user1, type="business")
         Profile.objects.create(user=user2, type="customer")
         offer = Offer.objects.create(user=user1, title="Logo", description="desc")
-        Review.objects.create(business_user=user1, reviewer=user2, rating=4, description="Nice!")
+        self.review = Review.objects.create(business_user=user1, reviewer=user2, rating=4, description="Nice!")
 
     def test_baseinfo_returns_counts_and_average(self):
         response = self.client.get("/api/base-info/")
@@ -42,3 +59,194 @@ class BaseInfoViewTests(TestCase):
         self.assertEqual(data["average_rating"], 0)
         self.assertEqual(data["business_profile_count"], 0)
         self.assertEqual(data["offer_count"], 0)
+
+    def test_baseinfo_is_a_single_row_read(self):
+        with self.assertNumQueries(1):
+            response = self.client.get("/api/base-info/")
+        self.assertEqual(response.status_code, 200)
+
+    def test_baseinfo_follows_updates_and_type_changes(self):
+        self.review.rating = 2
+        self.review.save()
+        profile = Profile.objects.get(user=self.user2)
+        profile.type = "business"
+        profile.save()
+        data = self.client.get("/api/base-info/").data
+        self.assertEqual(data["average_rating"], 2.0)
+        self.assertEqual(data["business_profile_count"], 2)
+
+        self.user1.delete()
+        data = self.client.get("/api/base-info/").data
+        self.assertEqual(data["review_count"], 0)
+        self.assertEqual(data["offer_count"], 0)
+        self.assertEqual(data["business_profile_count"], 1)
+
+    def test_reconcile_reports_and_repairs_drift(self):
+        PlatformStats.objects.update(offer_count=7)
+        out = StringIO()
+        call_command("reconcile_platform_stats", stdout=out)
+        self.assertIn("offer_count: stored 7, actual 1 (-6)", out.getvalue())
+        self.assertEqual(PlatformStats.load().offer_count, 1)
+
+    def test_missing_stats_row_is_recomputed(self):
+        PlatformStats.objects.all().delete()
+        response = self.client.get("/api/base-info/")
+        self.assertEqual(response.data["review_count"], 1)
+        self.assertEqual(response.data["offer_count"], 1)
+
+
+class ExplainHotQueriesTests(TestCase):
+    def test_hot_queries_use_indexes(self):
+        out = StringIO()
+        call_command("explain_hot_queries", stdout=out)
+        self.assertIn("No sequential scans on hot paths.", out.getvalue())
+        self.assertIn("ok  order-list-create\n", out.getvalue())
+        self.assertIn("ok  offer-facets?max_delivery_time\n", out.getvalue())
+
+
+class BenchmarkCompareTests(SimpleTestCase):
+    def _write(self, directory, name, endpoints, cold_cache=True):
+        path = os.path.join(directory, name)
+        with open(path, "w", encoding="utf-8") as fh:
+            json.dump({"meta": {"cold_cache": cold_cache}, "endpoints": endpoints}, fh)
+        return path
+
+    def test_compare_flags_latency_and_query_regressions(self):
+        base = {"p50_ms": 10.0, "p95_ms": 20.0, "p99_ms": 30.0, "queries": 2}
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = self._write(directory, "a.json", {"offers": base, "orders": base})
+            same = self._write(directory, "b.json", {
+                "offers": dict(base, p95_ms=21.0),
+                "orders": dict(base, p99_ms=30.5),
+            })
+            worse = self._write(directory, "c.json", {
+                "offers": dict(base, p95_ms=40.0),
+                "orders": dict(base, queries=3),
+            })
+
+            out = StringIO()
+            call_command("benchmark_api", compare=[baseline, same], stdout=out)
+            self.assertIn("No regressions.", out.getvalue())
+
+            out = StringIO()
+            with self.assertRaisesMessage(CommandError, "2 regression(s) found."):
+                call_command("benchmark_api", compare=[baseline, worse], stdout=out)
+            self.assertIn("offers: p95_ms 20.0 -> 40.0 ms (+100%)", out.getvalue())
+            self.assertIn("orders: queries 2 -> 3", out.getvalue())
+
+            warm = self._write(directory, "d.json", {"offers": base, "orders": base}, cold_cache=False)
+            with self.assertRaisesMessage(CommandError, "Cannot compare a cold-cache run with a warm-cache run."):
+                call_command("benchmark_api", compare=[baseline, warm], stdout=StringIO())
+
+
+class LoadGeneratorTests(SimpleTestCase):
+    def test_load_test_counts_requests_over_closing_and_keep_alive_connections(self):
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                body = b"{}" if self.path == "/ok/" else b""
+                self.send_response(200 if self.path == "/ok/" else 500)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        for protocol in ("HTTP/1.0", "HTTP/1.1"):
+            Handler.protocol_version = protocol
+            server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+            thread = threading.Thread(target=server.serve_forever, daemon=True)
+            thread.start()
+            try:
+                result = load_test("127.0.0.1", server.server_port, ["/ok/", "/fail/"], 2, 0.3)
+            finally:
+                server.shutdown()
+                server.server_close()
+            self.assertGreater(result["requests"], 2)
+            self.assertEqual(result["concurrency"], 2)
+            self.assertAlmostEqual(result["errors"], result["requests"] / 2, delta=2)
+
+
+class ConnectionBenchmarkTests(SimpleTestCase):
+    def test_persistent_connections_are_opened_once_per_thread(self):
+        with tempfile.TemporaryDirectory() as directory:
+            output = os.path.join(directory, "connections.json")
+            # Django never closes in-memory SQLite connections, so use a file database.
+            with patch.dict(connections["default"].settings_dict, NAME=os.path.join(directory, "db.sqlite3")):
+                call_command("benchmark_db_connections", threads=2, requests=5, output=output, stdout=StringIO())
+            with open(output, encoding="utf-8") as fh:
+                results = json.load(fh)["results"]
+        self.assertEqual(results["per-request"]["connects"], 10)
+        self.assertEqual(results["persistent"]["connects"], 2)
+        self.assertEqual(results["per-request"]["saved_ms_per_request"], 0)
+        self.assertEqual(results["persistent"]["requests"], 10)
+
+
+class ImageDerivativeBackfillTests(TestCase):
+    def test_backfill_builds_missing_derivatives_once(self):
+        user = User.objects.create_user(username="biz", password="pw")
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            os.makedirs(os.path.join(media_root, "offer_images"))
+            PILImage.new("RGB", (500, 250)).save(os.path.join(media_root, "offer_images", "seed.jpg"))
+            Offer.objects.bulk_create([
+                Offer(user=user, title=f"Offer {i}", image="offer_images/seed.jpg") for i in range(3)
+            ])
+            Profile.objects.bulk_create([Profile(user=user, type="business")])
+
+            out = StringIO()
+            call_command("build_image_derivatives", stdout=out)
+            self.assertIn("offers: updated 3 row(s).", out.getvalue())
+            self.assertIn("profiles: updated 0 row(s).", out.getvalue())
+            offer = Offer.objects.first()
+            self.assertEqual((offer.image_width, offer.image_height), (500, 250))
+            self.assertEqual(list(offer.image_derivatives["jpeg"]), ["160", "320", "500"])
+            self.assertEqual(len(os.listdir(os.path.join(media_root, "derivatives", "offer_images"))), 6)
+
+            out = StringIO()
+            call_command("build_image_derivatives", "--models", "offers", stdout=out)
+            self.assertIn("offers: updated 0 row(s).", out.getvalue())
+
+
+class BulkSeedTests(TestCase):
+    def test_bulk_seed_keeps_derived_data_consistent(self):
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            call_command(
+                "seed_coderr", fresh=True, bulk=True, chunk_size=7, biz=6, cust=8,
+                fake_extra=5, orders=30, reviews=25, stdout=out,
+            )
+            stored_images = set(blob_storage.stored_blobs())
+        self.assertIn("Zeilen/s", out.getvalue())
+        self.assertEqual(Order.objects.count(), 30)
+        self.assertEqual(OfferDetail.objects.count(), 3 * Offer.objects.count())
+        offer_images = {o.image.name for o in Offer.objects.exclude(image="")}
+        self.assertLessEqual(offer_images, stored_images)
+        blob = MediaBlob.objects.get(name=Offer.objects.exclude(image="").first().image.name)
+        self.assertEqual(blob.ref_count, Offer.objects.filter(image=blob.name).count())
+
+        self.assertGreater(len(set(Offer.objects.values_list("created_at", flat=True))), 1)
+        offer = Offer.objects.order_by("?").first()
+        self.assertEqual(offer.min_price, min(d.price for d in offer.details.all()))
+
+        stats = PlatformStats.load()
+        self.assertEqual(stats.offer_count, Offer.objects.count())
+        self.assertEqual(stats.review_count, Review.objects.count())
+        business = Review.objects.first().business_user
+        summary = BusinessRatingSummary.objects.get(business_user=business)
+        self.assertEqual(summary.review_count, Review.objects.filter(business_user=business).count())
+
+        out = StringIO()
+        call_command("refresh_offer_minimums", dry_run=True, stdout=out)
+        self.assertIn("0 offer(s) with drifted minima.", out.getvalue())
+
+    def test_bulk_seed_reports_inserted_reviews_only(self):
+        business = User.objects.create_user(username="demo_business")
+        customer = User.objects.create_user(username="demo_customer")
+        Review.objects.create(business_user=business, reviewer=customer, rating=4, description="Gut")
+        out = StringIO()
+        with tempfile.TemporaryDirectory() as media_root, override_settings(MEDIA_ROOT=media_root):
+            call_command(
+                "seed_coderr", bulk=True, biz=0, cust=0, fake_extra=0, orders=0, reviews=1, stdout=out,
+            )
+        self.assertEqual(Review.objects.count(), 1)
+        self.assertRegex(out.getvalue(), r"reviews +0\n")
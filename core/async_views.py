@@ -0,0 +1,103 @@
+"""
+Async read path for the ASGI deployment (SERVER_MODE=asgi).
+
+Each AsyncReadView wraps the DRF view that serves the endpoint under WSGI. GET and
+HEAD are answered by the async view with the async ORM; authentication, permissions
+and throttling still come from the DRF view (one worker-thread hop, as they may hit
+the token cache or the database). Every other method is handed to the DRF view
+unchanged, so writes behave exactly as under WSGI.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.http import Http404, HttpResponse
+from django.utils.decorators import classonlymethod
+from django.views import View
+from django.views.decorators.csrf import csrf_exempt
+from rest_framework.renderers import JSONRenderer
+
+SAFE_READ_METHODS = ("GET", "HEAD")
+
+
+def read_view(async_view_class):
+    """
+    URL helper: the async view when ASYNC_READ_VIEWS is on, otherwise the DRF view it wraps.
+    """
+    if settings.ASYNC_READ_VIEWS:
+        return async_view_class.as_view()
+    return async_view_class.sync_view_class.as_view()
+
+
+async def aget_object(view):
+    """
+    Async counterpart of GenericAPIView.get_object().
+    """
+    queryset = view.filter_queryset(view.get_queryset())
+    lookup_url_kwarg = view.lookup_url_kwarg or view.lookup_field
+    try:
+        instance = await queryset.aget(**{view.lookup_field: view.kwargs[lookup_url_kwarg]})
+    except (queryset.model.DoesNotExist, ValueError, TypeError):
+        raise Http404(f"No {queryset.model._meta.object_name} matches the given query.")
+    view.check_object_permissions(view.request, instance)
+    return instance
+
+
+async def alist(view, request):
+    """
+    Async counterpart of ListModelMixin.list() for views using core.pagination.
+    """
+    queryset = view.filter_queryset(view.get_queryset())
+    page = await view.paginator.apaginate_queryset(queryset, request, view=view)
+    serializer = view.get_serializer(page, many=True)
+    return view.get_paginated_response(serializer.data)
+
+
+class AsyncReadView(View):
+    """
+    Base class for async read views. Subclasses set sync_view_class and implement
+    aget(request, *args, **kwargs), where self.api_view is the initialized DRF view
+    and request the DRF request. aget returns a DRF Response. There is no default
+    handler: as_view() refuses a subclass that lacks either.
+    """
+    sync_view_class = None
+    sync_view = None
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        if cls.sync_view_class is None or not callable(getattr(cls, "aget", None)):
+            raise ImproperlyConfigured(f"{cls.__name__} must set sync_view_class and define aget().")
+        view = csrf_exempt(super().as_view(sync_view=cls.sync_view_class.as_view(), **initkwargs))
+        # Schema generators (drf-yasg) document the endpoint from the DRF view.
+        view.cls = cls.sync_view_class
+        view.initkwargs = {}
+        return view
+
+    async def dispatch(self, request, *args, **kwargs):
+        if request.method in SAFE_READ_METHODS:
+            return await self.get(request, *args, **kwargs)
+        return await sync_to_async(self.sync_view)(request, *args, **kwargs)
+
+    async def get(self, request, *args, **kwargs):
+        api_view = self.api_view = self.sync_view_class()
+        api_view.args, api_view.kwargs = args, kwargs
+        drf_request = api_view.initialize_request(request, *args, **kwargs)
+        api_view.request = drf_request
+        api_view.headers = api_view.default_response_headers
+        try:
+            await sync_to_async(api_view.initial)(drf_request, *args, **kwargs)
+            response = await self.aget(drf_request, *args, **kwargs)
+        except Exception as exc:
+            response = api_view.handle_exception(exc)
+        response = api_view.finalize_response(drf_request, response, *args, **kwargs)
+        return await self.render(response)
+
+    async def render(self, response):
+        """
+        Renders the DRF response here instead of in the handler, which would hop to a
+        worker thread for it. Non-JSON renderers (browsable API) may query, so they do.
+        """
+        if isinstance(response.accepted_renderer, JSONRenderer):
+            response.render()
+        else:
+            await sync_to_async(response.render)()
+        return HttpResponse(response.content, status=response.status_code, headers=dict(response.items()))
@@ -0,0 +1,209 @@
+import hashlib
+
+from asgiref.sync import sync_to_async
+from django.db.models import Count, Max
+from django.utils.http import http_date, parse_etags, parse_http_date_safe, quote_etag
+from rest_framework import status
+from rest_framework.response import Response
+
+from core.async_views import aget_object
+
+VALIDATOR_HEADERS = ("ETag", "Last-Modified")
+
+
+def make_etag(*parts):
+    """
+    Builds a weak ETag from the given parts. Weak, because it is derived from
+    row metadata instead of the response bytes.
+    """
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return "W/" + quote_etag(digest)
+
+
+def request_variant(request):
+    """
+    Everything besides the rows that changes the representation: URL and user.
+    """
+    user_id = request.user.pk if request.user.is_authenticated else None
+    return request.build_absolute_uri(), user_id
+
+
+def list_validators(queryset, request, **aggregates):
+    """
+    Returns (etag, last_modified, stats) for a list from max(updated_at) and the row count.
+    The count catches deletions, which do not move max(updated_at). Extra aggregates
+    are computed in the same query and returned in stats next to "count".
+    """
+    stats = queryset.order_by().aggregate(
+        last_modified=Max("updated_at"), count=Count("pk"), **aggregates
+    )
+    etag = make_etag(request_variant(request), stats["last_modified"], stats["count"])
+    return etag, stats["last_modified"], stats
+
+
+async def alist_validators(queryset, request, **aggregates):
+    """
+    list_validators() through the async ORM.
+    """
+    stats = await queryset.order_by().aaggregate(
+        last_modified=Max("updated_at"), count=Count("pk"), **aggregates
+    )
+    etag = make_etag(request_variant(request), stats["last_modified"], stats["count"])
+    return etag, stats["last_modified"], stats
+
+
+def page_validators(rows, request):
+    """
+    Returns (etag, last_modified) for an already fetched page of rows. Used for keyset
+    pages, which must not pay for an aggregate over the whole list.
+    """
+    last_modified = max((row.updated_at for row in rows), default=None)
+    etag = make_etag(request_variant(request), [(row.pk, row.updated_at) for row in rows])
+    return etag, last_modified
+
+
+def object_validators(instance, request):
+    """
+    Returns (etag, last_modified) for a single row from its primary key and updated_at.
+    """
+    etag = make_etag(request_variant(request), instance.pk, instance.updated_at)
+    return etag, instance.updated_at
+
+
+def versioned_etag(etag, version):
+    """
+    Mixes state kept outside the rows (e.g. a cache generation) into an ETag.
+    """
+    return etag if version is None else make_etag(etag, version)
+
+
+def _opaque_tag(tag):
+    return tag[2:] if tag.startswith("W/") else tag
+
+
+def is_not_modified(request, etag, last_modified=None):
+    """
+    If-None-Match takes precedence; If-Modified-Since is only checked when a
+    last_modified is given and no If-None-Match header was sent.
+    """
+    if_none_match = request.headers.get("If-None-Match")
+    if if_none_match:
+        if if_none_match.strip() == "*":
+            return True
+        return _opaque_tag(etag) in {_opaque_tag(tag) for tag in parse_etags(if_none_match)}
+    if last_modified is not None:
+        since = parse_http_date_safe(request.headers.get("If-Modified-Since", ""))
+        return since is not None and int(last_modified.timestamp()) <= since
+    return False
+
+
+def set_validators(response, etag, last_modified=None):
+    response["ETag"] = etag
+    if last_modified is not None:
+        response["Last-Modified"] = http_date(last_modified.timestamp())
+    return response
+
+
+def not_modified_response(etag, last_modified=None):
+    return set_validators(Response(status=status.HTTP_304_NOT_MODIFIED), etag, last_modified)
+
+
+class ConditionalListMixin:
+    """
+    Adds ETag/Last-Modified to list responses and answers a matching
+    If-None-Match with 304 before anything is serialized.
+    If-Modified-Since is not honoured for lists, since deletions do not move max(updated_at).
+    The row count is handed to the paginator as known_row_count, so page mode does not count twice.
+    Keyset pages (?cursor=) derive their validators from the fetched rows instead.
+    Views may add aggregates to that query via get_list_aggregates(); the results
+    are available as self.list_stats. Views whose queryset cannot be aggregated
+    (unions) override get_list_validators() instead. Views whose representation also
+    depends on other rows return a version of that state from get_etag_version().
+    """
+    known_row_count = None
+    list_stats = None
+
+    def get_list_aggregates(self):
+        return {}
+
+    def get_etag_version(self):
+        return None
+
+    def get_list_validators(self, queryset):
+        return list_validators(queryset, self.request, **self.get_list_aggregates())
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        cursor_param = getattr(self.paginator, "cursor_query_param", None)
+        if cursor_param and cursor_param in request.query_params:
+            page = self.paginate_queryset(queryset)
+            etag, last_modified = page_validators(page, request)
+            etag = versioned_etag(etag, self.get_etag_version())
+            if is_not_modified(request, etag):
+                return not_modified_response(etag, last_modified)
+            serializer = self.get_serializer(page, many=True)
+            return set_validators(self.get_paginated_response(serializer.data), etag, last_modified)
+
+        etag, last_modified, self.list_stats = self.get_list_validators(queryset)
+        etag = versioned_etag(etag, self.get_etag_version())
+        self.known_row_count = self.list_stats["count"]
+        if is_not_modified(request, etag):
+            return not_modified_response(etag, last_modified)
+        response = super().list(request, *args, **kwargs)
+        return set_validators(response, etag, last_modified)
+
+    async def alist(self, request, *args, **kwargs):
+        """
+        list() for the async read views (core.async_views).
+        """
+        queryset = self.filter_queryset(self.get_queryset())
+        if self.paginator.cursor_query_param in request.query_params:
+            page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+            etag, last_modified = page_validators(page, request)
+            etag = versioned_etag(etag, await sync_to_async(self.get_etag_version)())
+            if is_not_modified(request, etag):
+                return not_modified_response(etag, last_modified)
+            serializer = self.get_serializer(page, many=True)
+            return set_validators(self.get_paginated_response(serializer.data), etag, last_modified)
+
+        etag, last_modified, self.list_stats = await alist_validators(
+            queryset, request, **self.get_list_aggregates()
+        )
+        etag = versioned_etag(etag, await sync_to_async(self.get_etag_version)())
+        self.known_row_count = self.list_stats["count"]
+        if is_not_modified(request, etag):
+            return not_modified_response(etag, last_modified)
+        page = await self.paginator.apaginate_queryset(queryset, request, view=self)
+        serializer = self.get_serializer(page, many=True)
+        return set_validators(self.get_paginated_response(serializer.data), etag, last_modified)
+
+
+class ConditionalRetrieveMixin:
+    """
+    Adds ETag/Last-Modified to detail responses from the row's updated_at and answers
+    matching conditional requests with 304 without serializing the object.
+    get_etag_version() works as in ConditionalListMixin.
+    """
+    def get_etag_version(self):
+        return None
+
+    def retrieve(self, request, *args, **kwargs):
+        instance = self.get_object()
+        etag, last_modified = object_validators(instance, request)
+        etag = versioned_etag(etag, self.get_etag_version())
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        serializer = self.get_serializer(instance)
+        return set_validators(Response(serializer.data), etag, last_modified)
+
+    async def aretrieve(self, request, *args, **kwargs):
+        """
+        retrieve() for the async read views (core.async_views).
+        """
+        instance = await aget_object(self)
+        etag, last_modified = object_validators(instance, request)
+        etag = versioned_etag(etag, await sync_to_async(self.get_etag_version)())
+        if is_not_modified(request, etag, last_modified):
+            return not_modified_response(etag, last_modified)
+        serializer = self.get_serializer(instance)
+        return set_validators(Response(serializer.data), etag, last_modified)
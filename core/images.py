@@ -0,0 +1,138 @@
+"""
+Resized derivatives (WebP/JPEG in a few fixed widths) of uploaded images.
+
+A model with an image field <name> stores next to it <name>_width, <name>_height and
+<name>_derivatives: {"source": <file name>, "webp": {"320": <file name>, ...}, "jpeg": {...}}.
+Derivatives are written when an upload is saved (see the apps' signals) or by the
+build_image_derivatives command. They are named after their source file, so rows
+sharing one file also share its derivatives, and existing derivatives are reused.
+"""
+import logging
+import posixpath
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from PIL import Image, ImageOps
+from rest_framework import serializers
+
+logger = logging.getLogger(__name__)
+
+PILLOW_FORMATS = {"webp": "WEBP", "jpeg": "JPEG"}
+EXTENSIONS = {"webp": "webp", "jpeg": "jpg"}
+DERIVATIVES_DIR = "derivatives"
+
+
+def derivative_name(source_name, width, fmt):
+    """
+    offer_images/logo.png -> derivatives/offer_images/logo-320.webp
+    """
+    stem = posixpath.splitext(source_name)[0]
+    return posixpath.join(DERIVATIVES_DIR, f"{stem}-{width}.{EXTENSIONS[fmt]}")
+
+
+def _load(field_file):
+    with field_file.open("rb"):
+        image = Image.open(field_file)
+        image = ImageOps.exif_transpose(image)
+        image.load()
+    has_alpha = "A" in image.getbands() or "transparency" in image.info
+    return image.convert("RGBA" if has_alpha else "RGB")
+
+
+def _encode(image, width, fmt, quality):
+    if width != image.width:
+        height = max(1, round(image.height * width / image.width))
+        image = image.resize((width, height), Image.Resampling.LANCZOS)
+    if fmt == "jpeg" and image.mode != "RGB":
+        image = image.convert("RGB")
+    buffer = BytesIO()
+    image.save(buffer, PILLOW_FORMATS[fmt], quality=quality)
+    return buffer.getvalue()
+
+
+def build_derivatives(field_file):
+    """
+    Writes the missing derivatives of field_file and returns (width, height, derivatives).
+    Images are never upscaled: widths above the original collapse into the original width.
+    """
+    config = settings.IMAGE_DERIVATIVES
+    storage = field_file.storage
+    image = _load(field_file)
+    widths = sorted({min(width, image.width) for width in config["WIDTHS"]})
+    derivatives = {"source": field_file.name}
+    for fmt in config["FORMATS"]:
+        names = derivatives[fmt] = {}
+        for width in widths:
+            name = derivative_name(field_file.name, width, fmt)
+            if not storage.exists(name):
+                name = storage.save(name, ContentFile(_encode(image, width, fmt, config["QUALITY"])))
+            names[str(width)] = name
+    return image.width, image.height, derivatives
+
+
+def refresh_image_derivatives(instance, field_name, force=False, **extra_updates):
+    """
+    Brings <field_name>_width/_height/_derivatives of instance in line with its current
+    file, with an UPDATE that bypasses save() and its signals. extra_updates are written
+    in the same UPDATE. Returns False if nothing had to change.
+    Files Pillow cannot read are recorded with empty derivatives and not retried.
+    """
+    field_file = getattr(instance, field_name)
+    current = getattr(instance, f"{field_name}_derivatives") or {}
+    source = field_file.name if field_file else None
+    if not force and current.get("source") == source:
+        return False
+
+    width = height = None
+    derivatives = {}
+    if field_file:
+        try:
+            width, height, derivatives = build_derivatives(field_file)
+        except (OSError, ValueError, Image.DecompressionBombError) as exc:
+            logger.warning("Could not build derivatives of %s: %s", source, exc)
+            derivatives = {"source": source}
+
+    values = {
+        f"{field_name}_width": width,
+        f"{field_name}_height": height,
+        f"{field_name}_derivatives": derivatives,
+        **extra_updates,
+    }
+    type(instance)._default_manager.filter(pk=instance.pk).update(**values)
+    for attname, value in values.items():
+        setattr(instance, attname, value)
+    return True
+
+
+class ImageVariantsField(serializers.Field):
+    """
+    Read-only {"width", "height", "webp": {"<width>": url, ...}, "jpeg": {...}} of an image
+    field, built from the stored columns without opening the file. None without an image;
+    formats without derivatives are left out, so clients fall back to the original URL.
+    """
+    def __init__(self, image_field, **kwargs):
+        kwargs["source"] = "*"
+        kwargs["read_only"] = True
+        super().__init__(**kwargs)
+        self.image_field = image_field
+
+    def to_representation(self, instance):
+        field_file = getattr(instance, self.image_field)
+        if not field_file:
+            return None
+        request = self.context.get("request")
+
+        def url(name):
+            value = field_file.storage.url(name)
+            return request.build_absolute_uri(value) if request is not None else value
+
+        data = {
+            "width": getattr(instance, f"{self.image_field}_width"),
+            "height": getattr(instance, f"{self.image_field}_height"),
+        }
+        derivatives = getattr(instance, f"{self.image_field}_derivatives") or {}
+        for fmt in PILLOW_FORMATS:
+            if derivatives.get(fmt):
+                data[fmt] = {width: url(name) for width, name in derivatives[fmt].items()}
+        return data
@@ -0,0 +1,260 @@
+import threading
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.http import HttpResponse
+from rest_framework.serializers import BaseSerializer
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+QUERY_BUCKETS = (0, 1, 2, 3, 5, 8, 13, 21, 50, 100)
+SIZE_BUCKETS = (256, 1024, 4096, 16384, 65536, 262144, 1048576)
+
+_current = ContextVar("instrumentation_sample", default=None)
+
+
+class RequestSample:
+    """
+    Numbers collected for the request currently being served.
+    """
+    __slots__ = ("queries", "db_seconds", "serializer_seconds", "serializer_depth")
+
+    def __init__(self):
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.serializer_seconds = 0.0
+        self.serializer_depth = 0
+
+
+class Histogram:
+    """
+    Cumulative Prometheus histogram for one label set.
+    """
+    __slots__ = ("buckets", "counts", "total", "count")
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        index = bisect_left(self.buckets, value)
+        if index < len(self.counts):
+            self.counts[index] += 1
+        self.total += value
+        self.count += 1
+
+
+class MetricsRegistry:
+    """
+    In-process metrics, keyed by (metric name, label tuple). Rendered in the Prometheus
+    text format by the /metrics view. Values are per process, so a multi-worker
+    deployment is scraped (or aggregated) per worker.
+    """
+    HISTOGRAMS = {
+        "coderr_request_duration_seconds": ("Request wall time.", DURATION_BUCKETS),
+        "coderr_request_db_duration_seconds": ("Time spent in database queries.", DURATION_BUCKETS),
+        "coderr_request_db_queries": ("Database queries per request.", QUERY_BUCKETS),
+        "coderr_request_serializer_duration_seconds": ("Time spent in serializer.data.", DURATION_BUCKETS),
+        "coderr_response_size_bytes": ("Response body size.", SIZE_BUCKETS),
+    }
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self._histograms = {}
+            self._requests = {}
+
+    def record(self, view, method, status, duration, sample, size):
+        labels = (("view", view), ("method", method))
+        values = {
+            "coderr_request_duration_seconds": duration,
+            "coderr_request_db_duration_seconds": sample.db_seconds,
+            "coderr_request_db_queries": sample.queries,
+            "coderr_request_serializer_duration_seconds": sample.serializer_seconds,
+            "coderr_response_size_bytes": size,
+        }
+        with self._lock:
+            for name, value in values.items():
+                histogram = self._histograms.get((name, labels))
+                if histogram is None:
+                    histogram = self._histograms[(name, labels)] = Histogram(self.HISTOGRAMS[name][1])
+                histogram.observe(value)
+            key = labels + (("status", str(status)),)
+            self._requests[key] = self._requests.get(key, 0) + 1
+
+    def render(self):
+        lines = []
+        with self._lock:
+            lines += ["# HELP coderr_requests_total Requests served.", "# TYPE coderr_requests_total counter"]
+            for labels, value in sorted(self._requests.items()):
+                lines.append(f"coderr_requests_total{_labels(labels)} {value}")
+            for name, (help_text, _buckets) in self.HISTOGRAMS.items():
+                lines += [f"# HELP {name} {help_text}", f"# TYPE {name} histogram"]
+                for (metric, labels), histogram in sorted(self._histograms.items()):
+                    if metric != name:
+                        continue
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f"{name}_bucket{_labels(labels + (('le', _number(bound)),))} {cumulative}")
+                    lines.append(f"{name}_bucket{_labels(labels + (('le', '+Inf'),))} {histogram.count}")
+                    lines.append(f"{name}_sum{_labels(labels)} {_number(histogram.total)}")
+                    lines.append(f"{name}_count{_labels(labels)} {histogram.count}")
+        lines += _cache_lines()
+        return "\n".join(lines) + "\n"
+
+
+def _number(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def _labels(pairs):
+    escaped = (
+        key + '="' + str(value).replace("\\", "\\\\").replace('"', '\\"') + '"'
+        for key, value in pairs
+    )
+    return "{" + ",".join(escaped) + "}"
+
+
+def _cache_lines():
+    """
+    Hit/miss counters of the in-process caches, as gauges.
+    """
+    from accounts_app.api.authentication import token_cache
+    from offers_app.api.cache import offer_cache
+
+    lines = []
+    for prefix, stats in (("coderr_offer_cache", offer_cache.stats()), ("coderr_token_cache", token_cache.stats())):
+        for key, value in stats.items():
+            lines += [f"# TYPE {prefix}_{key} gauge", f"{prefix}_{key} {_number(value)}"]
+    return lines
+
+
+registry = MetricsRegistry()
+
+
+def _time_queries(execute, sql, params, many, context):
+    sample = _current.get()
+    if sample is None:
+        return execute(sql, params, many, context)
+    start = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        sample.db_seconds += time.perf_counter() - start
+        sample.queries += 1
+
+
+def _install_query_timing(connection, **kwargs):
+    """
+    Keeps _time_queries on every connection. It only counts while a request sample is
+    active in the current context, which also covers async ORM queries run in worker threads.
+    """
+    if _time_queries not in connection.execute_wrappers:
+        connection.execute_wrappers.append(_time_queries)
+
+
+def _install_serializer_timing():
+    """
+    Wraps BaseSerializer.data once so the outermost .data access per request is timed;
+    nested serializers are covered by their parent's measurement.
+    """
+    original = BaseSerializer.data
+    if getattr(original.fget, "_instrumented", False):
+        return
+
+    def data(self):
+        sample = _current.get()
+        if sample is None:
+            return original.fget(self)
+        sample.serializer_depth += 1
+        start = time.perf_counter()
+        try:
+            return original.fget(self)
+        finally:
+            sample.serializer_depth -= 1
+            if not sample.serializer_depth:
+                sample.serializer_seconds += time.perf_counter() - start
+
+    data._instrumented = True
+    BaseSerializer.data = property(data)
+
+
+class InstrumentationMiddleware:
+    """
+    Records wall time, DB query count/time, serializer time and response size per
+    resolved URL name, adds a Server-Timing header (if SERVER_TIMING) and feeds the /metrics registry.
+    Works in sync (WSGI) and async (ASGI) chains. Disabled with INSTRUMENTATION_ENABLED = False.
+    """
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        if not getattr(settings, "INSTRUMENTATION_ENABLED", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+        connection_created.connect(_install_query_timing, dispatch_uid="instrumentation_query_timing")
+        for connection in connections.all(initialized_only=True):
+            _install_query_timing(connection)
+        _install_serializer_timing()
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+        sample = RequestSample()
+        token = _current.set(sample)
+        start = time.perf_counter()
+        try:
+            response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, sample, time.perf_counter() - start)
+
+    async def __acall__(self, request):
+        sample = RequestSample()
+        token = _current.set(sample)
+        start = time.perf_counter()
+        try:
+            response = await self.get_response(request)
+        finally:
+            _current.reset(token)
+        return self.finish(request, response, sample, time.perf_counter() - start)
+
+    def finish(self, request, response, sample, duration):
+        match = getattr(request, "resolver_match", None)
+        view = (match.url_name or match.view_name) if match else "unmatched"
+        size = 0 if response.streaming else len(response.content)
+        registry.record(view, request.method, response.status_code, duration, sample, size)
+        if settings.SERVER_TIMING:
+            response["Server-Timing"] = (
+                f"app;dur={duration * 1000:.1f}, "
+                f'db;dur={sample.db_seconds * 1000:.1f};desc="{sample.queries} queries", '
+                f"ser;dur={sample.serializer_seconds * 1000:.1f}"
+            )
+        return response
+
+
+def metrics_view(request):
+    """
+    Prometheus text exposition of the in-process metrics. Protected by METRICS_TOKEN
+    (sent as "Authorization: Bearer <token>"); without a token it is only served with DEBUG.
+    """
+    expected = getattr(settings, "METRICS_TOKEN", "")
+    if not expected and not settings.DEBUG:
+        return HttpResponse(status=404)
+    if expected and request.headers.get("Authorization") != f"Bearer {expected}":
+        return HttpResponse(status=403)
+    return HttpResponse(registry.render(), content_type="text/plain; version=0.0.4; charset=utf-8")
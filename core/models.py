@@ -0,0 +1,22 @@
+class LoadedValuesMixin:
+    """
+    Remembers the column values a model instance was loaded or last saved with,
+    so signal handlers can compute deltas without re-reading the row.
+    """
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_values = dict(zip(field_names, values))
+        return instance
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        self._loaded_values = {
+            field.attname: getattr(self, field.attname) for field in self._meta.concrete_fields
+        }
+
+    def loaded_value(self, attname, default=None):
+        """
+        Returns the stored value of a column, or default for unsaved instances.
+        """
+        return getattr(self, "_loaded_values", {}).get(attname, default)
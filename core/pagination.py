@@ -0,0 +1,234 @@
+import base64
+import binascii
+import json
+from functools import partial
+
+from asgiref.sync import sync_to_async
+from django.core.paginator import InvalidPage, Paginator as DjangoPaginator
+from django.db.models import Q
+from django.utils.functional import cached_property
+from rest_framework.exceptions import NotFound, ValidationError
+from rest_framework.pagination import CursorPagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    Keyset pagination on the view's ordering field with the primary key as tiebreaker.
+    The cursor holds the (value, pk) of the boundary row, so every page is one range
+    scan on the ordering index, rows sharing a value are split by pk instead of an
+    offset, and no COUNT(*) is executed. Nullable fields have no keyset position for
+    their NULL rows, so ordering on them is rejected with 400.
+    """
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    next_position = previous_position = None
+
+    def get_ordering(self, request, queryset, view):
+        field = super().get_ordering(request, queryset, view)[0]
+        name = field.lstrip("-")
+        if name == "pk" or name == queryset.model._meta.pk.name:
+            return (field,)
+        if queryset.model._meta.get_field(name).null:
+            raise ValidationError({"ordering": [f"Cursor pagination is not available when ordering by {name}."]})
+        return (field, "-pk" if field.startswith("-") else "pk")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+        self.ordering = self.get_ordering(request, queryset, view)
+        position, reverse = self.decode_cursor(request)
+        ordering = tuple(_reverse_ordering(field) for field in self.ordering) if reverse else self.ordering
+        queryset = queryset.order_by(*ordering)
+        if position is not None:
+            queryset = queryset.filter(_after(ordering, position))
+
+        rows = list(queryset[: self.page_size + 1])
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+        has_next = has_more if not reverse else True
+        has_previous = has_more if reverse else position is not None
+        self.next_position = self.position_of(rows[-1]) if rows and has_next else None
+        self.previous_position = self.position_of(rows[0]) if rows and has_previous else None
+        return rows
+
+    def position_of(self, row):
+        return [_field_value(row, field) for field in self.ordering]
+
+    def decode_cursor(self, request):
+        """
+        Returns (position, reverse), or (None, False) for the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            position, reverse = json.loads(base64.urlsafe_b64decode(encoded.encode()))
+            if len(position) != len(self.ordering):
+                raise ValueError
+            return position, bool(reverse)
+        except (TypeError, ValueError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position, reverse):
+        token = json.dumps([position, int(reverse)], separators=(",", ":"))
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, base64.urlsafe_b64encode(token.encode()).decode())
+
+    def get_next_link(self):
+        return self.encode_cursor(self.next_position, False) if self.next_position else None
+
+    def get_previous_link(self):
+        return self.encode_cursor(self.previous_position, True) if self.previous_position else None
+
+
+def _reverse_ordering(field):
+    return field[1:] if field.startswith("-") else "-" + field
+
+
+def _field_value(row, field):
+    name = field.lstrip("-")
+    model_field = row._meta.pk if name == "pk" else row._meta.get_field(name)
+    return model_field.value_to_string(row)
+
+
+def _after(ordering, position):
+    """
+    Rows strictly after position in the (lexicographic) ordering.
+    """
+    condition, equal = Q(), {}
+    for field, value in zip(ordering, position):
+        name = field.lstrip("-")
+        lookup = "lt" if field.startswith("-") else "gt"
+        condition |= Q(**equal, **{f"{name}__{lookup}": value})
+        equal[name] = value
+    return condition
+
+
+class KnownCountPaginator(DjangoPaginator):
+    """
+    Django paginator that reuses a row count the view already computed.
+    """
+    def __init__(self, object_list, per_page, known_count=None, **kwargs):
+        super().__init__(object_list, per_page, **kwargs)
+        self.known_count = known_count
+
+    @cached_property
+    def count(self):
+        if self.known_count is not None:
+            return self.known_count
+        return super().count
+
+
+class HybridPagination(PageNumberPagination):
+    """
+    Page-number pagination by default. A ?cursor= parameter (empty for the first page)
+    switches to keyset pagination, which has constant cost per page and skips the total count.
+    """
+    page_size = 100
+    page_size_query_param = "page_size"
+    max_page_size = 100
+    cursor_query_param = "cursor"
+    cursor_ordering = ("-created_at",)
+    cursor_paginator = None
+
+    def get_cursor_paginator(self):
+        paginator = KeysetCursorPagination()
+        paginator.page_size = self.page_size
+        paginator.page_size_query_param = self.page_size_query_param
+        paginator.max_page_size = self.max_page_size
+        paginator.cursor_query_param = self.cursor_query_param
+        paginator.ordering = self.cursor_ordering
+        return paginator
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.cursor_query_param in request.query_params:
+            self.cursor_paginator = self.get_cursor_paginator()
+            return self.cursor_paginator.paginate_queryset(queryset, request, view)
+        self.cursor_paginator = None
+        self.django_paginator_class = partial(
+            KnownCountPaginator, known_count=getattr(view, "known_row_count", None)
+        )
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        paginate_queryset() for async views. Page mode counts and fetches through the
+        async ORM; keyset pages run the sync paginator in a worker thread.
+        """
+        if self.cursor_query_param in request.query_params:
+            return await sync_to_async(self.paginate_queryset)(queryset, request, view)
+        self.cursor_paginator = None
+        self.request = request
+        known_count = getattr(view, "known_row_count", None)
+        if known_count is None:
+            known_count = await queryset.acount()
+        paginator = KnownCountPaginator(queryset, self.get_page_size(request), known_count=known_count)
+        page_number = self.get_page_number(request, paginator)
+        try:
+            self.page = paginator.page(page_number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=page_number, message=str(exc)))
+        self.page.object_list = [row async for row in self.page.object_list]
+        return self.page.object_list
+
+    def get_paginated_response(self, data):
+        if self.cursor_paginator is not None:
+            return self.cursor_paginator.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+
+class BoundedListPagination(HybridPagination):
+    """
+    Default pagination for list endpoints that historically returned a plain list.
+    Without ?page or ?cursor the response stays a plain list, capped at page_size rows;
+    with either parameter the paginated envelope is returned. A capped plain list
+    carries X-Truncated: true and a Link header (rel="next") to its second page.
+    """
+    plain_list = False
+    truncated = False
+
+    def is_plain_list(self, request):
+        params = request.query_params
+        self.plain_list = not (
+            self.page_query_param in params or self.cursor_query_param in params
+        )
+        return self.plain_list
+
+    def cut_plain_list(self, rows, request):
+        """
+        rows holds up to page_size + 1 entries; the extra one only marks truncation.
+        """
+        self.request = request
+        page_size = self.get_page_size(request)
+        self.truncated = len(rows) > page_size
+        return rows[:page_size]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.is_plain_list(request):
+            self.cursor_paginator = None
+            rows = list(queryset[: self.get_page_size(request) + 1])
+            return self.cut_plain_list(rows, request)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if self.is_plain_list(request):
+            self.cursor_paginator = None
+            rows = [row async for row in queryset[: self.get_page_size(request) + 1]]
+            return self.cut_plain_list(rows, request)
+        return await super().apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if not self.plain_list:
+            return super().get_paginated_response(data)
+        response = Response(data)
+        if self.truncated:
+            next_url = replace_query_param(self.request.build_absolute_uri(), self.page_query_param, 2)
+            response["Link"] = f'<{next_url}>; rel="next"'
+            response["X-Truncated"] = "true"
+        return response
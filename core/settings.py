@@ -24,6 +24,8 @@ DEBUG = env_bool("DEBUG", "False")
 ALLOWED_HOSTS = env_list("ALLOWED_HOSTS", "localhost,127.0.0.1")
 
 CORS_ALLOWED_ORIGINS = env_list("CORS_ALLOWED_ORIGINS", "")
+# Truncation signal of capped plain lists (core.pagination.BoundedListPagination).
+CORS_EXPOSE_HEADERS = ["Link", "X-Truncated"]
 CSRF_TRUSTED_ORIGINS = env_list("CSRF_TRUSTED_ORIGINS", "")
 FRONTEND_URL = os.getenv("FRONTEND_URL", "")
 
@@ -44,9 +46,11 @@ INSTALLED_APPS = [
     "orders_app",
     "reviews_app",
     "baseinfo_app",
+    "media_app",
 ]
 
 MIDDLEWARE = [
+    "core.instrumentation.InstrumentationMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.security.SecurityMiddleware",
     "whitenoise.middleware.WhiteNoiseMiddleware",
@@ -85,6 +89,14 @@ STATICFILES_STORAGE = "whitenoise.storage.CompressedManifestStaticFilesStorage"
 MEDIA_URL = "/media/"
 MEDIA_ROOT = BASE_DIR / "media"
 
+# "asgi" is set by core/asgi.py; the async read views (core.async_views) default on there.
+SERVER_MODE = os.getenv("SERVER_MODE", "wsgi")
+ASYNC_READ_VIEWS = env_bool("ASYNC_READ_VIEWS", str(SERVER_MODE == "asgi"))
+if SERVER_MODE == "asgi":
+    # WhiteNoiseMiddleware is sync-only and would turn the whole chain sync;
+    # core.asgi serves static files in front of Django instead (core.static).
+    MIDDLEWARE.remove("whitenoise.middleware.WhiteNoiseMiddleware")
+
 DB_ENGINE = os.getenv("DB_ENGINE", "sqlite").lower()
 if DB_ENGINE == "postgres":
     DATABASES = {
@@ -95,8 +107,25 @@ if DB_ENGINE == "postgres":
             "PASSWORD": os.getenv("DB_PASSWORD", "coderr_password"),
             "HOST": os.getenv("DB_HOST", "db"),
             "PORT": os.getenv("DB_PORT", "5432"),
+            # Persistent connections (seconds, 0 = one connection per request), checked
+            # before reuse. ASGI serves each request from a fresh thread, so it defaults to 0
+            # there and should use DB_POOL instead.
+            "CONN_MAX_AGE": int(os.getenv("DB_CONN_MAX_AGE", "0" if SERVER_MODE == "asgi" else "60")),
+            "CONN_HEALTH_CHECKS": env_bool("DB_CONN_HEALTH_CHECKS", "True"),
+            "OPTIONS": {},
         }
     }
+    if env_bool("DB_POOL", "False"):
+        # psycopg 3 connection pool per worker process; replaces persistent connections.
+        DATABASES["default"]["CONN_MAX_AGE"] = 0
+        DATABASES["default"]["OPTIONS"]["pool"] = {
+            "min_size": int(os.getenv("DB_POOL_MIN_SIZE", "2")),
+            "max_size": int(os.getenv("DB_POOL_MAX_SIZE", "10")),
+            "timeout": float(os.getenv("DB_POOL_TIMEOUT", "10")),
+        }
+    if env_bool("DB_PGBOUNCER", "False"):
+        # pgbouncer in transaction mode cannot keep server-side cursors open across statements.
+        DATABASES["default"]["DISABLE_SERVER_SIDE_CURSORS"] = True
 else:
     DATABASES = {
         "default": {
@@ -105,11 +134,53 @@ else:
         }
     }
 
+REDIS_URL = os.getenv("REDIS_URL", "")
+if REDIS_URL:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": REDIS_URL,
+        }
+    }
+else:
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.locmem.LocMemCache",
+            "LOCATION": "coderr",
+        }
+    }
+
+OFFER_CACHE = {
+    "ALIAS": os.getenv("OFFER_CACHE_ALIAS", "default"),
+    "TIMEOUT": int(os.getenv("OFFER_CACHE_TIMEOUT", "300")),
+    "MAX_ENTRY_BYTES": int(os.getenv("OFFER_CACHE_MAX_ENTRY_BYTES", str(256 * 1024))),
+}
+
+TOKEN_CACHE = {
+    "ALIAS": os.getenv("TOKEN_CACHE_ALIAS", "default"),
+    "TIMEOUT": int(os.getenv("TOKEN_CACHE_TIMEOUT", "300")),
+    "LOCAL_TTL": float(os.getenv("TOKEN_CACHE_LOCAL_TTL", "5")),
+    "LOCAL_MAX_ENTRIES": int(os.getenv("TOKEN_CACHE_LOCAL_MAX_ENTRIES", "1024")),
+}
+
+IMAGE_DERIVATIVES = {
+    "WIDTHS": [int(width) for width in env_list("IMAGE_DERIVATIVE_WIDTHS", "160,320,640")],
+    "FORMATS": env_list("IMAGE_DERIVATIVE_FORMATS", "webp,jpeg"),
+    "QUALITY": int(os.getenv("IMAGE_DERIVATIVE_QUALITY", "80")),
+    "ON_SAVE": env_bool("IMAGE_DERIVATIVES_ON_SAVE", "True"),
+}
+
+INSTRUMENTATION_ENABLED = env_bool("INSTRUMENTATION_ENABLED", "True")
+METRICS_ENABLED = env_bool("METRICS_ENABLED", "True")
+METRICS_TOKEN = os.getenv("METRICS_TOKEN", "")
+SERVER_TIMING = env_bool("SERVER_TIMING", str(DEBUG))
+
 REST_FRAMEWORK = {
     "DEFAULT_AUTHENTICATION_CLASSES": [
-        "rest_framework.authentication.TokenAuthentication",
+        "accounts_app.api.authentication.CachedTokenAuthentication",
     ],
     "DEFAULT_FILTER_BACKENDS": ["django_filters.rest_framework.DjangoFilterBackend"],
+    "DEFAULT_PAGINATION_CLASS": "core.pagination.BoundedListPagination",
     "DEFAULT_PERMISSION_CLASSES": ["rest_framework.permissions.AllowAny"],
 }
 
@@ -0,0 +1,48 @@
+"""
+Static files for the ASGI deployment (SERVER_MODE=asgi).
+
+WhiteNoiseMiddleware is sync-only: in an ASGI middleware chain Django adapts around
+it, so every request pays a thread switch and the async views lose their point.
+Under ASGI it is therefore left out of MIDDLEWARE and StaticFilesApplication serves
+STATIC_URL in front of Django instead, with the same WhiteNoise configuration.
+"""
+from asgiref.wsgi import WsgiToAsgi
+from whitenoise.base import WhiteNoise
+from whitenoise.middleware import WhiteNoiseMiddleware
+
+WHITENOISE_MIDDLEWARE = "whitenoise.middleware.WhiteNoiseMiddleware"
+
+
+def _not_found(environ, start_response):
+    start_response("404 Not Found", [("Content-Type", "text/plain; charset=utf-8")])
+    return [b"Not Found"]
+
+
+class StaticFilesWSGI(WhiteNoiseMiddleware):
+    """
+    WhiteNoiseMiddleware's settings (STATIC_ROOT, WHITENOISE_*, finders under DEBUG,
+    manifest-based immutable caching) as a WSGI app that only serves static files.
+    """
+    __call__ = WhiteNoise.__call__
+    serve = staticmethod(WhiteNoise.serve)
+
+    def __init__(self):
+        super().__init__()
+        self.application = _not_found
+
+
+class StaticFilesApplication:
+    """
+    ASGI app that answers requests under the static prefix with WhiteNoise (in a worker
+    thread) and hands everything else to application.
+    """
+    def __init__(self, application):
+        self.application = application
+        static_files = StaticFilesWSGI()
+        self.static_prefix = static_files.static_prefix
+        self.static_application = WsgiToAsgi(static_files)
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] == "http" and scope["path"].startswith(self.static_prefix):
+            return await self.static_application(scope, receive, send)
+        return await self.application(scope, receive, send)
@@ -0,0 +1,65 @@
+import re
+from collections import Counter
+from io import BytesIO
+
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from PIL import Image
+
+_STRING = re.compile(r"'(?:[^']|'')*'")
+_NUMBER = re.compile(r"\b\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN \((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+
+
+def sql_fingerprint(sql):
+    """
+    Normalizes a SQL statement so repeated per-row queries collapse to one fingerprint:
+    literals become ?, IN lists become IN (...).
+    """
+    sql = _NUMBER.sub("?", _STRING.sub("?", sql))
+    sql = _IN_LIST.sub("IN (...)", sql)
+    return " ".join(sql.split())
+
+
+class QueryGrowthMixin:
+    """
+    TestCase mixin to detect N+1 queries: an endpoint is requested once with a small
+    dataset and once after more related rows were added; the query count must not grow.
+    """
+    def assertConstantQueries(self, request, add_rows, msg=None):
+        """
+        request() performs the request and returns the response; add_rows() grows the data.
+        """
+        with CaptureQueriesContext(connection) as small:
+            first = request()
+        add_rows()
+        with CaptureQueriesContext(connection) as large:
+            second = request()
+        self.assertEqual(first.status_code, 200, msg)
+        self.assertEqual(second.status_code, 200, msg)
+        if len(large) <= len(small):
+            return
+
+        before = Counter(sql_fingerprint(q["sql"]) for q in small.captured_queries)
+        after = Counter(sql_fingerprint(q["sql"]) for q in large.captured_queries)
+        grown = [
+            f"  {before[fingerprint]} -> {count}x {fingerprint}"
+            for fingerprint, count in after.most_common()
+            if count > before[fingerprint]
+        ]
+        self.fail(
+            (f"{msg}: " if msg else "")
+            + f"query count grew from {len(small)} to {len(large)} with more rows.\n"
+            + "Duplicated SQL fingerprints:\n"
+            + "\n".join(grown)
+        )
+
+
+def png_upload(name, width, height, mode="RGBA"):
+    """
+    An uploaded PNG of the given size, for tests of image fields.
+    """
+    buffer = BytesIO()
+    Image.new(mode, (width, height), (200, 30, 30, 128) if mode == "RGBA" else (200, 30, 30)).save(buffer, "PNG")
+    return SimpleUploadedFile(name, buffer.getvalue(), content_type="image/png")
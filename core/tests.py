@@ -0,0 +1,404 @@
+import json
+import os
+import runpy
+import tempfile
+from inspect import iscoroutinefunction
+from unittest.mock import patch
+
+from asgiref.sync import sync_to_async
+from PIL import Image
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import caches
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.core.handlers.asgi import ASGIHandler
+from django.http import HttpResponse
+from django.test import AsyncRequestFactory, SimpleTestCase, TestCase, override_settings
+from django.urls import reverse
+from rest_framework.authtoken.models import Token
+from rest_framework.test import APIClient
+
+from accounts_app.api.views import AsyncBusinessProfileView, AsyncCustomerProfileView
+from accounts_app.models import Profile
+from baseinfo_app.api.views import AsyncBaseInfoView
+from core.async_views import AsyncReadView
+from core.images import refresh_image_derivatives
+from core.instrumentation import registry
+from core.static import WHITENOISE_MIDDLEWARE, StaticFilesApplication
+from core.testing import QueryGrowthMixin, png_upload
+from offers_app.api.views import AsyncOfferListView, AsyncOfferRetrieveView
+from offers_app.models import Offer, OfferDetail
+from orders_app.api.views import AsyncCompletedOrderCountView, AsyncOrderCountView
+from orders_app.models import Order
+from reviews_app.models import Review
+
+
+@override_settings(SERVER_TIMING=True, METRICS_TOKEN="secret")
+class InstrumentationTests(TestCase):
+    def setUp(self):
+        self.client = APIClient()
+        registry.reset()
+
+    def _metrics(self):
+        return self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret").content.decode()
+
+    def test_server_timing_and_metrics_per_url_name(self):
+        response = self.client.get(reverse("base-info"))
+        self.assertEqual(response.status_code, 200)
+        self.assertRegex(response["Server-Timing"], r'^app;dur=[\d.]+, db;dur=[\d.]+;desc="1 queries", ser;dur=[\d.]+$')
+
+        metrics = self._metrics()
+        self.assertIn('coderr_requests_total{view="base-info",method="GET",status="200"} 1', metrics)
+        self.assertIn('coderr_request_db_queries_bucket{view="base-info",method="GET",le="1"} 1', metrics)
+        self.assertIn('coderr_request_duration_seconds_count{view="base-info",method="GET"} 1', metrics)
+        self.assertIn("coderr_offer_cache_hit_ratio", metrics)
+        self.assertIn("coderr_token_cache_hit_ratio", metrics)
+
+    def test_serializer_time_is_recorded(self):
+        self.client.get(reverse("offers"))
+        metrics = self._metrics()
+        line = next(
+            line for line in metrics.splitlines()
+            if line.startswith('coderr_request_serializer_duration_seconds_count{view="offers"')
+        )
+        self.assertTrue(line.endswith(" 1"))
+
+    def test_metrics_token(self):
+        self.assertEqual(self.client.get("/metrics").status_code, 403)
+        response = self.client.get("/metrics", HTTP_AUTHORIZATION="Bearer secret")
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response["Content-Type"].startswith("text/plain; version=0.0.4"))
+
+    @override_settings(DEBUG=False, SERVER_TIMING=False, METRICS_TOKEN="")
+    def test_production_defaults_hide_metrics_and_timing(self):
+        response = self.client.get(reverse("base-info"))
+        self.assertNotIn("Server-Timing", response)
+        self.assertEqual(self.client.get("/metrics").status_code, 404)
+        with override_settings(DEBUG=True):
+            self.assertEqual(self.client.get("/metrics").status_code, 200)
+
+
+class NPlusOneTests(QueryGrowthMixin, TestCase):
+    """
+    Every list endpoint is requested with one related row and again with N;
+    the query count must stay the same.
+    """
+    N = 5
+
+    def setUp(self):
+        caches["default"].clear()
+        self.client = APIClient()
+        self.business = self._user("business")
+        self.customer = self._user("customer")
+        self.client.force_authenticate(self.customer)
+        self.serial = 0
+
+    def _user(self, kind):
+        user = User.objects.create_user(username=f"{kind}-{User.objects.count()}", password="pw")
+        Profile.objects.create(user=user, type=kind)
+        return user
+
+    def _offer(self, user=None, tiers=3):
+        offer = Offer.objects.create(user=user or self._user("business"), title="Logo", description="desc")
+        for i in range(tiers):
+            OfferDetail.objects.create(
+                offer=offer, title=f"Tier {i}", revisions=1, delivery_time_in_days=i + 1,
+                price=10 * (i + 1), features=["A"], offer_type="basic",
+            )
+        return offer
+
+    def _order(self):
+        return Order.objects.create(
+            customer_user=self.customer, business_user=self._user("business"), title="Logo",
+            revisions=1, delivery_time_in_days=3, price=100, features=["A"], offer_type="basic",
+        )
+
+    def _review(self):
+        return Review.objects.create(business_user=self._user("business"), reviewer=self._user("customer"), rating=4)
+
+    def _grow(self, factory):
+        factory()
+        return lambda: [factory() for _ in range(self.N - 1)]
+
+    def _get(self, url):
+        return lambda: self.client.get(url)
+
+    def test_offers_list(self):
+        self.assertConstantQueries(self._get(reverse("offers")), self._grow(self._offer), "offers")
+
+    def test_offers_list_cursor(self):
+        self.assertConstantQueries(self._get(reverse("offers") + "?cursor="), self._grow(self._offer), "offers?cursor")
+
+    def test_offer_detail_tiers(self):
+        offer = self._offer(self.business, tiers=1)
+
+        def add_tiers():
+            for i in range(self.N):
+                OfferDetail.objects.create(
+                    offer=offer, title="More", revisions=1, delivery_time_in_days=1,
+                    price=5, features=[], offer_type="standard",
+                )
+
+        self.assertConstantQueries(
+            self._get(reverse("offer-detail", args=[offer.id])), add_tiers, "offer-detail"
+        )
+
+    def test_orders_list(self):
+        self.assertConstantQueries(self._get(reverse("order-list-create")), self._grow(self._order), "orders")
+
+    def test_reviews_list(self):
+        self.assertConstantQueries(self._get("/api/reviews/"), self._grow(self._review), "reviews")
+        self.assertConstantQueries(self._get("/api/reviews/?page=1"), self._grow(self._review), "reviews?page")
+
+    def test_business_profiles_list(self):
+        grow = self._grow(lambda: self._user("business"))
+        self.assertConstantQueries(self._get(reverse("business-profile-list")), grow, "profiles/business")
+
+    def test_customer_profiles_list(self):
+        grow = self._grow(lambda: self._user("customer"))
+        self.assertConstantQueries(self._get(reverse("customer-profile-list")), grow, "profiles/customer")
+
+    def test_base_info(self):
+        def add_rows():
+            for _ in range(self.N):
+                self._offer()
+                self._review()
+
+        self.assertConstantQueries(self._get(reverse("base-info")), add_rows, "base-info")
+
+
+class QueryGrowthMixinTests(QueryGrowthMixin, TestCase):
+    def test_failure_lists_duplicated_fingerprints(self):
+        def request():
+            for user in User.objects.all():
+                User.objects.filter(pk=user.pk).exists()
+            return HttpResponse()
+
+        User.objects.create_user(username="one")
+        with self.assertRaises(AssertionError) as raised:
+            self.assertConstantQueries(request, lambda: User.objects.create_user(username="two"))
+        message = str(raised.exception)
+        self.assertIn("query count grew from 2 to 3", message)
+        self.assertIn('1 -> 2x SELECT ? AS "a" FROM "auth_user" WHERE "auth_user"."id" = ? LIMIT ?', message)
+
+
+class AsyncReadViewTests(TestCase):
+    """
+    The async read views (ASGI mode) must answer exactly like the DRF views they wrap.
+    """
+    def setUp(self):
+        caches["default"].clear()
+        self.factory = AsyncRequestFactory()
+        self.business = User.objects.create_user(username="biz", password="pw")
+        Profile.objects.create(user=self.business, type="business")
+        self.customer = User.objects.create_user(username="cust", password="pw")
+        Profile.objects.create(user=self.customer, type="customer")
+        self.token = Token.objects.create(user=self.business).key
+        for title in ("Logo", "Website", "Flyer"):
+            offer = Offer.objects.create(user=self.business, title=title, description="Design")
+            for i, offer_type in enumerate(("basic", "standard", "premium")):
+                OfferDetail.objects.create(
+                    offer=offer, title=offer_type, revisions=1, delivery_time_in_days=i + 1,
+                    price=50 * (i + 1), features=["A"], offer_type=offer_type,
+                )
+        self.offer = offer
+        Order.objects.create(
+            customer_user=self.customer, business_user=self.business, title="Logo",
+            revisions=1, delivery_time_in_days=3, price=100, features=["A"],
+            offer_type="basic", status="completed",
+        )
+
+    def _headers(self, auth, extra):
+        headers = dict(extra)
+        if auth:
+            headers["Authorization"] = f"Token {self.token}"
+        return headers
+
+    async def assertSameResponse(self, async_view_class, url, auth=True, headers=(), **kwargs):
+        headers = self._headers(auth, headers)
+        await sync_to_async(caches["default"].clear)()
+        expected = await sync_to_async(self.client.get)(url, headers=headers)
+        await sync_to_async(caches["default"].clear)()
+        response = await async_view_class.as_view()(self.factory.get(url, headers=headers), **kwargs)
+
+        self.assertEqual(response.status_code, expected.status_code)
+        self.assertEqual(response.get("ETag"), expected.get("ETag"))
+        if expected.content:
+            self.assertEqual(json.loads(response.content), json.loads(expected.content))
+        return response
+
+    async def test_offer_list_and_detail(self):
+        url = reverse("offers")
+        await self.assertSameResponse(AsyncOfferListView, url)
+        await self.assertSameResponse(AsyncOfferListView, url + "?min_price=60&ordering=min_price&page=2&page_size=1")
+        await self.assertSameResponse(AsyncOfferListView, url + "?cursor=&page_size=2")
+        await self.assertSameResponse(AsyncOfferListView, url + "?page=9")
+        detail = reverse("offer-detail", args=[self.offer.id])
+        await self.assertSameResponse(AsyncOfferRetrieveView, detail, id=self.offer.id)
+        await self.assertSameResponse(AsyncOfferRetrieveView, detail, auth=False, id=self.offer.id)
+        await self.assertSameResponse(AsyncOfferRetrieveView, reverse("offer-detail", args=[999]), id=999)
+
+    async def test_offer_list_cache_and_not_modified(self):
+        view = AsyncOfferListView.as_view()
+        first = await view(self.factory.get(reverse("offers")))
+        self.assertEqual(first["X-Cache"], "MISS")
+        second = await view(self.factory.get(reverse("offers"), headers={"If-None-Match": first["ETag"]}))
+        self.assertEqual((second.status_code, second["X-Cache"]), (304, "HIT"))
+
+    async def test_base_info_order_counts_and_profiles(self):
+        await self.assertSameResponse(AsyncBaseInfoView, reverse("base-info"))
+        for view, name in ((AsyncOrderCountView, "order-count"), (AsyncCompletedOrderCountView, "completed-order-count")):
+            for user_id in (self.business.id, 999):
+                await self.assertSameResponse(view, reverse(name, args=[user_id]), business_user_id=user_id)
+        for view, name in ((AsyncBusinessProfileView, "business-profile-list"), (AsyncCustomerProfileView, "customer-profile-list")):
+            for query in ("", "?page=1", "?cursor="):
+                await self.assertSameResponse(view, reverse(name) + query)
+            await self.assertSameResponse(view, reverse(name), auth=False)
+
+    async def test_writes_are_delegated_to_the_drf_view(self):
+        details = [
+            {"title": t, "revisions": 1, "delivery_time_in_days": 2, "price": 10, "features": [], "offer_type": t}
+            for t in ("basic", "standard", "premium")
+        ]
+        request = self.factory.post(
+            reverse("offers"), {"title": "New", "description": "", "details": details},
+            content_type="application/json", headers=self._headers(True, {}),
+        )
+        response = await AsyncOfferListView.as_view()(request)
+        self.assertEqual(response.status_code, 201)
+        self.assertTrue(await Offer.objects.filter(title="New").aexists())
+
+    def test_subclass_without_handler_is_rejected(self):
+        class IncompleteView(AsyncReadView):
+            sync_view_class = AsyncOfferListView.sync_view_class
+
+        with self.assertRaisesMessage(ImproperlyConfigured, "IncompleteView must set sync_view_class and define aget()"):
+            IncompleteView.as_view()
+        with self.assertRaises(ImproperlyConfigured):
+            AsyncReadView.as_view()
+
+    @override_settings(SERVER_TIMING=True)
+    async def test_middleware_in_async_chain(self):
+        registry.reset()
+        response = await self.async_client.get(reverse("base-info"))
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('desc="1 queries"', response["Server-Timing"])
+
+
+class AsgiServingTests(SimpleTestCase):
+    def _asgi_middleware(self):
+        with patch.dict(os.environ, {"SERVER_MODE": "asgi"}):
+            return runpy.run_path(os.path.join(settings.BASE_DIR, "core", "settings.py"))["MIDDLEWARE"]
+
+    def test_asgi_middleware_chain_is_fully_async(self):
+        middleware = self._asgi_middleware()
+        self.assertNotIn(WHITENOISE_MIDDLEWARE, middleware)
+        with override_settings(DEBUG=True, MIDDLEWARE=middleware):
+            with self.assertNoLogs("django.request", "DEBUG"):
+                handler = ASGIHandler()
+        self.assertTrue(iscoroutinefunction(handler._middleware_chain))
+
+        with override_settings(DEBUG=True, MIDDLEWARE=middleware + [WHITENOISE_MIDDLEWARE]):
+            with self.assertLogs("django.request", "DEBUG") as logs:
+                ASGIHandler()
+        self.assertIn("adapted for middleware " + WHITENOISE_MIDDLEWARE, "\n".join(logs.output))
+
+    async def _get(self, application, path):
+        messages = []
+
+        async def receive():
+            return {"type": "http.request", "body": b"", "more_body": False}
+
+        async def send(message):
+            messages.append(message)
+
+        scope = {
+            "type": "http", "method": "GET", "path": path, "raw_path": path.encode(), "root_path": "",
+            "query_string": b"", "headers": [], "http_version": "1.1", "scheme": "http",
+            "server": ("testserver", 80), "client": ("127.0.0.1", 1234),
+        }
+        await application(scope, receive, send)
+        body = b"".join(message.get("body", b"") for message in messages if message["type"] == "http.response.body")
+        return messages[0]["status"], body
+
+    async def test_static_files_are_served_in_front_of_django(self):
+        async def django_application(scope, receive, send):
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"django"})
+
+        with tempfile.TemporaryDirectory() as static_root:
+            with open(os.path.join(static_root, "app.css"), "w") as fh:
+                fh.write("body {}")
+            with override_settings(STATIC_ROOT=static_root, DEBUG=False):
+                application = StaticFilesApplication(django_application)
+            self.assertEqual(await self._get(application, "/static/app.css"), (200, b"body {}"))
+            self.assertEqual((await self._get(application, "/static/missing.css"))[0], 404)
+            self.assertEqual(await self._get(application, "/api/offers/"), (200, b"django"))
+
+
+class ImageDerivativeTests(TestCase):
+    def setUp(self):
+        caches["default"].clear()
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.media_root = media_root.name
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.business = User.objects.create_user(username="biz", password="pw")
+        Profile.objects.create(user=self.business, type="business")
+
+    def _files(self):
+        return sorted(
+            os.path.relpath(os.path.join(root, name), self.media_root)
+            for root, _dirs, names in os.walk(self.media_root) for name in names
+        )
+
+    def test_upload_builds_sized_derivatives_and_dimensions(self):
+        offer = Offer.objects.create(user=self.business, title="Logo", image=png_upload("logo.png", 800, 400))
+        offer.refresh_from_db()
+        self.assertEqual((offer.image_width, offer.image_height), (800, 400))
+        self.assertEqual(offer.image_derivatives["source"], offer.image.name)
+        self.assertEqual(list(offer.image_derivatives["webp"]), ["160", "320", "640"])
+        with Image.open(os.path.join(self.media_root, offer.image_derivatives["webp"]["320"])) as image:
+            self.assertEqual((image.format, image.size), ("WEBP", (320, 160)))
+        with Image.open(os.path.join(self.media_root, offer.image_derivatives["jpeg"]["640"])) as image:
+            self.assertEqual((image.format, image.mode), ("JPEG", "RGB"))
+
+        files = self._files()
+        shared = Offer.objects.create(user=self.business, title="Copy", image=offer.image.name)
+        self.assertEqual(shared.image_derivatives["webp"], offer.image_derivatives["webp"])
+        self.assertEqual(self._files(), files)
+
+    def test_small_and_unreadable_images(self):
+        offer = Offer.objects.create(user=self.business, title="Icon", image=png_upload("icon.png", 100, 50, "RGB"))
+        self.assertEqual(list(offer.image_derivatives["webp"]), ["100"])
+
+        broken = SimpleUploadedFile("broken.png", b"not an image", content_type="image/png")
+        with self.assertLogs("core.images", "WARNING"):
+            offer = Offer.objects.create(user=self.business, title="Broken", image=broken)
+        self.assertEqual(offer.image_derivatives, {"source": offer.image.name})
+        self.assertIsNone(offer.image_width)
+        self.assertFalse(refresh_image_derivatives(offer, "image"))
+        with self.assertNumQueries(1):
+            offer.save()
+
+    def test_variant_urls_in_list_responses(self):
+        Offer.objects.create(user=self.business, title="Logo", image=png_upload("logo.png", 400, 400))
+        profile = self.business.profile
+        profile.file = png_upload("me.png", 300, 300)
+        profile.save()
+
+        offer = APIClient().get(reverse("offers")).data["results"][0]
+        self.assertEqual(offer["image_variants"]["width"], 400)
+        self.assertEqual(list(offer["image_variants"]["webp"]), ["160", "320", "400"])
+        self.assertTrue(offer["image_variants"]["webp"]["160"].startswith("http://testserver/media/derivatives/"))
+
+        client = APIClient()
+        client.force_authenticate(self.business)
+        profile = client.get(reverse("business-profile-list")).data[0]
+        self.assertEqual(list(profile["file_variants"]["jpeg"]), ["160", "300"])
+
+        Offer.objects.create(user=self.business, title="No image")
+        self.assertIsNone(APIClient().get(reverse("offers")).data["results"][0]["image_variants"])
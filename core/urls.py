@@ -9,6 +9,8 @@ from rest_framework import permissions
 from drf_yasg.views import get_schema_view
 from drf_yasg import openapi
 
+from core.instrumentation import metrics_view
+
 
 schema_view = get_schema_view(
     openapi.Info(
@@ -32,6 +34,9 @@ urlpatterns = [
     path("redoc/", schema_view.with_ui("redoc", cache_timeout=0), name="schema-redoc"),
 ]
 
+if settings.METRICS_ENABLED:
+    urlpatterns += [path("metrics", metrics_view, name="metrics")]
+
 if settings.DEBUG:
     urlpatterns += static(settings.STATIC_URL, document_root=settings.STATIC_ROOT)
     urlpatterns += static(settings.MEDIA_URL,  document_root=settings.MEDIA_ROOT)
@@ -0,0 +1,33 @@
+"""
+Gunicorn serving profile, read automatically from the working directory.
+Every value can be overridden from the environment (see .env.prod.template).
+
+SERVER_MODE=wsgi: gthread workers, 2 x CPUs + 1 processes with GUNICORN_THREADS threads each.
+SERVER_MODE=asgi: uvicorn workers, one process per CPU.
+"""
+import multiprocessing
+import os
+
+server_mode = os.getenv("SERVER_MODE", "wsgi")
+cpus = multiprocessing.cpu_count()
+
+bind = os.getenv("GUNICORN_BIND", "0.0.0.0:8000")
+if server_mode == "asgi":
+    worker_class = os.getenv("GUNICORN_WORKER_CLASS", "uvicorn_worker.UvicornWorker")
+    workers = int(os.getenv("GUNICORN_WORKERS") or cpus)
+else:
+    worker_class = os.getenv("GUNICORN_WORKER_CLASS", "gthread")
+    workers = int(os.getenv("GUNICORN_WORKERS") or cpus * 2 + 1)
+threads = int(os.getenv("GUNICORN_THREADS", "4"))
+
+timeout = int(os.getenv("GUNICORN_TIMEOUT", "30"))
+graceful_timeout = int(os.getenv("GUNICORN_GRACEFUL_TIMEOUT", "30"))
+keepalive = int(os.getenv("GUNICORN_KEEPALIVE", "5"))
+
+# Recycle workers now and then to cap slow memory growth; jitter avoids simultaneous restarts.
+max_requests = int(os.getenv("GUNICORN_MAX_REQUESTS", "2000"))
+max_requests_jitter = int(os.getenv("GUNICORN_MAX_REQUESTS_JITTER", "200"))
+
+accesslog = os.getenv("GUNICORN_ACCESSLOG", "-") or None
+errorlog = "-"
+loglevel = os.getenv("GUNICORN_LOGLEVEL", "info")
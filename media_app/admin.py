@@ -0,0 +1,5 @@
+from django.contrib import admin
+
+from .models import MediaBlob
+
+admin.site.register(MediaBlob)
@@ -0,0 +1,54 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from media_app.models import MediaBlob
+from media_app.storage import blob_storage
+
+
+class Command(BaseCommand):
+    help = (
+        "Delete media blobs (and their image derivatives) that no row references any more. "
+        "Reference counts are recomputed first, and blobs touched within --min-age hours are kept "
+        "so uploads whose row is not saved yet survive."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--min-age", type=float, default=24, help="Hours a blob must be unreferenced.")
+        parser.add_argument("--dry-run", action="store_true", help="Only report what would be deleted.")
+        parser.add_argument(
+            "--no-recount", action="store_true", help="Trust the stored reference counts.",
+        )
+
+    def handle(self, *args, **opts):
+        if not opts["no_recount"]:
+            fixed = MediaBlob.objects.recount()
+            self.stdout.write(f"Reference counts fixed: {fixed}.")
+
+        cutoff = timezone.now() - timedelta(hours=opts["min_age"])
+        unreferenced = MediaBlob.objects.filter(ref_count=0, updated_at__lt=cutoff)
+        deleted = freed = 0
+        for blob in unreferenced.iterator():
+            if not opts["dry_run"]:
+                # Re-checked in the DELETE, since a new reference may have arrived meanwhile.
+                removed, _per_model = unreferenced.filter(pk=blob.pk).delete()
+                if not removed:
+                    continue
+                blob_storage.delete_blob(blob.name)
+            deleted += 1
+            freed += blob.size
+
+        known = set(MediaBlob.objects.values_list("name", flat=True))
+        orphans = [
+            name for name in blob_storage.stored_blobs()
+            if name not in known and blob_storage.get_modified_time(name) < cutoff
+        ]
+        for name in orphans:
+            if not opts["dry_run"]:
+                blob_storage.delete_blob(name)
+
+        verb = "Would delete" if opts["dry_run"] else "Deleted"
+        self.stdout.write(self.style.SUCCESS(
+            f"{verb} {deleted} unreferenced blob(s) ({freed} bytes) and {len(orphans)} untracked file(s)."
+        ))
@@ -0,0 +1,80 @@
+from collections import Counter
+
+from django.db import models
+from django.db.models import Count, F
+from django.utils import timezone
+
+
+class MediaBlobQuerySet(models.QuerySet):
+    """
+    QuerySet for blobs with the reference bookkeeping used by the storage and the signals.
+    """
+    def register(self, name, size):
+        """
+        Records a stored blob. Saving existing bytes again refreshes updated_at, which
+        keeps gc_media from deleting a blob a new row is about to reference.
+        """
+        if not self.filter(name=name).update(updated_at=timezone.now()):
+            self.get_or_create(name=name, defaults={"size": size})
+
+    def add_reference(self, name, delta):
+        """
+        Adjusts the reference count of the blob stored under name by delta.
+        Names that are not blobs (files stored before content addressing) are ignored.
+        """
+        if not name or not delta:
+            return
+        blobs = self.filter(name=name)
+        if delta < 0:
+            blobs = blobs.filter(ref_count__gte=-delta)
+        blobs.update(ref_count=F("ref_count") + delta, updated_at=timezone.now())
+
+    def recount(self, batch_size=1000):
+        """
+        Recomputes every ref_count from the rows referencing the blobs, for writes that
+        bypass the signals (bulk_create, queryset.update). Returns the number of blobs fixed.
+        """
+        from .storage import media_fields
+
+        counts = Counter()
+        for model, field in media_fields():
+            rows = (
+                model._default_manager.order_by()
+                .exclude(**{field.attname: ""})
+                .values_list(field.attname)
+                .annotate(references=Count("pk"))
+            )
+            for name, references in rows.iterator():
+                if name:
+                    counts[name] += references
+
+        drifted = []
+        for blob in self.only("pk", "name", "ref_count").iterator(chunk_size=batch_size):
+            if blob.ref_count != counts[blob.name]:
+                blob.ref_count = counts[blob.name]
+                drifted.append(blob)
+        self.bulk_update(drifted, ["ref_count"], batch_size=batch_size)
+        return len(drifted)
+
+
+class MediaBlob(models.Model):
+    """
+    A file of the content-addressed media storage and the number of rows referencing it.
+    """
+    name = models.CharField(max_length=255, unique=True)
+    size = models.PositiveBigIntegerField()
+    ref_count = models.PositiveIntegerField(default=0)
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(default=timezone.now)
+
+    objects = MediaBlobQuerySet.as_manager()
+
+    class Meta:
+        verbose_name = "Media blob"
+        verbose_name_plural = "Media blobs"
+        indexes = [
+            models.Index(fields=["ref_count", "updated_at"], name="mediablob_gc_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.name} ({self.ref_count} refs)"
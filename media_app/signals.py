@@ -0,0 +1,41 @@
+from django.db.models.signals import post_delete, post_save
+
+from .models import MediaBlob
+from .storage import media_fields
+
+
+def _loaded_name(instance, field):
+    # Models with core.models.LoadedValuesMixin remember the name they were loaded with.
+    loaded_value = getattr(instance, "loaded_value", None)
+    return loaded_value(field.attname) if loaded_value else None
+
+
+def track_references(sender, instance, created, raw=False, **kwargs):
+    """
+    Moves one reference from the previously stored file to the new one.
+    """
+    if raw:
+        return
+    for model, field in media_fields():
+        if model is not sender:
+            continue
+        old_name = None if created else _loaded_name(instance, field)
+        new_name = getattr(instance, field.attname).name
+        if old_name != new_name:
+            MediaBlob.objects.add_reference(new_name, 1)
+            MediaBlob.objects.add_reference(old_name, -1)
+
+
+def release_references(sender, instance, **kwargs):
+    for model, field in media_fields():
+        if model is sender:
+            MediaBlob.objects.add_reference(getattr(instance, field.attname).name, -1)
+
+
+def connect_reference_tracking():
+    """
+    Connects the receivers for every model with a field in the content-addressed storage.
+    """
+    for model in {model for model, _field in media_fields()}:
+        post_save.connect(track_references, sender=model, dispatch_uid=f"media_refs_save_{model._meta.label}")
+        post_delete.connect(release_references, sender=model, dispatch_uid=f"media_refs_delete_{model._meta.label}")
@@ -0,0 +1,93 @@
+import hashlib
+import os
+import posixpath
+import uuid
+from functools import cache
+
+from django.apps import apps
+from django.core.files.storage import FileSystemStorage
+from django.db.models import FileField
+from django.utils.deconstruct import deconstructible
+
+from core.images import DERIVATIVES_DIR, derivative_name
+
+BLOB_DIR = "blobs"
+
+
+@deconstructible(path="media_app.storage.ContentAddressedStorage")
+class ContentAddressedStorage(FileSystemStorage):
+    """
+    File system storage that keeps every distinct content once, as
+    blobs/ab/cd/<sha256><ext>. Of the name passed in only the extension is kept, and
+    saving bytes that are already stored returns the existing name, so any number of
+    rows can share one file. Each blob is registered as a MediaBlob; media_app.signals
+    maintains its ref_count and gc_media deletes blobs nothing references any more.
+    Image derivatives are stored under the name given, which already derives from a blob.
+    """
+    def blob_name(self, digest, extension):
+        return posixpath.join(BLOB_DIR, digest[:2], digest[2:4], f"{digest}{extension}")
+
+    def _digest(self, content):
+        sha256, size = hashlib.sha256(), 0
+        for chunk in content.chunks():
+            sha256.update(chunk)
+            size += len(chunk)
+        return sha256.hexdigest(), size
+
+    def _save(self, name, content):
+        if name.startswith(DERIVATIVES_DIR + "/"):
+            return super()._save(name, content)
+
+        from .models import MediaBlob
+
+        digest, size = self._digest(content)
+        blob = self.blob_name(digest, posixpath.splitext(name)[1].lower())
+        if not self.exists(blob):
+            # Written under a unique name and moved into place, so concurrent uploads
+            # of the same bytes simply replace the blob with identical content.
+            content.seek(0)
+            temporary = super()._save(posixpath.join(BLOB_DIR, "tmp", uuid.uuid4().hex), content)
+            os.makedirs(os.path.dirname(self.path(blob)), exist_ok=True)
+            os.replace(self.path(temporary), self.path(blob))
+        MediaBlob.objects.register(blob, size)
+        return blob
+
+    def delete_blob(self, name):
+        """
+        Deletes a blob together with its image derivatives.
+        """
+        self.delete(name)
+        # Derivatives are named <stem>-<width>.<ext> next to where core.images puts them.
+        directory = posixpath.dirname(derivative_name(name, 0, "webp"))
+        prefix = posixpath.splitext(posixpath.basename(name))[0] + "-"
+        try:
+            _dirs, files = self.listdir(directory)
+        except FileNotFoundError:
+            return
+        for filename in files:
+            if filename.startswith(prefix):
+                self.delete(posixpath.join(directory, filename))
+
+    def stored_blobs(self):
+        """
+        Yields the names of all blob files, including ones left without a MediaBlob row.
+        """
+        for root, _dirs, files in os.walk(self.path(BLOB_DIR)):
+            for filename in files:
+                yield os.path.relpath(os.path.join(root, filename), self.location).replace(os.sep, "/")
+
+
+blob_storage = ContentAddressedStorage()
+
+
+@cache
+def media_fields():
+    """
+    (model, field) for every file field stored in the content-addressed storage.
+    """
+    return tuple(
+        (model, field)
+        for model in apps.get_models()
+        for field in model._meta.concrete_fields
+        if isinstance(field, FileField) and isinstance(field.storage, ContentAddressedStorage)
+    )
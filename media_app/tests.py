@@ -0,0 +1,93 @@
+import os
+import tempfile
+from datetime import timedelta
+from io import StringIO
+
+from django.contrib.auth.models import User
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from accounts_app.models import Profile
+from core.testing import png_upload
+from media_app.models import MediaBlob
+from media_app.storage import blob_storage
+from offers_app.models import Offer
+
+
+class ContentAddressedStorageTests(TestCase):
+    def setUp(self):
+        media_root = tempfile.TemporaryDirectory()
+        self.addCleanup(media_root.cleanup)
+        self.media_root = media_root.name
+        settings_override = override_settings(MEDIA_ROOT=self.media_root)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+        self.business = User.objects.create_user(username="biz", password="pw")
+        self.profile = Profile.objects.create(user=self.business, type="business")
+
+    def _offer(self, upload):
+        return Offer.objects.create(user=self.business, title="Logo", image=upload)
+
+    def test_identical_uploads_share_one_blob(self):
+        first = self._offer(png_upload("logo.png", 64, 64))
+        second = self._offer(png_upload("other-name.PNG", 64, 64))
+        self.profile.file = png_upload("avatar.png", 64, 64)
+        self.profile.save()
+
+        self.assertEqual(first.image.name, second.image.name)
+        self.assertEqual(self.profile.file.name, first.image.name)
+        self.assertRegex(first.image.name, r"^blobs/[0-9a-f]{2}/[0-9a-f]{2}/[0-9a-f]{64}\.png$")
+        self.assertEqual(list(blob_storage.stored_blobs()), [first.image.name])
+        blob = MediaBlob.objects.get()
+        self.assertEqual(blob.ref_count, 3)
+        self.assertEqual(blob.size, first.image.size)
+
+    def test_references_follow_replacements_and_deletes(self):
+        offer = self._offer(png_upload("logo.png", 64, 64))
+        old_name = offer.image.name
+        offer = Offer.objects.get(pk=offer.pk)
+        offer.image = png_upload("new.png", 32, 32)
+        offer.save()
+        self.assertEqual(MediaBlob.objects.get(name=old_name).ref_count, 0)
+        self.assertEqual(MediaBlob.objects.get(name=offer.image.name).ref_count, 1)
+
+        offer.title = "Renamed"
+        offer.save()
+        self.assertEqual(MediaBlob.objects.get(name=offer.image.name).ref_count, 1)
+        offer.delete()
+        self.assertEqual(MediaBlob.objects.get(name=offer.image.name).ref_count, 0)
+
+    def test_gc_media_deletes_unreferenced_blobs_and_derivatives(self):
+        kept = self._offer(png_upload("kept.png", 400, 200))
+        dropped = self._offer(png_upload("dropped.png", 300, 300))
+        dropped_name = dropped.image.name
+        dropped_derivative = dropped.image_derivatives["webp"]["160"]
+        Offer.objects.filter(pk=dropped.pk).delete()
+        os.makedirs(os.path.join(self.media_root, "blobs", "tmp"), exist_ok=True)
+        with open(os.path.join(self.media_root, "blobs", "tmp", "crashed"), "wb") as fh:
+            fh.write(b"partial")
+
+        out = StringIO()
+        call_command("gc_media", stdout=out)
+        self.assertIn("Deleted 0 unreferenced blob(s)", out.getvalue())
+        self.assertTrue(blob_storage.exists(dropped_name))
+
+        MediaBlob.objects.update(updated_at=timezone.now() - timedelta(days=2))
+        out = StringIO()
+        call_command("gc_media", "--min-age", "0", stdout=out)
+        self.assertIn("Deleted 1 unreferenced blob(s)", out.getvalue())
+        self.assertIn("and 1 untracked file(s)", out.getvalue())
+        self.assertFalse(blob_storage.exists(dropped_name))
+        self.assertFalse(blob_storage.exists(dropped_derivative))
+        self.assertTrue(blob_storage.exists(kept.image.name))
+        self.assertTrue(blob_storage.exists(kept.image_derivatives["jpeg"]["320"]))
+        self.assertEqual(list(MediaBlob.objects.values_list("name", flat=True)), [kept.image.name])
+
+    def test_recount_repairs_bulk_writes(self):
+        offer = self._offer(png_upload("logo.png", 64, 64))
+        Offer.objects.bulk_create([Offer(user=self.business, title=f"Copy {i}", image=offer.image.name) for i in range(4)])
+        self.assertEqual(MediaBlob.objects.get().ref_count, 1)
+        self.assertEqual(MediaBlob.objects.recount(), 1)
+        self.assertEqual(MediaBlob.objects.get().ref_count, 5)
+        self.assertEqual(MediaBlob.objects.recount(), 0)
@@ -0,0 +1,175 @@
+"""
+Response cache for offer list/detail reads.
+
+Entries are keyed on a generation counter plus the normalized request. Writes bump
+the generation (see offers_app.signals), so stale entries are never read again and
+simply expire. The backend is any Django cache alias (local memory in dev/tests,
+Redis in production via REDIS_URL).
+"""
+import hashlib
+import pickle
+import threading
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from rest_framework.response import Response
+
+from core.conditional import VALIDATOR_HEADERS, is_not_modified, not_modified_response
+
+LIST_GENERATION_KEY = "offers:gen:list"
+CACHED_LIST_PARAMS = (
+    "creator_id",
+    "min_price",
+    "max_delivery_time",
+    "ordering",
+    "search",
+    "page",
+    "page_size",
+    "cursor",
+)
+# The facet counts only depend on the filter state, not on ordering or page.
+CACHED_FACET_PARAMS = ("creator_id", "min_price", "max_delivery_time", "search")
+
+
+def _detail_generation_key(offer_id):
+    return f"offers:gen:detail:{offer_id}"
+
+
+class OfferResponseCache:
+    """
+    Generation-keyed cache for serialized offer responses with hit/miss counters.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.oversized = 0
+
+    @property
+    def config(self):
+        return settings.OFFER_CACHE
+
+    @property
+    def cache(self):
+        return caches[self.config["ALIAS"]]
+
+    def _generation(self, key):
+        generation = self.cache.get(key)
+        if generation is None:
+            self.cache.add(key, 1, timeout=None)
+            generation = self.cache.get(key, 1)
+        return generation
+
+    def _bump(self, key):
+        try:
+            self.cache.incr(key)
+        except ValueError:
+            self.cache.add(key, 2, timeout=None)
+
+    def _origin(self, request):
+        return f"{request.scheme}://{request.get_host()}"
+
+    def list_generation(self):
+        return self._generation(LIST_GENERATION_KEY)
+
+    def detail_generation(self, offer_id):
+        return self._generation(_detail_generation_key(offer_id))
+
+    def list_key(self, request, prefix="list", cached_params=CACHED_LIST_PARAMS):
+        params = sorted(
+            (name, tuple(sorted(value.strip() for value in request.query_params.getlist(name))))
+            for name in cached_params
+            if name in request.query_params
+        )
+        digest = hashlib.sha1(repr((self._origin(request), params)).encode()).hexdigest()
+        return f"offers:{prefix}:{self.list_generation()}:{digest}"
+
+    def detail_key(self, request, offer_id):
+        generation = self.detail_generation(offer_id)
+        digest = hashlib.sha1(self._origin(request).encode()).hexdigest()
+        return f"offers:detail:{offer_id}:{generation}:{digest}"
+
+    def get(self, key):
+        payload = self.cache.get(key)
+        with self._lock:
+            if payload is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+        return pickle.loads(payload)
+
+    def set(self, key, data):
+        payload = pickle.dumps(data, protocol=pickle.HIGHEST_PROTOCOL)
+        if len(payload) > self.config["MAX_ENTRY_BYTES"]:
+            with self._lock:
+                self.oversized += 1
+            return
+        self.cache.set(key, payload, timeout=self.config["TIMEOUT"])
+
+    def cached_response(self, request, key, build_response):
+        """
+        Returns the cached response for key, or builds, stores and returns a fresh one.
+        Only 200 responses are stored, together with their validator headers, so a
+        hit with a matching If-None-Match is answered with 304.
+        """
+        entry = self.get(key)
+        if entry is not None:
+            return self._hit_response(request, entry)
+        response = build_response()
+        self._store(key, response)
+        response["X-Cache"] = "MISS"
+        return response
+
+    async def acached_response(self, request, key, build_response):
+        """
+        cached_response() for the async read views; build_response is a coroutine function.
+        """
+        entry = await sync_to_async(self.get)(key)
+        if entry is not None:
+            return self._hit_response(request, entry)
+        response = await build_response()
+        await sync_to_async(self._store)(key, response)
+        response["X-Cache"] = "MISS"
+        return response
+
+    def _hit_response(self, request, entry):
+        headers = entry["headers"]
+        if "ETag" in headers and is_not_modified(request, headers["ETag"]):
+            response = not_modified_response(headers["ETag"])
+        else:
+            response = Response(entry["data"], headers=headers)
+        response["X-Cache"] = "HIT"
+        return response
+
+    def _store(self, key, response):
+        if response.status_code == 200:
+            headers = {name: response[name] for name in VALIDATOR_HEADERS if name in response}
+            self.set(key, {"data": response.data, "headers": headers})
+
+    def invalidate(self, offer_id=None):
+        """
+        Bumps the list generation (and the offer's detail generation) now and again
+        on commit, so readers never cache uncommitted or pre-commit state for long.
+        """
+        def bump():
+            self._bump(LIST_GENERATION_KEY)
+            if offer_id is not None:
+                self._bump(_detail_generation_key(offer_id))
+
+        bump()
+        transaction.on_commit(bump)
+
+    def stats(self):
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "oversized": self.oversized,
+                "hit_ratio": self.hits / lookups if lookups else 0.0,
+            }
+
+
+offer_cache = OfferResponseCache()
@@ -0,0 +1,73 @@
+"""
+Bucketed offer counts for the catalog filters (GET /api/offers/facets/).
+
+The price, delivery-time and tier facets come from one aggregate() with a conditional
+count per bucket. The creator facet is a second grouped query that the database sorts
+and cuts to the top creators, so no per-creator rows are loaded beyond those.
+"""
+from django.db.models import Count, Exists, OuterRef, Q
+
+from offers_app.models import OfferDetail
+
+# Bucket bounds on Offer.min_price and Offer.min_delivery_time: [from, to), open-ended last.
+PRICE_BUCKETS = (0, 50, 100, 250, 500, 1000, None)
+DELIVERY_TIME_BUCKETS = (1, 2, 4, 8, 15, None)
+TOP_CREATORS = 20
+
+
+def _ranges(bounds):
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _range_filter(field, lower, upper):
+    condition = Q(**{f"{field}__gte": lower})
+    if upper is not None:
+        condition &= Q(**{f"{field}__lt": upper})
+    return condition
+
+
+def facet_aggregates():
+    aggregates = {"count": Count("pk")}
+    for i, (lower, upper) in enumerate(_ranges(PRICE_BUCKETS)):
+        aggregates[f"price_{i}"] = Count("pk", filter=_range_filter("min_price", lower, upper))
+    for i, (lower, upper) in enumerate(_ranges(DELIVERY_TIME_BUCKETS)):
+        aggregates[f"delivery_{i}"] = Count("pk", filter=_range_filter("min_delivery_time", lower, upper))
+    for offer_type, _label in OfferDetail.OFFER_TYPE_CHOICES:
+        has_tier = Exists(OfferDetail.objects.filter(offer=OuterRef("pk"), offer_type=offer_type))
+        aggregates[f"tier_{offer_type}"] = Count("pk", filter=Q(has_tier))
+    return aggregates
+
+
+def creator_counts(queryset, top_creators=TOP_CREATORS):
+    """
+    The creators with the most offers in queryset, as {"user", "count"} rows.
+    """
+    return (
+        queryset.order_by().values("user").annotate(count=Count("pk")).order_by("-count", "user")[:top_creators]
+    )
+
+
+def offer_facets(queryset, top_creators=TOP_CREATORS):
+    """
+    Returns the facet counts of an (already filtered) offer queryset.
+    """
+    totals = queryset.order_by().aggregate(**facet_aggregates())
+
+    def buckets(bounds, prefix):
+        return [
+            {"from": lower, "to": upper, "count": totals[f"{prefix}_{i}"]}
+            for i, (lower, upper) in enumerate(_ranges(bounds))
+        ]
+
+    return {
+        "count": totals["count"],
+        "price": buckets(PRICE_BUCKETS, "price"),
+        "delivery_time": buckets(DELIVERY_TIME_BUCKETS, "delivery"),
+        "offer_type": {
+            offer_type: totals[f"tier_{offer_type}"] for offer_type, _label in OfferDetail.OFFER_TYPE_CHOICES
+        },
+        "creator": [
+            {"creator_id": row["user"], "count": row["count"]}
+            for row in creator_counts(queryset, top_creators)
+        ],
+    }
@@ -1,23 +1,49 @@
 from django_filters.rest_framework import DjangoFilterBackend, FilterSet, NumberFilter
+from rest_framework.exceptions import ValidationError
 from rest_framework.filters import OrderingFilter, SearchFilter
+from offers_app import search
 from offers_app.models import Offer
 
 class OfferFilter(FilterSet):
+    """
+    Filters on the denormalized per-offer minima (Offer.min_price, Offer.min_delivery_time),
+    so every filter is a predicate on the offer row: no join on OfferDetail, one row per
+    offer, and the page count matches the rows however many filters are combined.
+    """
     creator_id = NumberFilter(field_name="user__id")
-    min_price = NumberFilter(field_name="details__price", lookup_expr="gte")
-    max_delivery_time = NumberFilter(field_name="details__delivery_time_in_days", lookup_expr="lte")
+    min_price = NumberFilter(field_name="min_price", lookup_expr="gte")
+    max_delivery_time = NumberFilter(field_name="min_delivery_time", lookup_expr="lte")
 
     class Meta:
         model = Offer
         fields = ["creator_id", "min_price", "max_delivery_time"]
-        
-    def filter_min_price(self, queryset, name, value):
-        return queryset.filter(details__price__gte=value).distinct()
 
-    def filter_max_delivery_time(self, queryset, name, value):
-        return queryset.filter(details__delivery_time_in_days__lte=value).distinct()
+
+class OfferSearchFilter(SearchFilter):
+    """
+    Full-text search for ?search= (Postgres tsvector, SQLite FTS5, ILIKE elsewhere).
+    ?ordering=relevance orders the matches by search rank; with ?cursor= it is rejected with 400.
+    """
+    relevance_ordering = "relevance"
+
+    def filter_queryset(self, request, queryset, view):
+        by_relevance = request.query_params.get(OrderingFilter.ordering_param) == self.relevance_ordering
+        cursor_param = getattr(getattr(view, "paginator", None), "cursor_query_param", None)
+        if by_relevance and cursor_param in request.query_params:
+            # The search rank is no column, so keyset pages could not continue from it.
+            raise ValidationError({"ordering": ["Cursor pagination is not available when ordering by relevance."]})
+
+        terms = self.get_search_terms(request)
+        if not terms or not search.is_supported(queryset.db):
+            return super().filter_queryset(request, queryset, view)
+
+        queryset = search.search_offers(queryset, terms, with_rank=by_relevance)
+        if by_relevance:
+            queryset = queryset.order_by("-search_rank", "-created_at")
+        return queryset
+
 
 class OfferFilterConf:
-    filter_backends = [DjangoFilterBackend, OrderingFilter, SearchFilter]
+    filter_backends = [DjangoFilterBackend, OrderingFilter, OfferSearchFilter]
     search_fields = ["title", "description"]
-    ordering_fields = ["updated_at", "min_price"]
\ No newline at end of file
+    ordering_fields = ["updated_at", "min_price"]
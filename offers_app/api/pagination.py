@@ -1,8 +1,9 @@
-from rest_framework.pagination import PageNumberPagination
+from core.pagination import HybridPagination
 
-class OfferPagination(PageNumberPagination):
+class OfferPagination(HybridPagination):
     """
     Pagination class for offers, sets a default page size and allows page size query parameter.
+    Supports keyset pagination via ?cursor= on the active ordering.
     """
     page_size = 6
-    page_size_query_param = "page_size"
\ No newline at end of file
+    page_size_query_param = "page_size"
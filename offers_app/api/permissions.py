@@ -1,5 +1,7 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from accounts_app.api.permissions import get_profile_type
+
 
 class IsBusinessUser(BasePermission):
     """
@@ -9,11 +11,7 @@ class IsBusinessUser(BasePermission):
     def has_permission(self, request, view):
         return (
             request.method in SAFE_METHODS
-            or (
-                request.user.is_authenticated
-                and hasattr(request.user, "profile")
-                and request.user.profile.type == "business"
-            )
+            or get_profile_type(request.user) == "business"
         )
 
 
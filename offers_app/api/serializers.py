@@ -1,5 +1,8 @@
+from django.db import transaction
 from rest_framework import serializers
+from core.images import ImageVariantsField
 from offers_app.models import Offer, OfferDetail
+from offers_app.signals import bulk_detail_writes
 from rest_framework.reverse import reverse
 
 
@@ -24,8 +27,11 @@ class OfferRetrieveSerializer(serializers.ModelSerializer):
     and user details.
     """
     details = OfferDetailReferenceSerializer(many=True, read_only=True)
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
+    min_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, coerce_to_string=False, read_only=True
+    )
+    min_delivery_time = serializers.IntegerField(read_only=True)
+    image_variants = ImageVariantsField("image")
     user_details = serializers.SerializerMethodField()
 
     class Meta:
@@ -35,6 +41,7 @@ class OfferRetrieveSerializer(serializers.ModelSerializer):
             "user",
             "title",
             "image",
+            "image_variants",
             "description",
             "created_at",
             "updated_at",
@@ -44,15 +51,6 @@ class OfferRetrieveSerializer(serializers.ModelSerializer):
             "user_details",
         ]
 
-    def get_min_price(self, obj):
-        prices = [d.price for d in obj.details.all()]
-        return min(prices) if prices else None
-
-    def get_min_delivery_time(self, obj):
-        times = [d.delivery_time_in_days for d in obj.details.all()]
-        return min(times) if times else None
-
-
     def get_user_details(self, obj):
         return {
             "username": obj.user.username,
@@ -85,8 +83,11 @@ class OfferDetailViewSerializer(serializers.ModelSerializer):
     including all related offer details, minimum price, and minimum delivery time.
     """
     details = OfferDetailFullSerializer(many=True, read_only=True)
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
+    min_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, coerce_to_string=False, read_only=True
+    )
+    min_delivery_time = serializers.IntegerField(read_only=True)
+    image_variants = ImageVariantsField("image")
 
     class Meta:
         model = Offer
@@ -95,6 +96,7 @@ class OfferDetailViewSerializer(serializers.ModelSerializer):
             "user",
             "title",
             "image",
+            "image_variants",
             "description",
             "created_at",
             "updated_at",
@@ -103,12 +105,6 @@ class OfferDetailViewSerializer(serializers.ModelSerializer):
             "min_delivery_time",
         ]
 
-    def get_min_price(self, obj):
-        return min([d.price for d in obj.details.all()])
-
-    def get_min_delivery_time(self, obj):
-        return min([d.delivery_time_in_days for d in obj.details.all()])
-
 
 class OfferDetailInputSerializer(serializers.ModelSerializer):
     """
@@ -159,8 +155,11 @@ class OfferSerializer(serializers.ModelSerializer):
     Also provides computed fields like minimum price, minimum delivery time, and user details.
     """
     details = OfferDetailInputSerializer(many=True)
-    min_price = serializers.SerializerMethodField()
-    min_delivery_time = serializers.SerializerMethodField()
+    min_price = serializers.DecimalField(
+        max_digits=10, decimal_places=2, coerce_to_string=False, read_only=True
+    )
+    min_delivery_time = serializers.IntegerField(read_only=True)
+    image_variants = ImageVariantsField("image")
     user_details = serializers.SerializerMethodField()
 
     class Meta:
@@ -170,6 +169,7 @@ class OfferSerializer(serializers.ModelSerializer):
             "user",
             "title",
             "image",
+            "image_variants",
             "description",
             "created_at",
             "updated_at",
@@ -180,14 +180,6 @@ class OfferSerializer(serializers.ModelSerializer):
         ]
         read_only_fields = ["user", "min_price", "min_delivery_time", "user_details"]
 
-    def get_min_price(self, obj):
-        prices = [d.price for d in obj.details.all()]
-        return min(prices) if prices else None
-
-    def get_min_delivery_time(self, obj):
-        times = [d.delivery_time_in_days for d in obj.details.all()]
-        return min(times) if times else None
-
     def get_user_details(self, obj):
         return {
             "username": obj.user.username,
@@ -195,13 +187,18 @@ class OfferSerializer(serializers.ModelSerializer):
             "last_name": obj.user.last_name,
         }
 
+    @transaction.atomic
     def create(self, validated_data):
         details_data = validated_data.pop("details")
         offer = Offer.objects.create(**validated_data)
-        for detail in details_data:
-            OfferDetail.objects.create(offer=offer, **detail)
+        with bulk_detail_writes(offer):
+            OfferDetail.objects.bulk_create(
+                [OfferDetail(offer=offer, **detail) for detail in details_data]
+            )
+        offer.refresh_from_db(fields=["min_price", "min_delivery_time", "updated_at"])
         return offer
 
+    @transaction.atomic
     def update(self, instance, validated_data):
         details_data = validated_data.pop("details", None)
 
@@ -210,23 +207,66 @@ class OfferSerializer(serializers.ModelSerializer):
         instance.save()
 
         if details_data is not None:
-            existing_details = {d.id: d for d in instance.details.all()}
-            passed_ids = []
-            for detail_data in details_data:
-                detail_id = detail_data.get("id", None)
-                if detail_id and detail_id in existing_details:
-                    detail = existing_details[detail_id]
-                    for key, value in detail_data.items():
-                        if key != "id":
-                            setattr(detail, key, value)
-                    detail.save()
-                    passed_ids.append(detail_id)
-                else:
-                    OfferDetail.objects.create(
-                        offer=instance,
-                        **{k: v for k, v in detail_data.items() if k != "id"}
-                    )
-            for old_id, old_detail in existing_details.items():
-                if old_id not in passed_ids:
-                    old_detail.delete()
+            with bulk_detail_writes(instance):
+                self._write_details(instance, details_data)
+            instance.refresh_from_db(fields=["min_price", "min_delivery_time", "updated_at"])
         return instance
+
+    def _write_details(self, offer, details_data):
+        """
+        Applies the submitted details with one bulk UPDATE, one bulk INSERT and one
+        DELETE of the details that were not passed, regardless of the number of tiers.
+        """
+        existing_details = {d.id: d for d in OfferDetail.objects.filter(offer=offer)}
+        changed, created, changed_fields = [], [], set()
+        for detail_data in details_data:
+            detail_id = detail_data.get("id", None)
+            values = {k: v for k, v in detail_data.items() if k != "id"}
+            if detail_id and detail_id in existing_details:
+                detail = existing_details[detail_id]
+                for key, value in values.items():
+                    setattr(detail, key, value)
+                changed.append(detail)
+                changed_fields.update(values)
+            else:
+                created.append(OfferDetail(offer=offer, **values))
+
+        OfferDetail.objects.filter(offer=offer).exclude(
+            pk__in=[detail.pk for detail in changed]
+        ).delete()
+        if changed and changed_fields:
+            OfferDetail.objects.bulk_update(changed, sorted(changed_fields))
+        if created:
+            OfferDetail.objects.bulk_create(created)
+
+
+class OfferFacetBucketSerializer(serializers.Serializer):
+    """
+    One [from, to) bucket of an offer facet; to is null for the open-ended last bucket.
+    """
+    lower = serializers.IntegerField()
+    upper = serializers.IntegerField(allow_null=True)
+    count = serializers.IntegerField()
+
+    def get_fields(self):
+        # "from" is a keyword, so the bounds are declared as lower/upper and renamed here.
+        fields = super().get_fields()
+        fields["from"] = fields.pop("lower")
+        fields["to"] = fields.pop("upper")
+        return fields
+
+
+class OfferCreatorCountSerializer(serializers.Serializer):
+    creator_id = serializers.IntegerField()
+    count = serializers.IntegerField()
+
+
+class OfferFacetsSerializer(serializers.Serializer):
+    """
+    Response of the offer facets endpoint (documentation only, see offers_app.api.facets).
+    """
+    count = serializers.IntegerField()
+    price = OfferFacetBucketSerializer(many=True)
+    delivery_time = OfferFacetBucketSerializer(many=True)
+    offer_type = serializers.DictField(child=serializers.IntegerField())
+    creator = OfferCreatorCountSerializer(many=True)
@@ -1,9 +1,11 @@
 from django.urls import path
-from .views import OfferListCreateView, OfferRetrieveUpdateDestroyView, OfferDetailRetrieveView
+from core.async_views import read_view
+from .views import AsyncOfferListView, AsyncOfferRetrieveView, OfferDetailRetrieveView, OfferFacetsView
 
 urlpatterns = [
-  path('offers/', OfferListCreateView.as_view(), name='offers'),
-  path("offers/<int:id>/", OfferRetrieveUpdateDestroyView.as_view(), name="offer-detail"),
+  path('offers/', read_view(AsyncOfferListView), name='offers'),
+  path("offers/facets/", OfferFacetsView.as_view(), name="offer-facets"),
+  path("offers/<int:id>/", read_view(AsyncOfferRetrieveView), name="offer-detail"),
   path("offerdetails/<int:id>/", OfferDetailRetrieveView.as_view(), name="offerdetail-retrieve"),
 
 
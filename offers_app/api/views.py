@@ -1,4 +1,9 @@
+from asgiref.sync import sync_to_async
+from django_filters.rest_framework import DjangoFilterBackend
+from drf_yasg import openapi
+from drf_yasg.utils import swagger_auto_schema
 from rest_framework.generics import (
+    GenericAPIView,
     ListCreateAPIView,
     RetrieveAPIView,
     RetrieveUpdateDestroyAPIView,
@@ -7,21 +12,25 @@ from rest_framework.permissions import AllowAny, IsAuthenticated, SAFE_METHODS
 from rest_framework.filters import OrderingFilter, SearchFilter
 from rest_framework import status
 from rest_framework.response import Response
-from django.db.models import Min
 
+from core.async_views import AsyncReadView
+from core.conditional import ConditionalListMixin, ConditionalRetrieveMixin
 from .permissions import IsBusinessUser, IsOfferOwnerOrReadOnly
 from offers_app.models import Offer, OfferDetail
 from .serializers import (
+    OfferFacetsSerializer,
     OfferRetrieveSerializer,
     OfferSerializer,
     OfferDetailViewSerializer,
     OfferDetailSingleSerializer,
 )
+from .cache import CACHED_FACET_PARAMS, offer_cache
+from .facets import offer_facets
 from .pagination import OfferPagination
-from .filters import OfferFilter, OfferFilterConf
+from .filters import OfferFilter, OfferFilterConf, OfferSearchFilter
 
 
-class OfferListCreateView(ListCreateAPIView):
+class OfferListCreateView(ConditionalListMixin, ListCreateAPIView):
     """
     API view to list all offers or create a new offer.
     Provides pagination, search, ordering, and filtering by creator, price, and delivery time.
@@ -31,6 +40,7 @@ class OfferListCreateView(ListCreateAPIView):
     filter_backends = OfferFilterConf.filter_backends
     search_fields = OfferFilterConf.search_fields
     ordering_fields = OfferFilterConf.ordering_fields
+    ordering = ["-created_at"]
 
     def get_permissions(self):
         if self.request.method in SAFE_METHODS:
@@ -43,11 +53,22 @@ class OfferListCreateView(ListCreateAPIView):
         return OfferSerializer
 
     def get_queryset(self):
-        queryset = Offer.objects.all().annotate(
-            min_price=Min("details__price"),
-            min_delivery_time=Min("details__delivery_time_in_days"),
-        ).order_by("-created_at")
-        return queryset
+        return (
+            Offer.objects.select_related("user")
+            .prefetch_related("details")
+            .order_by("-created_at")
+        )
+
+    def get_etag_version(self):
+        # The rows embed the owner's user_details; user writes bump the list generation.
+        return offer_cache.list_generation()
+
+    def list(self, request, *args, **kwargs):
+        return offer_cache.cached_response(
+            request,
+            offer_cache.list_key(request),
+            lambda: super(OfferListCreateView, self).list(request, *args, **kwargs),
+        )
 
     def post(self, request, *args, **kwargs):
         details = request.data.get("details", [])
@@ -62,12 +83,40 @@ class OfferListCreateView(ListCreateAPIView):
         serializer.save(user=self.request.user)
 
 
-class OfferRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
+class OfferFacetsView(GenericAPIView):
+    """
+    API view to retrieve bucketed offer counts (price, delivery time, tier, creator)
+    for the current search and filter state, e.g. /offers/facets/?search=logo&max_delivery_time=7.
+    """
+    queryset = Offer.objects.all()
+    permission_classes = [AllowAny]
+    filterset_class = OfferFilter
+    filter_backends = [DjangoFilterBackend, OfferSearchFilter]
+    search_fields = OfferFilterConf.search_fields
+    pagination_class = None
+
+    # drf-yasg only documents filter parameters for list views.
+    @swagger_auto_schema(
+        manual_parameters=[
+            openapi.Parameter(name, openapi.IN_QUERY, type=openapi.TYPE_NUMBER)
+            for name in OfferFilter.base_filters
+        ],
+        responses={200: OfferFacetsSerializer},
+    )
+    def get(self, request, *args, **kwargs):
+        return offer_cache.cached_response(
+            request,
+            offer_cache.list_key(request, prefix="facets", cached_params=CACHED_FACET_PARAMS),
+            lambda: Response(offer_facets(self.filter_queryset(self.get_queryset()))),
+        )
+
+
+class OfferRetrieveUpdateDestroyView(ConditionalRetrieveMixin, RetrieveUpdateDestroyAPIView):
     """
     API view to retrieve, update, or delete a specific offer.
     GET requests are open to all, write operations require owner permissions.
     """
-    queryset = Offer.objects.all()
+    queryset = Offer.objects.select_related("user").prefetch_related("details")
     serializer_class = OfferDetailViewSerializer
     lookup_field = "id"
     permission_classes = [IsAuthenticated, IsOfferOwnerOrReadOnly]
@@ -77,6 +126,17 @@ class OfferRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
             return OfferDetailViewSerializer
         return OfferSerializer
 
+    def get_etag_version(self):
+        return offer_cache.detail_generation(self.kwargs[self.lookup_field])
+
+    def retrieve(self, request, *args, **kwargs):
+        # Object permissions always allow safe methods, so a cache hit may skip get_object().
+        return offer_cache.cached_response(
+            request,
+            offer_cache.detail_key(request, kwargs[self.lookup_field]),
+            lambda: super(OfferRetrieveUpdateDestroyView, self).retrieve(request, *args, **kwargs),
+        )
+
 
 class OfferDetailRetrieveView(RetrieveAPIView):
     """
@@ -88,3 +148,29 @@ class OfferDetailRetrieveView(RetrieveAPIView):
     serializer_class = OfferDetailSingleSerializer
     permission_classes = [IsAuthenticated]
     lookup_field = "id"
+
+
+class AsyncOfferListView(AsyncReadView):
+    """
+    Async GET for /offers/ under ASGI, with the same cache, validators and pagination.
+    """
+    sync_view_class = OfferListCreateView
+
+    async def aget(self, request, *args, **kwargs):
+        key = await sync_to_async(offer_cache.list_key)(request)
+        return await offer_cache.acached_response(
+            request, key, lambda: self.api_view.alist(request, *args, **kwargs)
+        )
+
+
+class AsyncOfferRetrieveView(AsyncReadView):
+    """
+    Async GET for /offers/<id>/ under ASGI.
+    """
+    sync_view_class = OfferRetrieveUpdateDestroyView
+
+    async def aget(self, request, *args, **kwargs):
+        key = await sync_to_async(offer_cache.detail_key)(request, kwargs["id"])
+        return await offer_cache.acached_response(
+            request, key, lambda: self.api_view.aretrieve(request, *args, **kwargs)
+        )
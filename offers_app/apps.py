@@ -1,6 +1,18 @@
 from django.apps import AppConfig
+from django.db.models.signals import post_migrate
+
+
+def _ensure_search_triggers(sender, using, **kwargs):
+    from .search import ensure_sqlite_triggers
+
+    ensure_sqlite_triggers(using)
 
 
 class OffersConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'offers_app'
+
+    def ready(self):
+        from . import signals  # noqa: F401
+
+        post_migrate.connect(_ensure_search_triggers, sender=self)
@@ -0,0 +1,43 @@
+from django.core.management.base import BaseCommand
+from django.db.models import Min
+
+from offers_app.models import Offer
+
+BATCH_SIZE = 500
+
+
+class Command(BaseCommand):
+    help = "Backfill/repair the denormalized Offer.min_price and Offer.min_delivery_time columns."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report offers with drifted minima, do not write anything.",
+        )
+
+    def handle(self, *args, **opts):
+        rows = Offer.objects.order_by().annotate(
+            actual_min_price=Min("details__price"),
+            actual_min_delivery_time=Min("details__delivery_time_in_days"),
+        ).values_list(
+            "id",
+            "min_price",
+            "actual_min_price",
+            "min_delivery_time",
+            "actual_min_delivery_time",
+        )
+        drifted = [
+            offer_id
+            for offer_id, price, actual_price, days, actual_days in rows.iterator()
+            if price != actual_price or days != actual_days
+        ]
+        self.stdout.write(f"{len(drifted)} offer(s) with drifted minima.")
+        if opts["dry_run"] or not drifted:
+            return
+
+        updated = 0
+        for start in range(0, len(drifted), BATCH_SIZE):
+            batch = drifted[start:start + BATCH_SIZE]
+            updated += Offer.objects.filter(pk__in=batch).refresh_minimums()
+        self.stdout.write(self.style.SUCCESS(f"Repaired minima for {updated} offer(s)."))
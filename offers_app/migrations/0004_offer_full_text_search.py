@@ -0,0 +1,74 @@
+from django.db import migrations
+
+POSTGRES_FORWARD = [
+    """
+    ALTER TABLE offers_app_offer ADD COLUMN search_vector tsvector
+    GENERATED ALWAYS AS (
+        setweight(to_tsvector('simple', coalesce(title, '')), 'A') ||
+        setweight(to_tsvector('simple', coalesce(description, '')), 'B')
+    ) STORED
+    """,
+    "CREATE INDEX offer_search_vector_idx ON offers_app_offer USING GIN (search_vector)",
+]
+POSTGRES_BACKWARD = [
+    "DROP INDEX IF EXISTS offer_search_vector_idx",
+    "ALTER TABLE offers_app_offer DROP COLUMN IF EXISTS search_vector",
+]
+
+SQLITE_FORWARD = [
+    """
+    CREATE VIRTUAL TABLE offers_app_offer_fts USING fts5(
+        title, description,
+        content='offers_app_offer', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    )
+    """,
+    """
+    CREATE TRIGGER offers_app_offer_fts_ai AFTER INSERT ON offers_app_offer BEGIN
+        INSERT INTO offers_app_offer_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    """
+    CREATE TRIGGER offers_app_offer_fts_ad AFTER DELETE ON offers_app_offer BEGIN
+        INSERT INTO offers_app_offer_fts(offers_app_offer_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+    END
+    """,
+    """
+    CREATE TRIGGER offers_app_offer_fts_au AFTER UPDATE OF title, description ON offers_app_offer BEGIN
+        INSERT INTO offers_app_offer_fts(offers_app_offer_fts, rowid, title, description)
+        VALUES ('delete', old.id, old.title, old.description);
+        INSERT INTO offers_app_offer_fts(rowid, title, description)
+        VALUES (new.id, new.title, new.description);
+    END
+    """,
+    "INSERT INTO offers_app_offer_fts(offers_app_offer_fts) VALUES ('rebuild')",
+]
+SQLITE_BACKWARD = [
+    "DROP TRIGGER IF EXISTS offers_app_offer_fts_ai",
+    "DROP TRIGGER IF EXISTS offers_app_offer_fts_ad",
+    "DROP TRIGGER IF EXISTS offers_app_offer_fts_au",
+    "DROP TABLE IF EXISTS offers_app_offer_fts",
+]
+
+
+def _run(statements_by_vendor):
+    def run(apps, schema_editor):
+        for sql in statements_by_vendor.get(schema_editor.connection.vendor, []):
+            schema_editor.execute(sql)
+    return run
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('offers_app', '0003_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            _run({"postgresql": POSTGRES_FORWARD, "sqlite": SQLITE_FORWARD}),
+            _run({"postgresql": POSTGRES_BACKWARD, "sqlite": SQLITE_BACKWARD}),
+        ),
+    ]
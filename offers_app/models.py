@@ -1,7 +1,36 @@
 from django.conf import settings
 from django.db import models
+from django.db.models import Min, OuterRef, Subquery
+from django.db.models.functions import Now
 
-class Offer(models.Model):
+from core.models import LoadedValuesMixin
+from media_app.storage import blob_storage
+
+
+class OfferQuerySet(models.QuerySet):
+    """
+    QuerySet for offers with helpers to maintain the denormalized detail minima.
+    """
+    def refresh_minimums(self, touch=False):
+        """
+        Recomputes min_price and min_delivery_time from the offer details
+        with a single UPDATE and returns the number of offers touched.
+        With touch=True, updated_at is bumped as well, since a detail change
+        changes the offer's representation.
+        """
+        details = OfferDetail.objects.filter(offer=OuterRef("pk")).order_by().values("offer")
+        values = {
+            "min_price": Subquery(details.annotate(value=Min("price")).values("value")),
+            "min_delivery_time": Subquery(
+                details.annotate(value=Min("delivery_time_in_days")).values("value")
+            ),
+        }
+        if touch:
+            values["updated_at"] = Now()
+        return self.update(**values)
+
+
+class Offer(LoadedValuesMixin, models.Model):
     """
     Represents an offer created by a business user.
     """
@@ -9,18 +38,43 @@ class Offer(models.Model):
         settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="offers"
     )
     title = models.CharField(max_length=100)
-    image = models.ImageField(upload_to="offer_images/", null=True, blank=True)
+    image = models.ImageField(upload_to="offer_images/", storage=blob_storage, null=True, blank=True)
+    image_width = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_height = models.PositiveIntegerField(null=True, blank=True, editable=False)
+    image_derivatives = models.JSONField(default=dict, blank=True, editable=False)
     description = models.TextField(blank=True)
+    min_price = models.DecimalField(
+        max_digits=10, decimal_places=2, null=True, blank=True, editable=False, db_index=True
+    )
+    min_delivery_time = models.PositiveIntegerField(
+        null=True, blank=True, editable=False, db_index=True
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = OfferQuerySet.as_manager()
+
     def __str__(self):
         return f"{self.title} - {self.user.username}"
 
+    def refresh_minimums(self, touch=True):
+        """
+        Recomputes the stored detail minima and reloads them on this instance.
+        Like the signal path, it bumps updated_at unless touch=False, so ETags
+        and caches keyed on it see the change.
+        """
+        Offer.objects.filter(pk=self.pk).refresh_minimums(touch=touch)
+        self.refresh_from_db(fields=["min_price", "min_delivery_time", "updated_at"])
+
     class Meta:
         ordering = ["-created_at"]
         verbose_name = "Offer"
         verbose_name_plural = "Offers"
+        indexes = [
+            models.Index(fields=["-created_at"], name="offer_created_idx"),
+            models.Index(fields=["-updated_at"], name="offer_updated_idx"),
+            models.Index(fields=["user", "-created_at"], name="offer_user_created_idx"),
+        ]
 
 
 class OfferDetail(models.Model):
@@ -48,3 +102,9 @@ class OfferDetail(models.Model):
         ordering = ["price"]
         verbose_name = "Offer Detail"
         verbose_name_plural = "Offer Details"
+        indexes = [
+            models.Index(fields=["offer", "price"], name="offerdetail_offer_price_idx"),
+            models.Index(
+                fields=["offer", "delivery_time_in_days"], name="offerdetail_offer_days_idx"
+            ),
+        ]
@@ -0,0 +1,106 @@
+"""
+Full-text search for offers behind the ?search= parameter.
+
+Postgres: generated, weighted ``search_vector`` tsvector column with a GIN index.
+SQLite: FTS5 external-content table ``offers_app_offer_fts`` kept in sync by triggers.
+Both are created by migration 0004; other backends fall back to ILIKE via DRF's SearchFilter.
+"""
+import re
+
+from django.db import connections
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "offers_app_offer_fts"
+MAX_TOKENS = 8
+
+SQLITE_TRIGGERS = {
+    f"{FTS_TABLE}_ai": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON offers_app_offer BEGIN
+            INSERT INTO {FTS_TABLE}(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+    """,
+    f"{FTS_TABLE}_ad": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON offers_app_offer BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+        END
+    """,
+    f"{FTS_TABLE}_au": f"""
+        CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF title, description ON offers_app_offer BEGIN
+            INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, title, description)
+            VALUES ('delete', old.id, old.title, old.description);
+            INSERT INTO {FTS_TABLE}(rowid, title, description)
+            VALUES (new.id, new.title, new.description);
+        END
+    """,
+}
+
+
+def is_supported(using):
+    return connections[using].vendor in ("postgresql", "sqlite")
+
+
+def tokenize(terms):
+    """
+    Splits DRF search terms into plain word tokens, dropping any query syntax.
+    """
+    return re.findall(r"\w+", " ".join(terms))[:MAX_TOKENS]
+
+
+def search_offers(queryset, terms, with_rank=False):
+    """
+    Restricts an offer queryset to full-text matches of all tokens (prefix matching).
+    With with_rank=True a ``search_rank`` annotation is added (higher is more relevant).
+    """
+    tokens = tokenize(terms)
+    if not tokens:
+        return queryset
+
+    if connections[queryset.db].vendor == "postgresql":
+        query = " & ".join(f"{token}:*" for token in tokens)
+        queryset = queryset.filter(
+            pk__in=RawSQL(
+                "SELECT id FROM offers_app_offer WHERE search_vector @@ to_tsquery('simple', %s)",
+                (query,),
+            )
+        )
+        rank = RawSQL(
+            "ts_rank(offers_app_offer.search_vector, to_tsquery('simple', %s))", (query,)
+        )
+    else:
+        query = " ".join(f'"{token}"*' for token in tokens)
+        queryset = queryset.filter(
+            pk__in=RawSQL(f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (query,))
+        )
+        # bm25() is lower-is-better; title matches weigh ten times the description.
+        rank = RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = offers_app_offer.id",
+            (query,),
+        )
+
+    if with_rank:
+        queryset = queryset.annotate(search_rank=rank)
+    return queryset
+
+
+def ensure_sqlite_triggers(using):
+    """
+    Re-creates the FTS sync triggers if a table rebuild dropped them, then reindexes.
+    SQLite migrations that remake offers_app_offer silently drop its triggers.
+    """
+    connection = connections[using]
+    if connection.vendor != "sqlite":
+        return
+    with connection.cursor() as cursor:
+        cursor.execute(
+            "SELECT name FROM sqlite_master WHERE type IN ('table', 'trigger') AND name LIKE %s",
+            (f"{FTS_TABLE}%",),
+        )
+        existing = {row[0] for row in cursor.fetchall()}
+        if FTS_TABLE not in existing or set(SQLITE_TRIGGERS) <= existing:
+            return
+        for sql in SQLITE_TRIGGERS.values():
+            cursor.execute(sql)
+        cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
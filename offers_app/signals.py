@@ -0,0 +1,70 @@
+from contextlib import contextmanager
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from django.utils import timezone
+
+from core.images import refresh_image_derivatives
+from offers_app.api.cache import offer_cache
+from offers_app.models import Offer, OfferDetail
+
+
+_bulk_detail_writes = ContextVar("bulk_detail_writes", default=False)
+
+
+@contextmanager
+def bulk_detail_writes(offer):
+    """
+    Suspends the per-row detail receiver while the details of one offer are written
+    in bulk, then refreshes the offer's minima and response cache once on exit.
+    """
+    token = _bulk_detail_writes.set(True)
+    try:
+        yield
+    finally:
+        _bulk_detail_writes.reset(token)
+    Offer.objects.filter(pk=offer.pk).refresh_minimums(touch=True)
+    offer_cache.invalidate(offer.pk)
+
+
+@receiver(post_save, sender=OfferDetail)
+@receiver(post_delete, sender=OfferDetail)
+def refresh_offer_minimums(sender, instance, **kwargs):
+    """
+    Keeps Offer.min_price, Offer.min_delivery_time and Offer.updated_at in sync
+    with every detail write.
+    """
+    if _bulk_detail_writes.get():
+        return
+    Offer.objects.filter(pk=instance.offer_id).refresh_minimums(touch=True)
+    offer_cache.invalidate(instance.offer_id)
+
+
+@receiver(post_save, sender=Offer)
+def build_offer_image_derivatives(sender, instance, raw=False, **kwargs):
+    """
+    Builds the image derivatives of a new or replaced upload. Registered before the
+    cache receiver, so the invalidation below also covers the new variant URLs;
+    updated_at moves as well, since the variants are part of the representation.
+    """
+    if raw or not settings.IMAGE_DERIVATIVES["ON_SAVE"]:
+        return
+    refresh_image_derivatives(instance, "image", updated_at=timezone.now())
+
+
+@receiver(post_save, sender=Offer)
+@receiver(post_delete, sender=Offer)
+def invalidate_offer_cache(sender, instance, **kwargs):
+    offer_cache.invalidate(instance.pk)
+
+
+@receiver(post_save, sender=settings.AUTH_USER_MODEL)
+def invalidate_offer_lists_on_user_change(sender, instance, update_fields=None, **kwargs):
+    """
+    Offer lists embed the owner's names; login only touches last_login.
+    """
+    if update_fields and set(update_fields) <= {"last_login"}:
+        return
+    offer_cache.invalidate()
@@ -1,12 +1,23 @@
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.cache import caches
+from django.core.management import call_command
+from django.db import DatabaseError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.urls import reverse
 from rest_framework.test import APIClient
 from django.contrib.auth.models import User
 from accounts_app.models import Profile
 from offers_app.models import Offer, OfferDetail
+from offers_app.api.facets import offer_facets
 
 class OffersTests(TestCase):
     def setUp(self):
+        caches["default"].clear()
         self.client = APIClient()
         # User/Profiles: business und customer
         self.business = User.objects.create_user(username="biz", password="pw", email="b@t.de")
@@ -135,3 +146,331 @@ class OffersTests(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 401)
         self.assertIn("detail", response.data)
+
+    def test_minimums_are_stored_on_offer(self):
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 100)
+        self.assertEqual(self.offer.min_delivery_time, 3)
+
+    def test_minimums_follow_detail_writes(self):
+        self.detail1.price = 250
+        self.detail1.save()
+        self.detail2.delete()
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 250)
+        self.assertEqual(self.offer.min_delivery_time, 3)
+
+    def test_manual_minimums_refresh_bumps_updated_at(self):
+        stale = self.offer.updated_at - timedelta(days=1)
+        Offer.objects.filter(pk=self.offer.pk).update(min_price=None, updated_at=stale)
+        self.offer.refresh_minimums()
+        self.assertEqual(self.offer.min_price, 100)
+        self.assertGreater(self.offer.updated_at, stale)
+        Offer.objects.filter(pk=self.offer.pk).update(min_price=None, updated_at=stale)
+        self.offer.refresh_minimums(touch=False)
+        self.assertEqual((self.offer.min_price, self.offer.updated_at), (100, stale))
+
+    def test_patch_offer_details_updates_minimums(self):
+        self.switch_to_business()
+        url = reverse("offer-detail", args=[self.offer.id])
+        data = {"details": [
+            {"id": self.detail1.id, "title": "Basic", "revisions": 1, "delivery_time_in_days": 9, "price": 50, "features": ["A"], "offer_type": "basic"},
+            {"id": self.detail2.id, "title": "Standard", "revisions": 2, "delivery_time_in_days": 5, "price": 200, "features": ["B"], "offer_type": "standard"},
+        ]}
+        response = self.client.patch(url, data, format="json")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["min_price"], 50)
+        self.assertEqual(response.data["min_delivery_time"], 5)
+
+    def test_list_offers_filter_and_order_by_min_price(self):
+        other = Offer.objects.create(user=self.business, title="Cheap", description="desc")
+        OfferDetail.objects.create(offer=other, title="Basic", revisions=1, delivery_time_in_days=1, price=20, features=["A"], offer_type="basic")
+        self.switch_to_anon()
+        response = self.client.get(reverse("offers") + "?ordering=min_price")
+        self.assertEqual([o["id"] for o in response.data["results"]], [other.id, self.offer.id])
+        response = self.client.get(reverse("offers") + "?min_price=50&max_delivery_time=3")
+        self.assertEqual([o["id"] for o in response.data["results"]], [self.offer.id])
+
+    def test_combined_offer_filters_do_not_join_details(self):
+        self._create_offers(3)
+        self.switch_to_anon()
+        url = reverse("offers") + f"?creator_id={self.business.id}&min_price=5&max_delivery_time=5&page_size=2"
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url)
+        self.assertEqual(response.data["count"], Offer.objects.count())
+        ids = [o["id"] for o in response.data["results"]]
+        ids += [o["id"] for o in self.client.get(response.data["next"]).data["results"]]
+        self.assertEqual(len(ids), len(set(ids)))
+        for query in queries.captured_queries:
+            self.assertNotIn('JOIN "offers_app_offerdetail"', query["sql"])
+            self.assertNotIn("DISTINCT", query["sql"])
+
+    def test_offer_facets_aggregated_and_cached(self):
+        self._create_offers(2)
+        other = User.objects.create_user(username="biz2", password="pw")
+        Profile.objects.create(user=other, type="business")
+        slow = Offer.objects.create(user=other, title="Video", description="desc")
+        OfferDetail.objects.create(offer=slow, title="Basic", revisions=1, delivery_time_in_days=20, price=600, features=["A"], offer_type="basic")
+        self.switch_to_anon()
+        url = reverse("offer-facets")
+
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["count"], 4)
+        self.assertEqual([b["count"] for b in response.data["price"]], [2, 0, 1, 0, 1, 0])
+        self.assertEqual(response.data["price"][-1], {"from": 1000, "to": None, "count": 0})
+        self.assertEqual([b["count"] for b in response.data["delivery_time"]], [0, 3, 0, 0, 1])
+        self.assertEqual(response.data["offer_type"], {"basic": 4, "standard": 3, "premium": 3})
+        self.assertEqual(response.data["creator"], [
+            {"creator_id": self.business.id, "count": 3}, {"creator_id": other.id, "count": 1},
+        ])
+
+        with self.assertNumQueries(0):
+            response = self.client.get(url + "?ordering=min_price&page=2")
+        self.assertEqual(response["X-Cache"], "HIT")
+
+        response = self.client.get(url + "?search=Logo&max_delivery_time=3")
+        self.assertEqual(response.data["count"], 1)
+        self.assertEqual(response.data["creator"], [{"creator_id": self.business.id, "count": 1}])
+
+        self.offer.delete()
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["count"], 3)
+
+        facets = offer_facets(Offer.objects.all(), top_creators=1)
+        self.assertEqual(facets["count"], 3)
+        self.assertEqual(facets["creator"], [{"creator_id": self.business.id, "count": 2}])
+
+    def test_offer_facets_are_documented_in_the_schema(self):
+        with self.assertNoLogs("drf_yasg", "WARNING"):
+            response = self.client.get(reverse("schema-swagger-ui") + "?format=openapi")
+        self.assertEqual(response.status_code, 200)
+        schema = json.loads(response.content)
+        operation = schema["paths"]["/offers/facets/"]["get"]
+        self.assertIn("max_delivery_time", [param["name"] for param in operation["parameters"]])
+        facets = operation["responses"]["200"]["schema"]
+        if "$ref" in facets:
+            facets = schema["definitions"][facets["$ref"].rsplit("/", 1)[-1]]
+        self.assertEqual(set(facets["properties"]), {"count", "price", "delivery_time", "offer_type", "creator"})
+
+    def test_refresh_offer_minimums_command_repairs_drift(self):
+        Offer.objects.filter(pk=self.offer.pk).update(min_price=None, min_delivery_time=None)
+        out = StringIO()
+        call_command("refresh_offer_minimums", stdout=out)
+        self.assertIn("1 offer(s) with drifted minima", out.getvalue())
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.min_price, 100)
+        self.assertEqual(self.offer.min_delivery_time, 3)
+
+    def _create_offers(self, count):
+        for i in range(count):
+            offer = Offer.objects.create(user=self.business, title=f"Offer {i}", description="desc")
+            for price, offer_type in ((10, "basic"), (20, "standard"), (30, "premium")):
+                OfferDetail.objects.create(offer=offer, title=offer_type, revisions=1, delivery_time_in_days=2, price=price, features=["A"], offer_type=offer_type)
+
+    def test_list_offers_query_count_is_constant(self):
+        self._create_offers(10)
+        self.switch_to_anon()
+        url = reverse("offers")
+        for page_size in (1, 10):
+            with self.assertNumQueries(3):
+                response = self.client.get(url + f"?page_size={page_size}")
+            self.assertEqual(len(response.data["results"]), page_size)
+
+    def test_retrieve_offer_query_count(self):
+        self.switch_to_business()
+        url = reverse("offer-detail", args=[self.offer.id])
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(len(response.data["details"]), 3)
+
+    def test_list_offers_cursor_pagination(self):
+        self._create_offers(4)
+        self.switch_to_anon()
+        url = reverse("offers") + "?cursor=&page_size=2"
+        seen = []
+        while url:
+            with self.assertNumQueries(2):
+                response = self.client.get(url)
+            self.assertNotIn("count", response.data)
+            seen += [offer["id"] for offer in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(seen, list(Offer.objects.order_by("-created_at", "-id").values_list("id", flat=True)))
+
+    def test_cursor_pagination_rejects_nullable_ordering(self):
+        self._create_offers(2)
+        Offer.objects.create(user=self.business, title="Draft", description="desc")
+        self.switch_to_anon()
+        for ordering in ("min_price", "-min_price"):
+            response = self.client.get(reverse("offers") + f"?cursor=&page_size=2&ordering={ordering}")
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("ordering", response.data)
+        response = self.client.get(reverse("offers") + "?page_size=5&ordering=-min_price")
+        self.assertEqual(response.data["count"], 4)
+
+    def test_cursor_pagination_rejects_relevance_ordering(self):
+        self.switch_to_anon()
+        for query in ("?search=logo&ordering=relevance&cursor=", "?ordering=relevance&cursor="):
+            response = self.client.get(reverse("offers") + query)
+            self.assertEqual(response.status_code, 400)
+            self.assertIn("ordering", response.data)
+        response = self.client.get(reverse("offers") + "?search=logo&ordering=relevance")
+        self.assertEqual([o["id"] for o in response.data["results"]], [self.offer.id])
+
+    def test_cursor_pagination_splits_ties_by_pk(self):
+        self._create_offers(4)
+        Offer.objects.update(updated_at=self.offer.updated_at)
+        self.switch_to_anon()
+        url = reverse("offers") + "?cursor=&page_size=2&ordering=updated_at"
+        seen, pages = [], []
+        while url:
+            response = self.client.get(url)
+            pages.append(response)
+            seen += [offer["id"] for offer in response.data["results"]]
+            url = response.data["next"]
+        self.assertEqual(seen, sorted(Offer.objects.values_list("id", flat=True)))
+        previous = self.client.get(pages[-1].data["previous"])
+        self.assertEqual([offer["id"] for offer in previous.data["results"]], seen[2:4])
+
+    def test_search_uses_full_text_index(self):
+        other = Offer.objects.create(user=self.business, title="Website", description="Inklusive Logo Paket")
+        self.switch_to_anon()
+        response = self.client.get(reverse("offers") + "?search=Log")
+        self.assertEqual({o["id"] for o in response.data["results"]}, {self.offer.id, other.id})
+        response = self.client.get(reverse("offers") + "?search=logo&ordering=relevance")
+        self.assertEqual([o["id"] for o in response.data["results"]], [self.offer.id, other.id])
+        response = self.client.get(reverse("offers") + "?search=logo design")
+        self.assertEqual([o["id"] for o in response.data["results"]], [self.offer.id])
+
+    def test_search_index_follows_offer_updates(self):
+        self.offer.title = "Branding"
+        self.offer.save()
+        self.switch_to_anon()
+        response = self.client.get(reverse("offers") + "?search=Logo")
+        self.assertEqual(response.data["results"], [])
+        response = self.client.get(reverse("offers") + "?search=brand")
+        self.assertEqual([o["id"] for o in response.data["results"]], [self.offer.id])
+
+    def test_list_is_served_from_cache_until_an_offer_changes(self):
+        self.switch_to_anon()
+        url = reverse("offers") + "?page_size=5"
+        first = self.client.get(url)
+        self.assertEqual(first["X-Cache"], "MISS")
+        with self.assertNumQueries(0):
+            second = self.client.get(url)
+        self.assertEqual(second["X-Cache"], "HIT")
+        self.assertEqual(second.data, first.data)
+
+        self.detail1.price = 50
+        self.detail1.save()
+        third = self.client.get(url)
+        self.assertEqual(third["X-Cache"], "MISS")
+        self.assertEqual(third.data["results"][0]["min_price"], 50)
+
+    def test_cache_key_ignores_unknown_params_and_param_order(self):
+        self.switch_to_anon()
+        self.client.get(reverse("offers") + "?page_size=5&ordering=min_price")
+        response = self.client.get(reverse("offers") + "?ordering=min_price&utm_source=x&page_size=5")
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_retrieve_cache_is_invalidated_by_owner_rename(self):
+        self.switch_to_business()
+        url = reverse("offer-detail", args=[self.offer.id])
+        self.client.get(url)
+        self.assertEqual(self.client.get(url)["X-Cache"], "HIT")
+        self.client.patch(url, {"title": "Renamed"}, format="json")
+        response = self.client.get(url)
+        self.assertEqual(response["X-Cache"], "MISS")
+        self.assertEqual(response.data["title"], "Renamed")
+
+        self.client.get(reverse("offers"))
+        self.business.first_name = "Max"
+        self.business.save()
+        self.assertEqual(self.client.get(reverse("offers"))["X-Cache"], "MISS")
+
+    def test_retrieve_cache_still_requires_authentication(self):
+        self.switch_to_business()
+        url = reverse("offer-detail", args=[self.offer.id])
+        self.client.get(url)
+        self.switch_to_anon()
+        self.assertEqual(self.client.get(url).status_code, 401)
+
+    def test_offer_detail_etag_follows_detail_writes(self):
+        self.switch_to_business()
+        url = reverse("offer-detail", args=[self.offer.id])
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.detail2.price = 250
+        self.detail2.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response["ETag"], etag)
+
+    def test_offer_list_cache_hit_answers_conditional_get(self):
+        self.switch_to_anon()
+        url = reverse("offers")
+        etag = self.client.get(url)["ETag"]
+        with self.assertNumQueries(0):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["X-Cache"], "HIT")
+
+    def test_offer_list_etag_follows_owner_rename(self):
+        self.switch_to_anon()
+        for url in (reverse("offers"), reverse("offers") + "?cursor="):
+            etag = self.client.get(url)["ETag"]
+            self.business.first_name = f"Max {url}"
+            self.business.save()
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+            self.assertEqual(response.status_code, 200)
+            self.assertNotEqual(response["ETag"], etag)
+            self.assertEqual(response.data["results"][0]["user_details"]["first_name"], f"Max {url}")
+
+    def _offer_payload(self, tiers):
+        return {
+            "title": "Bulk",
+            "description": "desc",
+            "details": [
+                {"title": f"Tier {i}", "revisions": 1, "delivery_time_in_days": i + 1, "price": 10 * (i + 1), "features": ["A"], "offer_type": "basic"}
+                for i in range(tiers)
+            ],
+        }
+
+    def test_offer_create_and_update_issue_constant_queries(self):
+        self.switch_to_business()
+        counts = {}
+        for tiers in (3, 6):
+            with CaptureQueriesContext(connection) as create_queries:
+                response = self.client.post(reverse("offers"), self._offer_payload(tiers), format="json")
+            self.assertEqual(response.status_code, 201)
+            self.assertEqual(len(response.data["details"]), tiers)
+            self.assertEqual(response.data["min_price"], 10)
+
+            offer = Offer.objects.get(pk=response.data["id"])
+            kept = list(offer.details.order_by("id"))[1:]
+            details = [
+                {"id": detail.id, "title": detail.title, "revisions": 2, "delivery_time_in_days": 9, "price": 99, "features": ["B"], "offer_type": "standard"}
+                for detail in kept
+            ] + [{"title": "New", "revisions": 1, "delivery_time_in_days": 4, "price": 40, "features": [], "offer_type": "premium"}]
+            url = reverse("offer-detail", args=[offer.id])
+            with CaptureQueriesContext(connection) as update_queries:
+                response = self.client.patch(url, {"details": details}, format="json")
+            self.assertEqual(response.status_code, 200)
+            self.assertEqual(offer.details.count(), tiers)
+            self.assertEqual(response.data["min_price"], 40)
+            counts[tiers] = (len(create_queries), len(update_queries))
+        self.assertEqual(counts[3], counts[6])
+
+    def test_failed_detail_write_rolls_back_offer(self):
+        self.switch_to_business()
+        url = reverse("offer-detail", args=[self.offer.id])
+        details = [{"id": self.detail1.id, "title": "Basic", "revisions": 1, "delivery_time_in_days": 1, "price": 1, "features": ["A"], "offer_type": "basic"}]
+        with patch.object(OfferDetail.objects, "bulk_update", side_effect=DatabaseError("boom")):
+            with self.assertRaises(DatabaseError):
+                self.client.patch(url, {"title": "Half", "details": details}, format="json")
+        self.offer.refresh_from_db()
+        self.assertEqual(self.offer.title, "Logo Design")
+        self.assertEqual(self.offer.details.count(), 3)
+        self.assertEqual(self.offer.min_price, 100)
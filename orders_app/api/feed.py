@@ -0,0 +1,208 @@
+"""
+Order list ("feed") of the current user as a UNION ALL of two index-backed branches.
+
+A user's orders are those placed as customer plus those received as business. As one
+query with customer_user = X OR business_user = X the database can use neither the
+(customer_user, -created_at) nor the (business_user, -created_at) index for the
+ordering and ends up sorting every matching row. Each branch of the union is a range
+scan on one of those indexes; where the backend allows ORDER BY/LIMIT inside compound
+statements (PostgreSQL), each branch is also cut to the rows the page can reach, so
+the merge touches at most 2 x page_size rows.
+"""
+import base64
+import binascii
+from collections import OrderedDict
+from datetime import datetime
+
+from django.db import connection
+from django.db.models import Count, Max, Q, Value
+from django.utils.functional import cached_property
+from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+from core.conditional import make_etag, request_variant
+from core.pagination import BoundedListPagination
+from orders_app.models import Order
+
+ROLES = ("customer", "business")
+FEED_ORDERING = ("-created_at", "-id")
+
+
+class OrderFeedParamsSerializer(serializers.Serializer):
+    """
+    Query parameters of the order list: ?as=customer|business, ?status=,
+    ?created_after= (inclusive) and ?created_before= (exclusive).
+    """
+    role = serializers.ChoiceField(choices=ROLES, required=False)
+    status = serializers.ChoiceField(choices=Order.STATUS_CHOICES, required=False)
+    created_after = serializers.DateTimeField(required=False)
+    created_before = serializers.DateTimeField(required=False)
+
+    def get_fields(self):
+        # "as" is a keyword, so the field is declared as role and renamed here.
+        fields = super().get_fields()
+        fields["as"] = fields.pop("role")
+        fields["as"].source = "role"
+        return fields
+
+
+class OrderFeed:
+    """
+    The orders of user, optionally restricted to one role, a status and a creation range.
+    Orders in which the user is both customer and business are only returned by the
+    customer branch, so the union never contains duplicates.
+    """
+    def __init__(self, user, role=None, status=None, created_after=None, created_before=None):
+        conditions = Q()
+        if status:
+            conditions &= Q(status=status)
+        if created_after:
+            conditions &= Q(created_at__gte=created_after)
+        if created_before:
+            conditions &= Q(created_at__lt=created_before)
+
+        self.branches = []
+        if role in (None, "customer"):
+            self.branches.append(Order.objects.filter(conditions, customer_user=user))
+        if role in (None, "business"):
+            business = Order.objects.filter(conditions, business_user=user)
+            if role is None:
+                business = business.exclude(customer_user=user)
+            self.branches.append(business)
+
+    @classmethod
+    def from_request(cls, request):
+        params = OrderFeedParamsSerializer(data=request.query_params)
+        params.is_valid(raise_exception=True)
+        return cls(request.user, **params.validated_data)
+
+    def queryset(self, position=None, reverse=False, limit=None):
+        """
+        The union ordered newest first (oldest first with reverse), starting after the
+        keyset position (created_at, id) if given.
+        """
+        ordering = tuple(field.lstrip("-") for field in FEED_ORDERING) if reverse else FEED_ORDERING
+        branches = self.branches
+        if position is not None:
+            created_at, pk = position
+            lookup = "gt" if reverse else "lt"
+            after = Q(**{f"created_at__{lookup}": created_at}) | Q(created_at=created_at, **{f"id__{lookup}": pk})
+            branches = [branch.filter(after) for branch in branches]
+        if limit is not None and connection.features.supports_slicing_ordering_in_compound:
+            branches = [branch.order_by(*ordering)[:limit] for branch in branches]
+        else:
+            branches = [branch.order_by() for branch in branches]
+        if len(branches) == 1:
+            return branches[0].order_by(*ordering)
+        return branches[0].union(*branches[1:], all=True).order_by(*ordering)
+
+    def stats(self):
+        """
+        max(updated_at) and the row count over all branches, as one UNION ALL of
+        per-branch aggregates (aggregate() is not supported on a union).
+        """
+        rows = [
+            branch.order_by().values(feed=Value(1)).annotate(
+                last_modified=Max("updated_at"), count=Count("pk")
+            ).values("last_modified", "count")
+            for branch in self.branches
+        ]
+        if len(rows) > 1:
+            rows = rows[0].union(*rows[1:], all=True)
+        else:
+            rows = rows[0]
+        rows = list(rows)
+        return {
+            "last_modified": max((row["last_modified"] for row in rows if row["last_modified"]), default=None),
+            "count": sum(row["count"] for row in rows),
+        }
+
+
+def feed_validators(feed, request):
+    """
+    list_validators() for an OrderFeed.
+    """
+    stats = feed.stats()
+    etag = make_etag(request_variant(request), stats["last_modified"], stats["count"])
+    return etag, stats["last_modified"], stats
+
+
+class OrderFeedPagination(BoundedListPagination):
+    """
+    BoundedListPagination for the order feed. The plain list reads at most page_size + 1
+    rows per branch; ?cursor= pages are keyset pages on (created_at, id) whose position
+    predicate is applied inside each branch of the union.
+    """
+    invalid_cursor_message = "Invalid cursor"
+    keyset = False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        self.keyset = self.cursor_query_param in params
+        if self.keyset:
+            self.plain_list = False
+            self.cursor_paginator = None
+            return self.paginate_feed(view.feed, request)
+        if self.page_query_param not in params:
+            # One row beyond the page tells the plain list whether it was cut.
+            queryset = view.feed.queryset(limit=self.get_page_size(request) + 1)
+        return super().paginate_queryset(queryset, request, view)
+
+    def paginate_feed(self, feed, request):
+        self.request = request
+        page_size = self.get_page_size(request)
+        position, reverse = self.decode_cursor(request)
+        rows = list(feed.queryset(position, reverse, limit=page_size + 1)[: page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if reverse:
+            rows.reverse()
+        has_next = has_more if not reverse else True
+        has_previous = has_more if reverse else position is not None
+        self.next_position = (rows[-1].created_at, rows[-1].pk) if rows and has_next else None
+        self.previous_position = (rows[0].created_at, rows[0].pk) if rows and has_previous else None
+        return rows
+
+    def decode_cursor(self, request):
+        """
+        Returns ((created_at, id), reverse), or (None, False) for the first page.
+        """
+        encoded = request.query_params.get(self.cursor_query_param)
+        if not encoded:
+            return None, False
+        try:
+            created_at, pk, reverse = base64.urlsafe_b64decode(encoded.encode()).decode().split("|")
+            return (datetime.fromisoformat(created_at), int(pk)), reverse == "1"
+        except (TypeError, ValueError, UnicodeDecodeError, binascii.Error):
+            raise NotFound(self.invalid_cursor_message)
+
+    def encode_cursor(self, position, reverse):
+        created_at, pk = position
+        token = f"{created_at.isoformat()}|{pk}|{int(reverse)}"
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, base64.urlsafe_b64encode(token.encode()).decode())
+
+    def get_paginated_response(self, data):
+        if not self.keyset:
+            return super().get_paginated_response(data)
+        return Response(OrderedDict([
+            ("next", self.encode_cursor(self.next_position, False) if self.next_position else None),
+            ("previous", self.encode_cursor(self.previous_position, True) if self.previous_position else None),
+            ("results", data),
+        ]))
+
+
+class OrderFeedMixin:
+    """
+    Serves GET of a list view from the OrderFeed of the requesting user.
+    """
+    pagination_class = OrderFeedPagination
+
+    @cached_property
+    def feed(self):
+        return OrderFeed.from_request(self.request)
+
+    def get_list_validators(self, queryset):
+        return feed_validators(self.feed, self.request)
@@ -1,5 +1,7 @@
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from accounts_app.api.permissions import get_profile_type
+
 
 class IsCustomerUser(BasePermission):
     """
@@ -7,11 +9,7 @@ class IsCustomerUser(BasePermission):
     Write permissions are only granted to authenticated users with profile type 'customer'.
     """
     def has_permission(self, request, view):
-        return request.method in SAFE_METHODS or (
-            request.user.is_authenticated
-            and hasattr(request.user, "profile")
-            and request.user.profile.type == "customer"
-        )
+        return request.method in SAFE_METHODS or get_profile_type(request.user) == "customer"
 
 
 class IsOrderOwnerOrReadOnly(BasePermission):
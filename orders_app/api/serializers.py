@@ -5,6 +5,7 @@ from rest_framework.exceptions import NotFound
 from accounts_app.models import Profile
 from offers_app.models import OfferDetail
 from orders_app.models import Order
+from orders_app.api.stats import PUBLIC_STATUSES
 
 User = get_user_model()
 
@@ -69,8 +70,8 @@ class OrderOutputSerializer(serializers.ModelSerializer):
     """
     Serializer for outputting order data, with user IDs for customer and business user.
     """
-    customer_user = serializers.IntegerField(source="customer_user.id", read_only=True)
-    business_user = serializers.IntegerField(source="business_user.id", read_only=True)
+    customer_user = serializers.IntegerField(source="customer_user_id", read_only=True)
+    business_user = serializers.IntegerField(source="business_user_id", read_only=True)
 
     class Meta:
         model = Order
@@ -87,4 +88,27 @@ class OrderOutputSerializer(serializers.ModelSerializer):
             "status",
             "created_at",
             "updated_at",
-        ]
\ No newline at end of file
+        ]
+
+class PublicOrderStatsSerializer(serializers.Serializer):
+    """
+    Serializer for the order statistics of a business user that any authenticated
+    user may read: the in-progress and completed counts.
+    """
+    business_user = serializers.IntegerField()
+    status_counts = serializers.SerializerMethodField()
+
+    def get_status_counts(self, stats):
+        return {status: stats["status_counts"][status] for status in PUBLIC_STATUSES}
+
+
+class OrderStatsSerializer(serializers.Serializer):
+    """
+    Serializer for the aggregated order statistics of a business user,
+    for the business user themselves and staff.
+    """
+    business_user = serializers.IntegerField()
+    status_counts = serializers.DictField(child=serializers.IntegerField())
+    total_count = serializers.IntegerField()
+    revenue = serializers.DecimalField(max_digits=12, decimal_places=2, coerce_to_string=False)
+    average_delivery_time = serializers.FloatField(allow_null=True)
@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.db.models import Avg, Count, Q, Sum
+
+from orders_app.models import Order
+
+User = get_user_model()
+
+MAX_BATCH_SIZE = 100
+STATUSES = [status for status, _ in Order.STATUS_CHOICES]
+# What the order-count and completed-order-count endpoints have always made public.
+PUBLIC_STATUSES = ("in_progress", "completed")
+
+
+def stats_rows(business_user_ids):
+    """
+    The grouped per-business query behind business_order_stats().
+    """
+    status_counts = {
+        f"count_{status}": Count("business_orders", filter=Q(business_orders__status=status))
+        for status in STATUSES
+    }
+    return (
+        User.objects.filter(pk__in=business_user_ids)
+        .order_by()
+        .annotate(
+            total_count=Count("business_orders"),
+            revenue=Sum("business_orders__price", filter=Q(business_orders__status="completed")),
+            average_delivery_time=Avg("business_orders__delivery_time_in_days"),
+            **status_counts,
+        )
+        .values("pk", "total_count", "revenue", "average_delivery_time", *status_counts)
+    )
+
+
+def can_view_full_stats(user, business_user_id):
+    """
+    Revenue, totals and delivery times are only for the business user and staff.
+    """
+    return user.pk == business_user_id or user.is_staff
+
+
+def _stats_from_row(row):
+    return {
+        "business_user": row["pk"],
+        "status_counts": {status: row[f"count_{status}"] for status in STATUSES},
+        "total_count": row["total_count"],
+        "revenue": row["revenue"] or 0,
+        "average_delivery_time": row["average_delivery_time"],
+    }
+
+
+def business_order_stats(business_user_ids):
+    """
+    Returns {business_user_id: stats} for the given users from a single grouped query.
+    Users that do not exist are missing from the result; users without orders get zeros.
+    Revenue is the sum of completed orders, the average delivery time covers all orders.
+    """
+    return {row["pk"]: _stats_from_row(row) for row in stats_rows(business_user_ids)}
+
+
+async def abusiness_order_stats(business_user_ids):
+    """
+    business_order_stats() through the async ORM.
+    """
+    return {row["pk"]: _stats_from_row(row) async for row in stats_rows(business_user_ids)}
@@ -1,10 +1,19 @@
 from django.urls import path
-from .views import CompletedOrderCountView, OrderCountView, OrderListCreateView, OrderRetrieveUpdateDestroyView
+from core.async_views import read_view
+from .views import (
+    AsyncCompletedOrderCountView,
+    AsyncOrderCountView,
+    OrderListCreateView,
+    OrderRetrieveUpdateDestroyView,
+    OrderStatsView,
+)
 
 urlpatterns = [
     path("orders/", OrderListCreateView.as_view(), name="order-list-create"),
     path("orders/<int:id>/", OrderRetrieveUpdateDestroyView.as_view(), name="order-detail"),
-    path("order-count/<int:business_user_id>/", OrderCountView.as_view(), name="order-count"),
-    path("completed-order-count/<int:business_user_id>/", CompletedOrderCountView.as_view(), name="completed-order-count"),
+    path("order-count/<int:business_user_id>/", read_view(AsyncOrderCountView), name="order-count"),
+    path("completed-order-count/<int:business_user_id>/", read_view(AsyncCompletedOrderCountView), name="completed-order-count"),
+    path("order-stats/", OrderStatsView.as_view(), name="order-stats-batch"),
+    path("order-stats/<int:business_user_id>/", OrderStatsView.as_view(), name="order-stats"),
 
 ]
@@ -1,5 +1,3 @@
-from django.contrib.auth import get_user_model
-from django.db.models import Q
 from rest_framework import status
 from rest_framework.generics import ListCreateAPIView, RetrieveUpdateDestroyAPIView
 from rest_framework.permissions import IsAuthenticated
@@ -7,24 +5,33 @@ from rest_framework.response import Response
 from rest_framework.views import APIView
 
 
+from core.async_views import AsyncReadView
+from core.conditional import ConditionalListMixin, ConditionalRetrieveMixin
 from offers_app.models import OfferDetail
 from orders_app.models import Order
+from .feed import OrderFeedMixin
 from .permissions import IsCustomerUser, IsOrderOwnerOrReadOnly
-from .serializers import OrderOutputSerializer, OrderSerializer, OrderCreateSerializer
-
-User = get_user_model()
-
-class OrderListCreateView(ListCreateAPIView):
+from .serializers import (
+    OrderCreateSerializer,
+    OrderOutputSerializer,
+    OrderSerializer,
+    OrderStatsSerializer,
+    PublicOrderStatsSerializer,
+)
+from .stats import MAX_BATCH_SIZE, abusiness_order_stats, business_order_stats, can_view_full_stats
+
+class OrderListCreateView(OrderFeedMixin, ConditionalListMixin, ListCreateAPIView):
     """
     API view to list all orders related to the current user or create a new order as a customer.
+    The list can be narrowed with ?as=customer|business, ?status=, ?created_after= and ?created_before=.
     """
     queryset = Order.objects.all()
     permission_classes = [IsAuthenticated, IsCustomerUser]
-    search_fields = ["title"]
 
     def get_queryset(self):
-        user = self.request.user
-        return Order.objects.filter(Q(customer_user=user) | Q(business_user=user))
+        if self.request.method == "POST":
+            return Order.objects.all()
+        return self.feed.queryset()
 
     def get_serializer_class(self):
         if self.request.method == "POST":
@@ -39,7 +46,7 @@ class OrderListCreateView(ListCreateAPIView):
         return Response(output_serializer.data, status=status.HTTP_201_CREATED)
 
 
-class OrderRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
+class OrderRetrieveUpdateDestroyView(ConditionalRetrieveMixin, RetrieveUpdateDestroyAPIView):
     """
     API view to retrieve, update, or delete a single order instance.
     """
@@ -49,21 +56,59 @@ class OrderRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
     lookup_field = "id"
 
 
-class OrderCountView(APIView):
+def business_user_not_found():
+    return Response({"error": "Business user not found."}, status=status.HTTP_404_NOT_FOUND)
+
+
+class OrderStatsView(APIView):
     """
-    API view to retrieve the count of in-progress orders for a specific business user.
+    API view to retrieve order statistics (counts per status, revenue, average delivery time)
+    for one business user, or for many at once via ?business_user_ids=1,2,3.
+    Other users than the business user and staff only get the in-progress and completed counts.
     """
     permission_classes = [IsAuthenticated]
 
-    def get(self, request, business_user_id):
-        if not User.objects.filter(id=business_user_id).exists():
+    def serialize(self, stats):
+        if can_view_full_stats(self.request.user, stats["business_user"]):
+            return OrderStatsSerializer(stats).data
+        return PublicOrderStatsSerializer(stats).data
+
+    def get(self, request, business_user_id=None):
+        if business_user_id is not None:
+            stats = business_order_stats([business_user_id]).get(business_user_id)
+            if stats is None:
+                return business_user_not_found()
+            return Response(self.serialize(stats), status=status.HTTP_200_OK)
+
+        raw_ids = request.query_params.get("business_user_ids", "")
+        try:
+            ids = list(dict.fromkeys(int(value) for value in raw_ids.split(",") if value.strip()))
+        except ValueError:
             return Response(
-                {"error": "Business user not found."}, status=status.HTTP_404_NOT_FOUND
+                {"error": "business_user_ids must be a comma-separated list of integers."},
+                status=status.HTTP_400_BAD_REQUEST,
             )
+        if not ids or len(ids) > MAX_BATCH_SIZE:
+            return Response(
+                {"error": f"Pass between 1 and {MAX_BATCH_SIZE} business_user_ids."},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        stats = business_order_stats(ids)
+        results = [self.serialize(stats[user_id]) for user_id in ids if user_id in stats]
+        return Response(results, status=status.HTTP_200_OK)
 
-        count = Order.objects.filter(
-            business_user__id=business_user_id, status="in_progress"
-        ).count()
+
+class OrderCountView(APIView):
+    """
+    API view to retrieve the count of in-progress orders for a specific business user.
+    """
+    permission_classes = [IsAuthenticated]
+
+    def get(self, request, business_user_id):
+        stats = business_order_stats([business_user_id]).get(business_user_id)
+        if stats is None:
+            return business_user_not_found()
+        count = stats["status_counts"]["in_progress"]
         return Response({"order_count": count}, status=status.HTTP_200_OK)
 
 
@@ -74,12 +119,36 @@ class CompletedOrderCountView(APIView):
     permission_classes = [IsAuthenticated]
 
     def get(self, request, business_user_id):
-        if not User.objects.filter(id=business_user_id).exists():
-            return Response(
-                {"error": "Business user not found."}, status=status.HTTP_404_NOT_FOUND
-            )
+        stats = business_order_stats([business_user_id]).get(business_user_id)
+        if stats is None:
+            return business_user_not_found()
+        count = stats["status_counts"]["completed"]
+        return Response({"completed_order_count": count}, status=status.HTTP_200_OK)
+
+
+class AsyncOrderCountView(AsyncReadView):
+    """
+    Async GET for /order-count/<business_user_id>/ under ASGI.
+    """
+    sync_view_class = OrderCountView
+
+    async def aget(self, request, business_user_id):
+        stats = (await abusiness_order_stats([business_user_id])).get(business_user_id)
+        if stats is None:
+            return business_user_not_found()
+        count = stats["status_counts"]["in_progress"]
+        return Response({"order_count": count}, status=status.HTTP_200_OK)
+
+
+class AsyncCompletedOrderCountView(AsyncReadView):
+    """
+    Async GET for /completed-order-count/<business_user_id>/ under ASGI.
+    """
+    sync_view_class = CompletedOrderCountView
 
-        count = Order.objects.filter(
-            business_user__id=business_user_id, status="completed"
-        ).count()
+    async def aget(self, request, business_user_id):
+        stats = (await abusiness_order_stats([business_user_id])).get(business_user_id)
+        if stats is None:
+            return business_user_not_found()
+        count = stats["status_counts"]["completed"]
         return Response({"completed_order_count": count}, status=status.HTTP_200_OK)
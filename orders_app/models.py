@@ -48,3 +48,12 @@ class Order(models.Model):
         ordering = ["-created_at"]
         verbose_name = "Order"
         verbose_name_plural = "Orders"
+        indexes = [
+            models.Index(fields=["business_user", "status"], name="order_business_status_idx"),
+            models.Index(
+                fields=["business_user", "-created_at"], name="order_business_created_idx"
+            ),
+            models.Index(
+                fields=["customer_user", "-created_at"], name="order_customer_created_idx"
+            ),
+        ]
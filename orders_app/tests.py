@@ -1,4 +1,9 @@
+from datetime import timedelta
+
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
 from django.urls import reverse
 from rest_framework.test import APIClient
 from django.contrib.auth.models import User
@@ -217,3 +222,181 @@ class OrdersTests(TestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, 200)
         self.assertIn("completed_order_count", response.data)
+
+    def test_order_list_conditional_get(self):
+        Order.objects.create(
+            customer_user=self.customer, business_user=self.business, title="Logo Basic",
+            revisions=1, delivery_time_in_days=5, price=100, features=["A"], offer_type="basic",
+        )
+        url = reverse("order-list-create")
+        response = self.client.get(url)
+        etag = response["ETag"]
+        self.assertTrue(response.has_header("Last-Modified"))
+        with self.assertNumQueries(1):
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertIsNone(response.data)
+
+        self.switch_to_business()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_order_list_etag_changes_on_update_and_delete(self):
+        order = Order.objects.create(
+            customer_user=self.customer, business_user=self.business, title="Logo Basic",
+            revisions=1, delivery_time_in_days=5, price=100, features=["A"], offer_type="basic",
+        )
+        url = reverse("order-list-create")
+        etag = self.client.get(url)["ETag"]
+        order.status = "completed"
+        order.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        order.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=response["ETag"]).status_code, 200)
+
+    def _create_order(self, business, status="in_progress", price=100, days=5):
+        return Order.objects.create(
+            customer_user=self.customer, business_user=business, title="Logo Basic",
+            revisions=1, delivery_time_in_days=days, price=price, features=["A"],
+            offer_type="basic", status=status,
+        )
+
+    def test_order_stats_single_query(self):
+        self._create_order(self.business)
+        self._create_order(self.business, status="completed", price=150, days=3)
+        self._create_order(self.business, status="completed", price=50, days=7)
+        self._create_order(self.business, status="cancelled")
+        self.switch_to_business()
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("order-stats", args=[self.business.id]))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data["status_counts"], {"in_progress": 1, "completed": 2, "cancelled": 1})
+        self.assertEqual(response.data["total_count"], 4)
+        self.assertEqual(response.data["revenue"], 200)
+        self.assertEqual(response.data["average_delivery_time"], 5.0)
+        self.assertEqual(self.client.get(reverse("order-stats", args=[9999])).status_code, 404)
+
+        self.switch_to_customer()
+        response = self.client.get(reverse("order-stats", args=[self.business.id]))
+        self.assertEqual(response.data, {
+            "business_user": self.business.id, "status_counts": {"in_progress": 1, "completed": 2},
+        })
+        admin = User.objects.create_user(username="staff", password="pass", is_staff=True)
+        self.client.force_authenticate(admin)
+        response = self.client.get(reverse("order-stats", args=[self.business.id]))
+        self.assertEqual(response.data["revenue"], 200)
+
+    def test_order_stats_batch(self):
+        other = User.objects.create_user(username="business2", password="pass")
+        Profile.objects.create(user=other, type="business")
+        self._create_order(self.business, status="completed")
+        url = reverse("order-stats-batch") + f"?business_user_ids={other.id},{self.business.id},9999"
+        self.switch_to_business()
+        with self.assertNumQueries(1):
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row["business_user"] for row in response.data], [other.id, self.business.id])
+        self.assertNotIn("revenue", response.data[0])
+        self.assertEqual(response.data[0]["status_counts"], {"in_progress": 0, "completed": 0})
+        self.assertEqual(response.data[1]["total_count"], 1)
+        self.assertEqual(response.data[1]["revenue"], 100)
+        self.assertEqual(response.data[1]["status_counts"]["completed"], 1)
+
+        self.assertEqual(self.client.get(reverse("order-stats-batch") + "?business_user_ids=a").status_code, 400)
+        ids = ",".join(str(i) for i in range(1, 102))
+        self.assertEqual(self.client.get(reverse("order-stats-batch") + f"?business_user_ids={ids}").status_code, 400)
+
+    def test_order_count_views_use_single_query(self):
+        self._create_order(self.business)
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse("order-count", args=[self.business.id]))
+        self.assertEqual(response.data, {"order_count": 1})
+        response = self.client.get(reverse("completed-order-count", args=[9999]))
+        self.assertEqual(response.status_code, 404)
+
+    def _create_feed_orders(self):
+        """
+        Five orders an hour apart, newest last: the customer's four orders at the business,
+        one of them completed, plus one the business placed with itself.
+        """
+        now = timezone.now()
+        orders = [self._create_order(self.business) for _ in range(4)]
+        orders[1].status = "completed"
+        orders[1].save()
+        own = Order.objects.create(
+            customer_user=self.business, business_user=self.business, title="Own",
+            revisions=1, delivery_time_in_days=1, price=10, features=[], offer_type="basic",
+        )
+        orders.append(own)
+        for hours, order in enumerate(reversed(orders)):
+            Order.objects.filter(pk=order.pk).update(created_at=now - timedelta(hours=hours))
+        return [order.pk for order in reversed(orders)]
+
+    def test_order_list_is_union_of_role_branches(self):
+        newest_first = self._create_feed_orders()
+        self.switch_to_business()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse("order-list-create"))
+        self.assertEqual([row["id"] for row in response.data], newest_first)
+        for query in queries.captured_queries:
+            self.assertIn("UNION ALL", query["sql"])
+            self.assertNotIn(" OR ", query["sql"])
+        self.assertEqual(set(response.data[0]), {
+            "id", "customer_user", "business_user", "title", "revisions", "delivery_time_in_days",
+            "price", "features", "offer_type", "status", "created_at", "updated_at",
+        })
+
+    def test_order_list_role_status_and_date_filters(self):
+        newest_first = self._create_feed_orders()
+        self.switch_to_business()
+        url = reverse("order-list-create")
+        self.assertEqual([row["id"] for row in self.client.get(url + "?as=customer").data], newest_first[:1])
+        self.assertEqual([row["id"] for row in self.client.get(url + "?as=business").data], newest_first)
+        response = self.client.get(url, {"status": "completed"})
+        self.assertEqual([row["status"] for row in response.data], ["completed"])
+
+        created = {order.pk: order.created_at for order in Order.objects.all()}
+        response = self.client.get(url, {
+            "created_after": created[newest_first[3]].isoformat(),
+            "created_before": created[newest_first[1]].isoformat(),
+        })
+        self.assertEqual([row["id"] for row in response.data], newest_first[2:4])
+
+        response = self.client.get(url + "?as=admin")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("as", response.data)
+        self.assertEqual(self.client.get(url + "?status=unknown").status_code, 400)
+
+    def test_order_list_keyset_pages(self):
+        newest_first = self._create_feed_orders()
+        self.switch_to_business()
+        url = reverse("order-list-create") + "?page_size=2&cursor="
+        seen, pages = [], []
+        while url:
+            response = self.client.get(url)
+            self.assertEqual(response.status_code, 200)
+            seen += [row["id"] for row in response.data["results"]]
+            pages.append(response.data)
+            url = response.data["next"]
+        self.assertEqual(seen, newest_first)
+        self.assertEqual(len(pages), 3)
+        self.assertIsNone(pages[0]["previous"])
+
+        response = self.client.get(pages[2]["previous"])
+        self.assertEqual([row["id"] for row in response.data["results"]], newest_first[2:4])
+        response = self.client.get(response.data["previous"])
+        self.assertEqual([row["id"] for row in response.data["results"]], newest_first[:2])
+        self.assertIsNone(response.data["previous"])
+
+        self.assertEqual(self.client.get(reverse("order-list-create") + "?cursor=bogus").status_code, 404)
+
+        response = self.client.get(reverse("order-list-create") + "?page=2&page_size=2")
+        self.assertEqual(response.data["count"], 5)
+        self.assertEqual([row["id"] for row in response.data["results"]], newest_first[2:4])
+
+        response = self.client.get(reverse("order-list-create") + "?page_size=2")
+        self.assertEqual([row["id"] for row in response.data], newest_first[:2])
+        self.assertEqual(response["X-Truncated"], "true")
+        self.assertIn("page=2", response["Link"])
+        response = self.client.get(reverse("order-list-create") + "?page_size=5")
+        self.assertNotIn("X-Truncated", response)
@@ -1,5 +1,6 @@
 from django.contrib import admin
 
-from .models import Review
+from .models import BusinessRatingSummary, Review
 
-admin.site.register(Review)
\ No newline at end of file
+admin.site.register(Review)
+admin.site.register(BusinessRatingSummary)
@@ -1,5 +1,7 @@
 from rest_framework.permissions import BasePermission
 
+from accounts_app.api.permissions import get_profile_type
+
 class IsReviewerOrReadOnly(BasePermission):
     """
     Custom permission to allow only the reviewer to update or delete a review.
@@ -16,9 +18,5 @@ class IsCustomerUser(BasePermission):
     """
     def has_permission(self, request, view):
         if request.method in ("POST", "PATCH", "PUT", "DELETE"):
-            return (
-                request.user.is_authenticated and
-                hasattr(request.user, "profile") and
-                request.user.profile.type == "customer"
-            )
+            return get_profile_type(request.user) == "customer"
         return request.user.is_authenticated
\ No newline at end of file
@@ -1,12 +1,13 @@
 from rest_framework import serializers
-from reviews_app.models import Review
+from accounts_app.api.permissions import get_profile_type
+from reviews_app.models import BusinessRatingSummary, Review
 
 class ReviewSerializer(serializers.ModelSerializer):
     """
     Serializer for creating and retrieving reviews.
     Only customers can submit reviews, and only one review per business is allowed.
     """
-    reviewer = serializers.ReadOnlyField(source="reviewer.id")
+    reviewer = serializers.ReadOnlyField(source="reviewer_id")
 
     class Meta:
         model = Review
@@ -26,7 +27,7 @@ class ReviewSerializer(serializers.ModelSerializer):
         reviewer = request.user
         business_user = data.get("business_user")
 
-        if reviewer.profile.type != "customer":
+        if get_profile_type(reviewer) != "customer":
             raise serializers.ValidationError("Nur Kunden dürfen Bewertungen abgeben.")
 
         if Review.objects.filter(
@@ -46,3 +47,15 @@ class ReviewUpdateSerializer(serializers.ModelSerializer):
     class Meta:
         model = Review
         fields = ["rating", "description"]
+
+
+class RatingSummarySerializer(serializers.ModelSerializer):
+    """
+    Serializer for the rating aggregate of a set of reviews.
+    """
+    average_rating = serializers.FloatField(read_only=True)
+    histogram = serializers.DictField(child=serializers.IntegerField(), read_only=True)
+
+    class Meta:
+        model = BusinessRatingSummary
+        fields = ["review_count", "average_rating", "histogram"]
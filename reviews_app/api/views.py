@@ -6,11 +6,13 @@ from rest_framework.permissions import IsAuthenticated
 from rest_framework.filters import OrderingFilter
 from django_filters.rest_framework import DjangoFilterBackend, FilterSet, NumberFilter
 from rest_framework import status
+from django.db import transaction
 
 
-from reviews_app.models import Review
+from core.conditional import ConditionalListMixin, ConditionalRetrieveMixin
+from reviews_app.models import BusinessRatingSummary, Review
 from .permissions import IsCustomerUser, IsReviewerOrReadOnly
-from .serializers import ReviewSerializer, ReviewUpdateSerializer
+from .serializers import RatingSummarySerializer, ReviewSerializer, ReviewUpdateSerializer
 
 
 class ReviewFilter(FilterSet):
@@ -24,23 +26,58 @@ class ReviewFilter(FilterSet):
         fields = ["business_user_id", "reviewer_id"]
 
 
-class ReviewListCreateView(ListCreateAPIView):
+class ReviewListCreateView(ConditionalListMixin, ListCreateAPIView):
     """
     API view to list all reviews or create a new review as a customer.
+    Paginated responses (?page= or ?cursor=) carry the rating summary of the filtered set.
     """
     serializer_class = ReviewSerializer
     permission_classes = [IsAuthenticated, IsCustomerUser]
     filter_backends = [DjangoFilterBackend, OrderingFilter]
+    filterset_class = ReviewFilter
     ordering_fields = ["updated_at", "rating"]
+    ordering = ["-updated_at"]
 
     def get_queryset(self):
         return Review.objects.all().order_by("-updated_at")
 
+    def get_list_aggregates(self):
+        # Only the paginated envelope carries the rating summary; the plain list skips it.
+        if self.paginator.page_query_param not in self.request.query_params:
+            return {}
+        return BusinessRatingSummary.aggregates()
+
+    def get_rating_summary(self):
+        """
+        Page mode reuses the aggregates of the validator query. Otherwise a business-only
+        filter reads the maintained summary row, anything else aggregates the filtered set.
+        """
+        if self.list_stats is not None:
+            return BusinessRatingSummary.from_aggregates(self.list_stats)
+        filterset = self.filterset_class(self.request.query_params, queryset=Review.objects.all())
+        if filterset.is_valid():
+            active = {name for name, value in filterset.form.cleaned_data.items() if value is not None}
+            if active == {"business_user_id"}:
+                business_user_id = filterset.form.cleaned_data["business_user_id"]
+                summary = BusinessRatingSummary.objects.filter(pk=business_user_id).first()
+                return summary or BusinessRatingSummary(business_user_id=business_user_id)
+        stats = self.filter_queryset(self.get_queryset()).order_by().aggregate(
+            **BusinessRatingSummary.aggregates()
+        )
+        return BusinessRatingSummary.from_aggregates(stats)
+
+    def get_paginated_response(self, data):
+        response = super().get_paginated_response(data)
+        if isinstance(response.data, dict):
+            response.data["rating_summary"] = RatingSummarySerializer(self.get_rating_summary()).data
+        return response
+
+    @transaction.atomic
     def perform_create(self, serializer):
         serializer.save(reviewer=self.request.user)
 
 
-class ReviewRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
+class ReviewRetrieveUpdateDestroyView(ConditionalRetrieveMixin, RetrieveUpdateDestroyAPIView):
     """
     API view to retrieve, update, or delete a review.
     Only the original reviewer can update or delete.
@@ -49,6 +86,14 @@ class ReviewRetrieveUpdateDestroyView(RetrieveUpdateDestroyAPIView):
     permission_classes = [IsAuthenticated, IsReviewerOrReadOnly]
     lookup_field = "id"
 
+    @transaction.atomic
+    def perform_update(self, serializer):
+        serializer.save()
+
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
     def get_serializer_class(self):
         if self.request.method == "PATCH":
             return ReviewUpdateSerializer
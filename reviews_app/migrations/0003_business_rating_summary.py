@@ -0,0 +1,51 @@
+# Generated by Django 5.1.6 on 2026-10-18 04:06
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Count
+
+
+def backfill_summaries(apps, schema_editor):
+    Review = apps.get_model("reviews_app", "Review")
+    BusinessRatingSummary = apps.get_model("reviews_app", "BusinessRatingSummary")
+    summaries = {}
+    rows = Review.objects.order_by().values_list("business_user_id", "rating").annotate(count=Count("id"))
+    for business_user_id, rating, count in rows:
+        summary = summaries.setdefault(
+            business_user_id, BusinessRatingSummary(business_user_id=business_user_id)
+        )
+        summary.review_count += count
+        summary.rating_sum += rating * count
+        if 1 <= rating <= 5:
+            setattr(summary, f"stars_{rating}", getattr(summary, f"stars_{rating}") + count)
+    BusinessRatingSummary.objects.bulk_create(summaries.values(), batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('reviews_app', '0002_hot_path_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='BusinessRatingSummary',
+            fields=[
+                ('business_user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='rating_summary', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('review_count', models.IntegerField(default=0)),
+                ('rating_sum', models.IntegerField(default=0)),
+                ('stars_1', models.IntegerField(default=0)),
+                ('stars_2', models.IntegerField(default=0)),
+                ('stars_3', models.IntegerField(default=0)),
+                ('stars_4', models.IntegerField(default=0)),
+                ('stars_5', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Business Rating Summary',
+                'verbose_name_plural': 'Business Rating Summaries',
+            },
+        ),
+        migrations.RunPython(backfill_summaries, migrations.RunPython.noop),
+    ]
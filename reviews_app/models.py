@@ -1,9 +1,12 @@
-from django.db import models
+from django.db import IntegrityError, models, transaction
 from django.conf import settings
+from django.db.models import Count, F, Q, Sum
 from django.core.validators import MinValueValidator, MaxValueValidator
 
+from core.models import LoadedValuesMixin
 
-class Review(models.Model):
+
+class Review(LoadedValuesMixin, models.Model):
     """
     Represents a customer review for a business user.
     Stores rating, text description, and reviewer information.
@@ -28,8 +31,134 @@ class Review(models.Model):
     class Meta:
         unique_together = ("business_user", "reviewer")
         ordering = ["-updated_at"]
+        indexes = [
+            models.Index(fields=["-updated_at"], name="review_updated_idx"),
+            models.Index(
+                fields=["business_user", "-updated_at"], name="review_business_updated_idx"
+            ),
+            models.Index(fields=["reviewer", "-updated_at"], name="review_reviewer_updated_idx"),
+        ]
 
     def __str__(self):
         return (
             f"{self.reviewer.username} → {self.business_user.username}: {self.rating}★"
         )
+
+
+class BusinessRatingSummary(models.Model):
+    """
+    Precomputed rating aggregate per business user: review count, rating sum
+    and a 1-5 star histogram. Maintained by the review signals.
+    """
+    business_user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="rating_summary",
+    )
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    stars_1 = models.IntegerField(default=0)
+    stars_2 = models.IntegerField(default=0)
+    stars_3 = models.IntegerField(default=0)
+    stars_4 = models.IntegerField(default=0)
+    stars_5 = models.IntegerField(default=0)
+
+    class Meta:
+        verbose_name = "Business Rating Summary"
+        verbose_name_plural = "Business Rating Summaries"
+
+    def __str__(self):
+        return f"{self.business_user_id}: {self.average_rating}★ ({self.review_count})"
+
+    @property
+    def average_rating(self):
+        if not self.review_count:
+            return None
+        return round(self.rating_sum / self.review_count, 1)
+
+    @property
+    def histogram(self):
+        return {star: getattr(self, f"stars_{star}") for star in range(1, 6)}
+
+    @classmethod
+    def aggregates(cls):
+        """
+        Aggregate expressions over a Review queryset, keyed by summary field name.
+        """
+        return {
+            "review_count": Count("pk"),
+            "rating_sum": Sum("rating"),
+            **{f"stars_{star}": Count("pk", filter=Q(rating=star)) for star in range(1, 6)},
+        }
+
+    @classmethod
+    def from_aggregates(cls, stats):
+        """
+        Builds an unsaved summary from the results of aggregates().
+        """
+        return cls(**{name: stats.get(name) or 0 for name in cls.aggregates()})
+
+    @classmethod
+    def apply(cls, business_user_id, rating, sign=1):
+        """
+        Adds (sign=1) or removes (sign=-1) one rating for a business user.
+        """
+        changes = {
+            "review_count": F("review_count") + sign,
+            "rating_sum": F("rating_sum") + sign * rating,
+        }
+        if 1 <= rating <= 5:
+            changes[f"stars_{rating}"] = F(f"stars_{rating}") + sign
+        updated = cls.objects.filter(business_user_id=business_user_id).update(**changes)
+        if not updated and sign > 0:
+            cls.rebuild(business_user_id)
+
+    @classmethod
+    def rebuild_all(cls, batch_size=5000):
+        """
+        Recomputes every summary from one grouped aggregate over all reviews.
+        """
+        rows = (
+            Review.objects.order_by()
+            .values("business_user_id")
+            .annotate(**cls.aggregates())
+        )
+        cls.objects.all().delete()
+        cls.objects.bulk_create((cls(**row) for row in rows.iterator()), batch_size=batch_size)
+
+    @classmethod
+    def counts(cls, business_user_id):
+        """
+        The summary fields of one business user, counted from its reviews.
+        """
+        counts = dict(
+            Review.objects.filter(business_user_id=business_user_id)
+            .order_by()
+            .values_list("rating")
+            .annotate(count=models.Count("id"))
+        )
+        return {
+            "review_count": sum(counts.values()),
+            "rating_sum": sum(star * count for star, count in counts.items()),
+            **{f"stars_{star}": counts.get(star, 0) for star in range(1, 6)},
+        }
+
+    @classmethod
+    def rebuild(cls, business_user_id):
+        """
+        Recomputes the summary of one business user from its reviews.
+        """
+        values = cls.counts(business_user_id)
+        try:
+            with transaction.atomic():
+                summary, _created = cls.objects.update_or_create(
+                    business_user_id=business_user_id, defaults=values
+                )
+            return summary
+        except IntegrityError:
+            # A concurrent first review inserted the row meanwhile. Count again, now
+            # that its review is committed too, and update the existing row.
+            values = cls.counts(business_user_id)
+            cls.objects.filter(business_user_id=business_user_id).update(**values)
+            return cls.objects.get(business_user_id=business_user_id)
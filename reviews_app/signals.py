@@ -0,0 +1,27 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from reviews_app.models import BusinessRatingSummary, Review
+
+
+@receiver(post_save, sender=Review)
+def update_rating_summary_on_save(sender, instance, created, **kwargs):
+    if created:
+        BusinessRatingSummary.apply(instance.business_user_id, instance.rating)
+        return
+    previous = (
+        instance.loaded_value("business_user_id", instance.business_user_id),
+        instance.loaded_value("rating", instance.rating),
+    )
+    if previous != (instance.business_user_id, instance.rating):
+        BusinessRatingSummary.apply(*previous, sign=-1)
+        BusinessRatingSummary.apply(instance.business_user_id, instance.rating)
+
+
+@receiver(post_delete, sender=Review)
+def update_rating_summary_on_delete(sender, instance, **kwargs):
+    BusinessRatingSummary.apply(
+        instance.loaded_value("business_user_id", instance.business_user_id),
+        instance.loaded_value("rating", instance.rating),
+        sign=-1,
+    )
@@ -1,8 +1,12 @@
+from unittest.mock import patch
+
+from django.db import IntegrityError, connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth.models import User
 from rest_framework.test import APIClient
 from rest_framework.authtoken.models import Token
-from reviews_app.models import Review
+from reviews_app.models import BusinessRatingSummary, Review
 from accounts_app.models import Profile
 
 class ReviewsTests(TestCase):
@@ -140,3 +144,119 @@ class ReviewsTests(TestCase):
         Review.objects.create(business_user=business2, reviewer=self.customer_user, rating=3)
         response = self.client.get(f"/api/reviews/?ordering=-rating")
         self.assertEqual(response.status_code, 200)
+
+    def test_rating_summary_follows_review_writes(self):
+        summary = BusinessRatingSummary.objects.get(business_user=self.business_user)
+        self.assertEqual((summary.review_count, summary.rating_sum, summary.stars_5), (1, 5, 1))
+
+        self.auth_customer()
+        self.client.patch(f"/api/reviews/{self.review.id}/", {"rating": 2})
+        summary.refresh_from_db()
+        self.assertEqual(summary.histogram, {1: 0, 2: 1, 3: 0, 4: 0, 5: 0})
+        self.assertEqual(summary.average_rating, 2.0)
+
+        self.client.delete(f"/api/reviews/{self.review.id}/")
+        summary.refresh_from_db()
+        self.assertEqual((summary.review_count, summary.rating_sum, summary.stars_2), (0, 0, 0))
+
+    def test_rating_summary_rebuild_survives_concurrent_insert(self):
+        business2 = User.objects.create_user(username="biz2", password="pw", email="b2@ex.com")
+        Review.objects.create(business_user=business2, reviewer=self.customer_user, rating=4)
+        # The row a concurrent first review committed after update_or_create() missed it.
+        BusinessRatingSummary.objects.filter(business_user=business2).update(review_count=0, rating_sum=0, stars_4=0)
+        conflict = IntegrityError("duplicate key value violates unique constraint")
+
+        with patch.object(BusinessRatingSummary.objects, "update_or_create", side_effect=conflict):
+            summary = BusinessRatingSummary.rebuild(business2.id)
+        self.assertEqual((summary.review_count, summary.rating_sum, summary.stars_4), (1, 4, 1))
+
+    def test_rating_summary_follows_reviewer_cascade_delete(self):
+        other = User.objects.create_user(username="kunde2", password="pw", email="k2@ex.com")
+        Review.objects.create(business_user=self.business_user, reviewer=other, rating=3)
+        other.delete()
+        summary = BusinessRatingSummary.objects.get(business_user=self.business_user)
+        self.assertEqual((summary.review_count, summary.rating_sum, summary.stars_3), (1, 5, 0))
+
+    def test_review_list_is_bounded_and_paginates_on_request(self):
+        business2 = User.objects.create_user(username="biz2", password="pw", email="b2@ex.com")
+        Review.objects.create(business_user=business2, reviewer=self.customer_user, rating=3)
+        self.auth_customer()
+        response = self.client.get("/api/reviews/?page_size=1")
+        self.assertEqual(len(response.data), 1)
+        self.assertEqual(response["X-Truncated"], "true")
+        next_url = response["Link"].split(";")[0].strip("<>")
+        self.assertIn("page=2", next_url)
+        second = self.client.get(next_url)
+        self.assertEqual(second.data["count"], 2)
+        self.assertNotEqual(second.data["results"][0]["id"], response.data[0]["id"])
+        response = self.client.get("/api/reviews/?page_size=2")
+        self.assertNotIn("X-Truncated", response)
+        self.assertNotIn("Link", response)
+        response = self.client.get("/api/reviews/?page=1&page_size=1")
+        self.assertEqual(response.data["count"], 2)
+        self.assertIsNotNone(response.data["next"])
+        response = self.client.get("/api/reviews/?cursor=&page_size=1")
+        self.assertEqual(len(response.data["results"]), 1)
+        response = self.client.get(response.data["next"])
+        self.assertEqual(response.data["results"][0]["id"], self.review.id)
+
+    def test_plain_review_list_skips_rating_aggregates(self):
+        self.auth_customer()
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/reviews/")
+        self.assertEqual(len(response.data), 1)
+        self.assertFalse(any("stars_5" in query["sql"] for query in queries.captured_queries))
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get("/api/reviews/?page=1")
+        self.assertEqual(response.data["rating_summary"]["review_count"], 1)
+        self.assertEqual(sum("stars_5" in query["sql"] for query in queries.captured_queries), 1)
+
+    def test_retrieve_review_conditional_get(self):
+        self.auth_customer()
+        url = f"/api/reviews/{self.review.id}/"
+        response = self.client.get(url)
+        etag, last_modified = response["ETag"], response["Last-Modified"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+        self.assertEqual(self.client.get(url, HTTP_IF_MODIFIED_SINCE=last_modified).status_code, 304)
+        self.client.patch(url, {"rating": 3})
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_review_cursor_page_conditional_get(self):
+        self.auth_customer()
+        url = "/api/reviews/?cursor="
+        etag = self.client.get(url)["ETag"]
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+    def test_review_page_carries_rating_summary_of_filtered_set(self):
+        business2 = User.objects.create_user(username="biz2", password="pw", email="b2@ex.com")
+        other = User.objects.create_user(username="kunde2", password="pw", email="k2@ex.com")
+        Review.objects.create(business_user=self.business_user, reviewer=other, rating=2)
+        Review.objects.create(business_user=business2, reviewer=other, rating=1)
+        self.auth_customer()
+        url = f"/api/reviews/?business_user_id={self.business_user.id}&page=1&page_size=1"
+        self.client.get(url)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.data["count"], 2)
+        self.assertEqual(len(response.data["results"]), 1)
+        self.assertEqual(
+            response.data["rating_summary"],
+            {"review_count": 2, "average_rating": 3.5, "histogram": {"1": 0, "2": 1, "3": 0, "4": 0, "5": 1}},
+        )
+
+        response = self.client.get(f"/api/reviews/?reviewer_id={other.id}&page=1")
+        self.assertEqual(response.data["rating_summary"]["review_count"], 2)
+        self.assertEqual(response.data["rating_summary"]["average_rating"], 1.5)
+
+    def test_review_cursor_page_reads_maintained_summary(self):
+        self.auth_customer()
+        url = f"/api/reviews/?business_user_id={self.business_user.id}&cursor="
+        self.client.get(url)
+        with self.assertNumQueries(2):
+            response = self.client.get(url)
+        self.assertEqual(response.data["rating_summary"]["review_count"], 1)
+        self.assertEqual(response.data["rating_summary"]["average_rating"], 5.0)
+        response = self.client.get("/api/reviews/?business_user_id=9999&cursor=")
+        self.assertEqual(response.data["results"], [])
+        self.assertEqual(response.data["rating_summary"]["review_count"], 0)
+        self.assertIsNone(response.data["rating_summary"]["average_rating"])